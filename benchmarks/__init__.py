@@ -0,0 +1 @@
+"""Benchmarks of filling generated schemas and instances, see README"""
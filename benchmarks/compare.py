@@ -0,0 +1,62 @@
+"""Compare two benchmark result files
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.1]
+
+Exits with 1 if any combination got slower than the threshold.
+"""
+import argparse
+import json
+import sys
+from typing import List, Union
+
+
+def _key(result: dict) -> tuple:
+    return result["shape"], result["size"], result["config"]
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list:
+    """Return the combinations of both reports with their change
+
+    Returns:
+        rows (list): (shape, size, config, baseline fills/s, candidate
+            fills/s, ratio, regressed) of each combination in both reports
+    """
+    baseline_results = {_key(result): result
+                        for result in baseline["results"]}
+    rows = []
+    for result in candidate["results"]:
+        old = baseline_results.get(_key(result))
+        if old is None or not old["fills_per_second"]:
+            continue
+        ratio = result["fills_per_second"] / old["fills_per_second"]
+        rows.append((*_key(result), old["fills_per_second"],
+                     result["fills_per_second"], ratio,
+                     ratio < 1 - threshold))
+    return rows
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare the throughput of two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="relative throughput loss reported as a regression")
+    args = parser.parse_args(argv)
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+    rows = compare(baseline, candidate, args.threshold)
+    for shape, size, config, old, new, ratio, regressed in rows:
+        print(f"{shape:>10} {size:>6} {config:>22} {old:>12.0f} "
+              f"{new:>12.0f} {ratio:>6.2f}x"
+              + ("  REGRESSION" if regressed else ""))
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Synthetic schemas and instances of the shapes filling is benchmarked on"""
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+
+DRAFT = "https://json-schema.org/draft/2020-12/schema"
+
+
+@dataclass
+class Shape:
+    """A generated schema with a template of the instances to fill
+
+    Args:
+        name (str): Name of the shape
+        size (int): Size parameter the shape was generated with
+        schema (dict): JSON schema adhering to Draft 2020-12
+        template (dict, list): Instance valid against the schema, copied for
+            every fill
+    """
+    name: str
+    size: int
+    schema: dict
+    template: object
+
+    def instance(self):
+        """Return a new copy of the instance template"""
+        return deepcopy(self.template)
+
+
+def wide(size: int) -> Shape:
+    """Object of `size` properties with defaults, half of them present"""
+    schema = {
+        "$schema": DRAFT,
+        "type": "object",
+        "properties": {
+            f"p{i}": {"type": "integer", "default": i} for i in range(size)
+        }
+    }
+    template = {f"p{i}": -i for i in range(0, size, 2)}
+    return Shape("wide", size, schema, template)
+
+
+def deep(size: int) -> Shape:
+    """Objects nested `size` levels deep, each level with a default"""
+    subschema = {"type": "object", "properties": {"leaf": {"default": 0}}}
+    for level in reversed(range(size)):
+        subschema = {
+            "type": "object",
+            "properties": {
+                "value": {"type": "integer", "default": level},
+                "child": subschema
+            }
+        }
+    schema = {"$schema": DRAFT, **subschema}
+    template = node = {}
+    for _ in range(size // 2):  # Upper half present, lower half created
+        node["child"] = {}
+        node = node["child"]
+    return Shape("deep", size, schema, template)
+
+
+def oneof(size: int) -> Shape:
+    """Union of `size` object variants discriminated by a "kind" const"""
+    schema = {
+        "$schema": DRAFT,
+        "type": "object",
+        "properties": {
+            "shape": {
+                "oneOf": [
+                    {
+                        "type": "object",
+                        "properties": {
+                            "kind": {"const": f"k{i}"},
+                            f"a{i}": {"type": "integer", "default": i},
+                            "b": {"type": "string", "default": f"v{i}"}
+                        },
+                        "required": ["kind"]
+                    }
+                    for i in range(size)
+                ]
+            }
+        }
+    }
+    template = {"shape": {"kind": f"k{size - 1}"}}
+    return Shape("oneof", size, schema, template)
+
+
+def ifthenelse(size: int) -> Shape:
+    """Chain of `size` "if-then-else" in "allOf" on boolean flags"""
+    schema = {
+        "$schema": DRAFT,
+        "type": "object",
+        "properties": {
+            f"flag{i}": {"type": "boolean"} for i in range(size)
+        },
+        "allOf": [
+            {
+                "if": {
+                    "properties": {f"flag{i}": {"const": True}},
+                    "required": [f"flag{i}"]
+                },
+                "then": {"properties": {f"on{i}": {"default": i}}},
+                "else": {"properties": {f"off{i}": {"default": -i}}}
+            }
+            for i in range(size)
+        ]
+    }
+    template = {f"flag{i}": i % 2 == 0 for i in range(size)}
+    return Shape("ifthenelse", size, schema, template)
+
+
+def arrays(size: int) -> Shape:
+    """Array of `size` "prefixItems" and `size` object "items" with defaults"""
+    schema = {
+        "$schema": DRAFT,
+        "type": "object",
+        "properties": {
+            "tuple": {
+                "type": "array",
+                "prefixItems": [
+                    {"type": "integer", "default": i} for i in range(size)
+                ]
+            },
+            "records": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "active": {"type": "boolean", "default": True},
+                        "tags": {"type": "array", "default": []}
+                    }
+                }
+            }
+        }
+    }
+    template = {
+        "tuple": [0],
+        "records": [{"id": i} for i in range(size)]
+    }
+    return Shape("arrays", size, schema, template)
+
+
+def dependent(size: int) -> Shape:
+    """Object with `size` "dependentSchemas", half of them triggered"""
+    schema = {
+        "$schema": DRAFT,
+        "type": "object",
+        "dependentSchemas": {
+            f"d{i}": {
+                "properties": {f"e{i}": {"type": "integer", "default": i}}
+            }
+            for i in range(size)
+        }
+    }
+    template = {f"d{i}": True for i in range(0, size, 2)}
+    return Shape("dependent", size, schema, template)
+
+
+# Generators of the shapes by name
+SHAPES: Dict[str, Callable[[int], Shape]] = {
+    "wide": wide,
+    "deep": deep,
+    "oneof": oneof,
+    "ifthenelse": ifthenelse,
+    "arrays": arrays,
+    "dependent": dependent,
+}
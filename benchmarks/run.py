@@ -0,0 +1,157 @@
+"""Measure fill throughput, latency, and peak memory of generated shapes
+
+Usage:
+    python -m benchmarks.run [--shapes wide deep ...] [--sizes 10 100]
+                             [--fills 1000] [--output results.json]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Union
+
+from jsonschema_fill_default import FillConfig, compile_filler
+
+from .generators import SHAPES, Shape
+
+
+# Configurations benchmarked for each shape, by name
+CONFIGS: Dict[str, dict] = {
+    "recursive": {},
+    "iterative": {"engine": "iterative"},
+    "codegen": {"engine": "codegen"},
+    "recursive-no-mutate": {"mutate": False},
+    "recursive-deep-copy": {"default_copy": "deep"},
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return a percentile of sorted values, by the nearest rank"""
+    index = max(0, min(len(sorted_values) - 1,
+                       round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(shape: Shape, config_name: str, n_fills: int) -> dict:
+    """Benchmark filling instances of a shape with a configuration
+
+    Compiling is timed once. Instances are copied from the template before
+    timing, and each fill is timed on its own.
+
+    Returns:
+        result (dict): Shape, configuration, and measurements
+    """
+    config = FillConfig(**CONFIGS[config_name])
+    start = time.perf_counter()
+    filler = compile_filler(shape.schema, config)
+    compile_seconds = time.perf_counter() - start
+
+    for instance in [shape.instance() for _ in range(min(10, n_fills))]:
+        filler.fill(instance)  # Warm up memoized values and validators
+
+    instances = [shape.instance() for _ in range(n_fills)]
+    latencies = []
+    clock = time.perf_counter
+    for instance in instances:
+        start = clock()
+        filler.fill(instance)
+        latencies.append(clock() - start)
+    total = sum(latencies)
+    latencies.sort()
+
+    instance = shape.instance()
+    tracemalloc.start()
+    filler.fill(instance)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "shape": shape.name,
+        "size": shape.size,
+        "config": config_name,
+        "fills": n_fills,
+        "compile_ms": compile_seconds * 1e3,
+        "fills_per_second": n_fills / total if total else None,
+        "latency_us": {
+            "mean": total / n_fills * 1e6,
+            "p50": percentile(latencies, 0.50) * 1e6,
+            "p90": percentile(latencies, 0.90) * 1e6,
+            "p99": percentile(latencies, 0.99) * 1e6,
+            "max": latencies[-1] * 1e6,
+        },
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run(
+        shapes: List[str], sizes: List[int], configs: List[str],
+        n_fills: int, progress: bool = False) -> dict:
+    """Benchmark every combination of shape, size, and configuration
+
+    Returns:
+        report (dict): Environment metadata and the list of results
+    """
+    results = []
+    for name in shapes:
+        for size in sizes:
+            shape = SHAPES[name](size)
+            for config_name in configs:
+                result = measure(shape, config_name, n_fills)
+                results.append(result)
+                if progress:
+                    print(f"{name:>10} {size:>6} {config_name:>22} "
+                          f"{result['fills_per_second']:>12.0f} fills/s "
+                          f"p99 {result['latency_us']['p99']:>10.1f} us",
+                          file=sys.stderr)
+    return {"meta": metadata(), "results": results}
+
+
+def metadata() -> dict:
+    """Return the environment a benchmark ran in"""
+    try:
+        from importlib.metadata import version
+        package_version = version("jsonschema-fill-default")
+    except Exception:
+        package_version = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "package_version": package_version,
+    }
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark filling generated schemas and instances.")
+    parser.add_argument(
+        "--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10, 100])
+    parser.add_argument(
+        "--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument(
+        "--fills", type=int, default=1000,
+        help="number of timed fills per combination")
+    parser.add_argument(
+        "--output", default=None,
+        help="JSON file to write results to (default: stdout)")
+    args = parser.parse_args(argv)
+    report = run(args.shapes, args.sizes, args.configs, args.fills,
+                 progress=True)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,9 @@
 import json
 from pathlib import Path
 
-from jsonschema import validate, protocols
-from jsonref import replace_refs
-from jsonschema_fill_default import fill_default
+from jsonschema import protocols
+from jsonschema.exceptions import best_match
+from jsonschema_fill_default import validate_and_fill, FillConfig
 
 
 def main():
@@ -22,19 +22,18 @@ def main():
     with open(schema_absolute_path, 'r') as file:
         schema = json.load(file)
 
-    # Validate schema and validate instance against schema
+    # Validate schema
     protocols.Validator.check_schema(schema)
-    validate(instance, schema)
 
-    # De-reference schema "$refs"
-    # Assign jsonref.replace_refs return to immediately evaluate and get copy.
-    schema = replace_refs(schema)
-
-    # Fill instance with schema defaults
-    # fill_default mutates the instance, so we don't assign its return.
+    # Fill instance with schema defaults and validate it in a single pass
+    # validate_and_fill resolves "$refs" itself, including relative ones to
+    # schema files next to this one given as `schema_dir`.
+    # validate_and_fill mutates the instance, so we don't assign its return.
     print(f"\nOriginal:\n{json.dumps(instance, indent=4)}")
-    fill_default(instance, schema)
-    validate(instance, schema)
+    config = FillConfig(schema_dir=schema_absolute_path.parent)
+    _, errors = validate_and_fill(instance, schema, config)
+    if errors:
+        raise best_match(errors)
     print(f"\nFilled:\n{json.dumps(instance, indent=4)}")
 
 
@@ -1 +1,11 @@
-from .jsonschema_fill_default import fill_default, FillConfig
+from .jsonschema_fill_default import (
+    fill_default, fill_default_many, fill_patch, FillConfig)
+from .filler import compile_filler, Filler, KEYWORDS
+from .keywords import Keyword
+from .stats import FillStats
+from .parallel import fill_default_parallel
+from .ndjson import fill_ndjson, NdjsonReport, NdjsonError
+from .aio import afill_default, afill_default_many
+from .validating import validate_and_fill
+from .plan_cache import PlanCache
+from .filler_registry import FillerRegistry
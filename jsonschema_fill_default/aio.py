@@ -0,0 +1,147 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterable, Iterable, Union
+
+from .config import FillConfig
+from .filler import Filler, _IterativeFillPass
+
+
+class _AsyncFillPass(_IterativeFillPass):
+    """Fill of one instance on a work stack that yields to the event loop
+
+    Runs the tasks of the iterative engine, and yields to the event loop
+    after every `yield_every` tasks, so a large instance does not block it.
+    Each task fills one (sub)schema into one nested instance.
+
+    Args:
+        filler (Filler): Compiled filler
+        yield_every (int): Number of tasks run between yields
+    """
+
+    def __init__(self, filler: Filler, yield_every: int = 1000):
+        super().__init__(filler)
+        self.yield_every = yield_every
+
+    async def afill_root(self, instance):
+        """Fill an instance with the root node and return it"""
+        instance = self._start(instance)
+        stack = [(_IterativeFillPass._push_node,
+                  (instance, self.filler._root))]
+        pop = stack.pop
+        n_tasks = 0
+        while stack:
+            function, args = pop()
+            function(self, stack, *args)
+            n_tasks += 1
+            if n_tasks == self.yield_every:
+                n_tasks = 0
+                await asyncio.sleep(0)
+        return instance
+
+
+async def _afill(
+        filler: Filler, instance: Union[dict, list], yield_every: int,
+        executor: Union[Executor, None]) -> Union[dict, list]:
+    """Fill an instance on the event loop, or in an executor if given"""
+    if executor is not None:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, filler.fill, instance)
+    return await _AsyncFillPass(filler, yield_every).afill_root(instance)
+
+
+async def afill_default(
+        instance: Union[dict, list],
+        schema: dict,
+        config: Union[FillConfig, None] = None,
+        yield_every: int = 1000,
+        executor: Union[Executor, None] = None
+        ) -> Union[dict, list]:
+    """Fill a JSON instance with schema defaults without blocking the loop
+
+    Fills like `fill_default` on the work stack of the iterative engine (see
+    `FillConfig.engine`), and yields to the event loop after every
+    `yield_every` nested fills, so other tasks run while a large instance is
+    filled. Alternatively, fills in an executor.
+
+    Mutates the instance input, unless `FillConfig.mutate` is False.
+
+    Args:
+        instance (dict, list): JSON instance valid against the given schema
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+        yield_every (int): Number of nested fills between yields to the
+            event loop. Lower values keep the loop more responsive at the
+            cost of throughput.
+        executor (Executor | None): If given, fill in this executor (e.g., a
+            `ThreadPoolExecutor`) instead of on the event loop
+
+    Returns:
+        instance (dict, list): Filled instance
+    """
+    if yield_every < 1:
+        raise ValueError(f"yield_every must be at least 1, not {yield_every}")
+    return await _afill(
+        Filler(schema, config), instance, yield_every, executor)
+
+
+async def afill_default_many(
+        instances: Union[Iterable, AsyncIterable],
+        schema: dict,
+        config: Union[FillConfig, None] = None,
+        concurrency: int = 4,
+        yield_every: int = 1000,
+        executor: Union[Executor, None] = None
+        ) -> list:
+    """Fill many JSON instances with schema defaults without blocking the loop
+
+    Compiles the schema once, and fills like `afill_default`, with at most
+    `concurrency` instances being filled at a time. Instances are taken from
+    the (async) iterable only as fills finish, so the number of instances in
+    flight, and the share of the loop they take, stay bounded.
+
+    Mutates the instance inputs, unless `FillConfig.mutate` is False.
+
+    Args:
+        instances (iterable, async iterable): JSON instances valid against
+            the given schema
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+        concurrency (int): Maximum number of instances filled at a time
+        yield_every (int): Number of nested fills between yields to the
+            event loop
+        executor (Executor | None): If given, fill in this executor instead
+            of on the event loop
+
+    Returns:
+        instances (list): Filled instances, in input order
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, not {concurrency}")
+    if yield_every < 1:
+        raise ValueError(f"yield_every must be at least 1, not {yield_every}")
+    filler = Filler(schema, config)
+    slots = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def fill(instance):
+        try:
+            return await _afill(filler, instance, yield_every, executor)
+        finally:
+            slots.release()
+
+    try:
+        if hasattr(instances, "__aiter__"):
+            async for instance in instances:
+                await slots.acquire()
+                tasks.append(asyncio.ensure_future(fill(instance)))
+        else:
+            for instance in instances:
+                await slots.acquire()
+                tasks.append(asyncio.ensure_future(fill(instance)))
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import List, Union
+
+from . import parallel
+from .config import FillConfig
+from .filler import Filler
+from .ndjson import fill_ndjson
+from .plan_cache import PlanCache
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    """Run the `jsonschema-fill-default` command-line interface
+
+    Args:
+        argv (list | None): Command-line arguments. If None, uses `sys.argv`.
+
+    Returns:
+        status (int): 0 if all instances were filled, else 1
+    """
+    args = _parser().parse_intermixed_args(argv)
+    if args.in_place and (not args.instances or "-" in args.instances):
+        print("error: --in-place needs instance files, not stdin",
+              file=sys.stderr)
+        return 2
+    with open(args.schema, "r") as file:
+        schema = json.load(file)
+    config = FillConfig(
+        create_missing_parents=not args.no_create_missing_parents,
+        schema_dir=os.path.dirname(os.path.abspath(args.schema)))
+    workers = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    paths = args.instances or ["-"]
+    cache = None if args.cache_dir is None else PlanCache(args.cache_dir)
+    if args.ndjson:
+        return _fill_ndjson_files(paths, schema, config, workers, cache, args)
+    return _fill_json_files(paths, schema, config, workers, cache, args)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="jsonschema-fill-default",
+        description="Fill JSON instances with the missing defaults of their "
+                    "JSON Schema Draft 2020-12-valid schema.")
+    parser.add_argument(
+        "schema", help="JSON schema file")
+    parser.add_argument(
+        "instances", nargs="*",
+        help="JSON instance files, or - for stdin (default)")
+    parser.add_argument(
+        "--ndjson", action="store_true",
+        help="instances are NDJSON (JSON Lines) streams of one instance per "
+             "line")
+    parser.add_argument(
+        "-i", "--in-place", action="store_true",
+        help="write filled instances back to their files instead of stdout")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="number of processes filling instances, or 0 for one per "
+             "processor (default: 1)")
+    parser.add_argument(
+        "--chunksize", type=int, default=1024,
+        help="number of NDJSON lines sent to a process at a time")
+    parser.add_argument(
+        "--indent", type=int, default=None,
+        help="indent filled JSON files by this many spaces (default: "
+             "compact)")
+    parser.add_argument(
+        "--no-create-missing-parents", action="store_true",
+        help="do not create missing parents with nested defaults")
+    parser.add_argument(
+        "--cache-dir", default=None,
+        help="directory to cache the compiled schema in, so that later runs "
+             "and worker processes skip compiling it")
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="print counts and throughput of NDJSON streams to stderr")
+    return parser
+
+
+def _fill_json_files(
+        paths: list, schema: dict, config: FillConfig, workers: int,
+        cache: Union[PlanCache, None], args: argparse.Namespace) -> int:
+    """Fill JSON files, each holding one instance"""
+    tasks = [(path, None, args.in_place, args.indent) for path in paths]
+    if workers > 1 and len(tasks) > 1:
+        # Worker processes cannot read the stdin of this one
+        tasks = [
+            (path, sys.stdin.read() if path == "-" else None, *options)
+            for path, _, *options in tasks]
+        results = parallel._map_in_workers(
+            _fill_json_file_in_worker, iter(tasks), schema, config,
+            min(workers, len(tasks)), True, cache)
+    else:
+        if cache is not None:
+            filler = cache.filler(schema, config)
+        else:
+            filler = Filler(schema, config)
+        results = (_fill_json_file(*task, filler) for task in tasks)
+    status = 0
+    for path, output, error in results:
+        if error is not None:
+            print(f"{path}: {error}", file=sys.stderr)
+            status = 1
+        elif output is not None:
+            sys.stdout.write(output)
+    sys.stdout.flush()
+    return status
+
+
+def _fill_json_file_in_worker(task: tuple) -> tuple:
+    """Fill a JSON file with the filler of a worker process"""
+    return _fill_json_file(*task, parallel._worker_filler)
+
+
+def _fill_json_file(
+        path: str, text: Union[str, None], in_place: bool,
+        indent: Union[int, None], filler: Filler) -> tuple:
+    """Fill the instance of a JSON file
+
+    Args:
+        path (str): Path of the file, or - for stdin
+        text (str | None): JSON read from the file already, e.g. from stdin
+            by the parent of a worker process. If None, the file is read.
+        in_place (bool): Write the filled instance back to the file
+        indent (int | None): Indentation of the filled JSON
+        filler (Filler): Compiled filler
+
+    Returns:
+        path (str): Path of the file
+        output (str | None): Filled instance as JSON, or None if written in
+            place or not filled
+        error (str | None): Error message, or None if filled
+    """
+    try:
+        if text is not None:
+            instance = json.loads(text)
+        elif path == "-":
+            instance = json.load(sys.stdin)
+        else:
+            with open(path, "r") as file:
+                instance = json.load(file)
+        output = json.dumps(filler.fill(instance), indent=indent) + "\n"
+        if in_place:
+            _write_in_place(path, output.encode())
+            return path, None, None
+        return path, output, None
+    except Exception as error:
+        return path, None, f"{type(error).__name__}: {error}"
+
+
+def _fill_ndjson_files(
+        paths: list, schema: dict, config: FillConfig, workers: int,
+        cache: Union[PlanCache, None], args: argparse.Namespace) -> int:
+    """Fill NDJSON streams, each holding one instance per line"""
+    status = 0
+    for path in paths:
+        if path == "-":
+            source = sys.stdin.buffer
+        else:
+            source = open(path, "rb")
+        if args.in_place:
+            sink = tempfile.NamedTemporaryFile(
+                dir=os.path.dirname(os.path.abspath(path)), delete=False)
+        else:
+            sink = sys.stdout.buffer
+        try:
+            report = fill_ndjson(
+                source, sink, schema, config,
+                on_error=lambda error: print(
+                    f"{path}:{error.line_number}: "
+                    f"{type(error.error).__name__}: {error.error}",
+                    file=sys.stderr),
+                chunksize=args.chunksize, workers=workers, cache=cache)
+        except BaseException:
+            if args.in_place:
+                sink.close()
+                os.unlink(sink.name)
+            raise
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+        if args.in_place:
+            sink.close()
+            shutil.copymode(path, sink.name)
+            os.replace(sink.name, path)
+        sys.stdout.flush()
+        if report.failed:
+            status = 1
+        if args.stats:
+            print(f"{path}: {report.filled} filled, {report.failed} failed, "
+                  f"{report.lines_per_second:.0f} lines/s, "
+                  f"{report.megabytes_per_second:.1f} MB/s", file=sys.stderr)
+    return status
+
+
+def _write_in_place(path: str, data: bytes):
+    """Replace the content of a file atomically"""
+    with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(os.path.abspath(path)), delete=False) as file:
+        file.write(data)
+    shutil.copymode(path, file.name)
+    os.replace(file.name, path)
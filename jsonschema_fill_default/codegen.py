@@ -0,0 +1,491 @@
+import linecache
+import math
+import weakref
+from itertools import count
+from numbers import Number
+from types import CodeType
+from typing import Callable, Union
+
+from .copying import is_frozen, thaw
+from .filler import KEYWORDS, Filler, _Branches, _FillPass, _Node, _Patterns
+from .predicates import (
+    _ANNOTATIONS, _is_integer, _scalar_key, json_equal)
+
+
+# Sources of the checks of the instance types of "type", by name
+_TYPE_SOURCES = {
+    "null": "{0} is None",
+    "boolean": "isinstance({0}, bool)",
+    "integer": "_is_integer({0})",
+    "number": "(isinstance({0}, _Number) and not isinstance({0}, bool))",
+    "string": "isinstance({0}, str)",
+    "array": "isinstance({0}, list)",
+    "object": "isinstance({0}, dict)",
+}
+
+# Maximum number of "oneOf" or "anyOf" subschemas to check one after
+# another, instead of looking up their candidates by a discriminator
+_MAX_UNROLLED_BRANCHES = 8
+
+# Unique file names of generated sources, for tracebacks
+_FILE_NUMBERS = count()
+
+
+def _literal(value) -> Union[str, None]:
+    """Return the source of a JSON scalar that evaluates to an equal value of
+    the same type, or None if it has none"""
+    if value is None or type(value) in (bool, int, str):
+        return repr(value)
+    if type(value) is float and math.isfinite(value):
+        return repr(value)
+    return None
+
+
+class _Generator:
+    """Generator of the Python source of the fill function of a `Filler`
+
+    Every node that fills something becomes a function `fill_<n>` of the
+    instance. Keywords are unrolled into straight-line code in schema order,
+    with the property names, defaults, and simple conditions (see
+    `compile_predicate`) inlined. Everything else, e.g. validators and
+    custom keywords, is referenced as a constant of the namespace the source
+    is executed in.
+
+    Args:
+        filler (Filler): Compiled filler, filling in place without stats
+    """
+
+    def __init__(self, filler: Filler):
+        self.filler = filler
+        self.frozen = filler.config.default_copy == "frozen"
+        self.shared = filler.config.default_copy in ("share", "frozen")
+        # Missing parents and "prefixItems" are created like by the engine,
+        # with a pass that holds no state while filling in place
+        fill_pass = _FillPass(filler)
+        self.namespace = {
+            "_Number": Number, "_is_integer": _is_integer,
+            "_scalar_key": _scalar_key, "_json_equal": json_equal,
+            "_is_frozen": is_frozen, "_thaw": thaw, "_fill_pass": fill_pass,
+            "_create_parent": fill_pass._create_parent,
+            "_append_prefixitems": fill_pass._append_prefixitems,
+        }
+        self.constants = {}  # Name by id of value
+        self.names = {}  # Function name by (kind, node)
+        self.pending = []  # (definition, node, name) of functions to generate
+        self.tables = []  # Patterns and branches of function names
+        self.lines = []
+        self.emitters = {
+            "properties": self.properties,
+            "patternProperties": self.patternproperties,
+            "additionalProperties": self.additionalproperties,
+            "allOf": self.allof,
+            "anyOf": self.anyof,
+            "oneOf": self.oneof,
+            "if": self.ifthenelse,
+            "dependentSchemas": self.dependentschemas,
+            "default": self.default,
+            "$ref": self.ref,
+        }
+
+    def generate(self) -> str:
+        """Return the source of `fill(instance)` and the functions it calls
+        """
+        root = self.function(self.filler._root)
+        self.line(0, "def fill(instance):")
+        if root is not None:
+            self.line(1, f"{root}(instance)")
+        self.line(1, "return instance")
+        while self.pending:
+            definition, node, name = self.pending.pop(0)
+            self.line(0, "")
+            self.line(0, "")
+            definition(node, name)
+        return "\n".join(self.lines) + "\n"
+
+    def line(self, indent: int, text: str):
+        self.lines.append("    " * indent + text)
+
+    def constant(self, value, prefix: str) -> str:
+        """Return the name of a value in the namespace, adding it once"""
+        name = self.constants.get(id(value))
+        if name is None:
+            name = f"{prefix}_{len(self.constants)}"
+            self.constants[id(value)] = name
+            self.namespace[name] = value
+        return name
+
+    def schedule(self, node: _Node, kind: str, definition: Callable) -> str:
+        """Return the name of a function of a node, generating it once"""
+        name = self.names.get((kind, node))
+        if name is None:
+            name = self.names[(kind, node)] = f"{kind}_{len(self.names)}"
+            self.pending.append((definition, node, name))
+        return name
+
+    def function(self, node: _Node) -> Union[str, None]:
+        """Return the name of the fill function of a node, or None if filling
+        with the node does nothing"""
+        if not node.ops and not (node.prefixitems or node.items is not None):
+            return None
+        return self.schedule(node, "fill", self.fill_definition)
+
+    def fill_definition(self, node: _Node, name: str):
+        """Generate the fill function of a node, like `_FillPass.fill`"""
+        self.line(0, f"def {name}(instance):")
+        if node.location is not None:
+            self.line(1, f"# {node.location}")
+        for keyword, fill, arg in node.ops:
+            self.line(1, f"# {keyword}")
+            if self.filler.keywords[keyword] is KEYWORDS.get(keyword):
+                self.emitters[keyword](1, arg)
+            else:  # Custom keywords are filled by their handler
+                self.line(1, f"{self.constant(fill, 'keyword')}(_fill_pass, "
+                             f"instance, {self.constant(arg, 'arg')})")
+        if node.prefixitems or node.items is not None:
+            self.line(1, "# prefixItems, items")
+            self.items(1, node)
+        self.line(1, "return None")
+
+    def block(self, indent: int, start: int):
+        """End a block that began at line `start`, with `pass` if empty"""
+        if len(self.lines) == start:
+            self.line(indent, "pass")
+
+    def link(self):
+        """Replace the function names in tables with the functions, once the
+        source is executed in the namespace"""
+        namespace = self.namespace
+        for table in self.tables:
+            if isinstance(table, _Patterns):
+                table.patterns = tuple(
+                    (regex, namespace[name]) for regex, name in table.patterns)
+                continue
+            table.nodes = tuple(namespace[name] for name in table.nodes)
+            table.index = {
+                key: tuple(namespace[name] for name in names)
+                for key, names in table.index.items()}
+            table.unindexed = tuple(
+                namespace[name] for name in table.unindexed)
+
+    def copy(self, value, copier: Callable) -> str:
+        """Return the source of the value to insert for a default value"""
+        if self.shared or not isinstance(value, (dict, list)):
+            shared = copier()  # The same value on every call
+            literal = _literal(shared)
+            return literal if literal is not None \
+                else self.constant(shared, "default")
+        return self.constant(copier, "copy") + "()"
+
+    def child(self, indent: int, key: str, node: _Node):
+        """Fill a child of `instance` with a node, like
+        `_FillPass._fill_child`"""
+        start = len(self.lines)
+        function = self.function(node)
+        if self.frozen:  # Frozen defaults are thawed before filling into
+            self.line(indent, f"child = instance[{key}]")
+            self.line(indent, "if _is_frozen(child):")
+            self.line(indent + 1, f"child = instance[{key}] = _thaw(child)")
+            if function is not None:
+                self.line(indent, f"{function}(child)")
+        elif function is not None:
+            self.line(indent, f"{function}(instance[{key}])")
+        self.block(indent, start)
+
+    def property(self, indent: int, key: str, node: _Node):
+        """Fill a property of `instance` with its node, like
+        `_FillPass._fill_property`"""
+        if node.recurses:
+            self.line(indent, f"if {key} in instance:")
+            self.child(indent + 1, key, node)
+            if self.filler.config.create_missing_parents:
+                self.line(indent, "else:")
+                self.line(indent + 1, f"_create_parent(instance, {key}, "
+                                      f"{self.constant(node, 'node')})")
+        if node.has_default:
+            value = self.copy(node.default, node.copy_default)
+            self.line(indent, f"if {key} not in instance:")
+            self.line(indent + 1, f"instance[{key}] = {value}")
+            if node.default_items:
+                self.line(indent, f"elif isinstance(instance[{key}], dict):")
+                self.line(indent + 1, f"existing = instance[{key}]")
+                if self.frozen:
+                    missing = " or ".join(
+                        f"{default_key!r} not in existing"
+                        for default_key, _ in node.default_items)
+                    self.line(indent + 1,
+                              f"if _is_frozen(existing) and ({missing}):")
+                    self.line(indent + 2,
+                              f"existing = instance[{key}] = _thaw(existing)")
+                for default_key, copier in node.default_items:
+                    value = self.copy(node.default[default_key], copier)
+                    self.line(indent + 1,
+                              f"if {default_key!r} not in existing:")
+                    self.line(
+                        indent + 2, f"existing[{default_key!r}] = {value}")
+        if node.has_items:
+            self.line(indent, f"if {key} in instance:")
+            self.child(indent + 1, key, node)
+
+    def items(self, indent: int, node: _Node):
+        """Fill a list with "prefixItems" and "items", like
+        `_FillPass._fill_prefixitems_and_items`"""
+        n_prefixitems = len(node.prefixitems)
+        self.line(indent, "if isinstance(instance, list):")
+        self.line(indent + 1, "n = len(instance)")
+        self.line(indent + 1, f"if n > {n_prefixitems}:")
+        start = len(self.lines)
+        if node.items is not None:
+            self.line(indent + 2, f"for i in range({n_prefixitems}, n):")
+            self.child(indent + 3, "i", node.items)
+        self.block(indent + 2, start)
+        if n_prefixitems:
+            self.line(indent + 1, "else:")
+            self.line(indent + 2, f"_append_prefixitems(instance, "
+                                  f"{self.constant(node, 'node')})")
+        for i, prefixitem in enumerate(node.prefixitems):
+            if not self.frozen and self.function(prefixitem) is None:
+                continue
+            self.line(indent + 1, f"if n > {i} and "
+                                  f"isinstance(instance[{i}], (dict, list)):")
+            self.child(indent + 2, str(i), prefixitem)
+
+    def properties(self, indent: int, properties: tuple):
+        self.line(indent, "if isinstance(instance, dict):")
+        for _property, node in properties:
+            self.property(indent + 1, repr(_property), node)
+
+    def property_function(self, node: _Node) -> str:
+        """Return the name of a function filling a property with a node"""
+        return self.schedule(node, "property", self.property_definition)
+
+    def property_definition(self, node: _Node, name: str):
+        self.line(0, f"def {name}(instance, key):")
+        self.property(1, "key", node)
+        self.line(1, "return None")
+
+    def patternproperties(self, indent: int, patterns: _Patterns):
+        functions = _Patterns(tuple(
+            (regex, self.property_function(node))
+            for regex, node in patterns.patterns))
+        self.tables.append(functions)
+        self.line(indent, "if isinstance(instance, dict):")
+        self.line(indent + 1, "for key in list(instance):")
+        self.line(indent + 2, f"for fill_property in "
+                              f"{self.constant(functions, 'patterns')}"
+                              f".match(key):")
+        self.line(indent + 3, "fill_property(instance, key)")
+
+    def additionalproperties(self, indent: int, additional: tuple):
+        node, declared, patterns = additional
+        self.line(indent, "if isinstance(instance, dict):")
+        self.line(indent + 1, "for key in list(instance):")
+        condition = f"key not in {self.constant(declared, 'declared')}"
+        if patterns is not None:
+            condition += \
+                f" and not {self.constant(patterns, 'patterns')}.match(key)"
+        self.line(indent + 2, f"if {condition}:")
+        self.property(indent + 3, "key", node)
+
+    def allof(self, indent: int, nodes: tuple):
+        for node in nodes:
+            self.ref(indent, node)
+
+    def ref(self, indent: int, node: _Node):
+        function = self.function(node)
+        if function is not None:
+            self.line(indent, f"{function}(instance)")
+
+    def condition(self, node: _Node) -> str:
+        """Return the source of whether `instance` is valid against a node
+        """
+        if node.predicate is not None:
+            return self.predicate(node.schema, "instance")
+        validators = self.filler.validators
+
+        def is_valid(instance, schema=node.schema, location=node.location):
+            return validators.is_valid(instance, schema, location)
+        return f"{self.constant(is_valid, 'is_valid')}(instance)"
+
+    def predicate(self, schema: Union[dict, bool], value: str) -> str:
+        """Return the source of a predicate of a value, see
+        `compile_predicate`, for a schema it compiles"""
+        if isinstance(schema, bool):
+            return repr(schema)
+        checks = []
+        for keyword, arg in schema.items():
+            if keyword in _ANNOTATIONS:
+                continue
+            if keyword == "type":
+                names = [arg] if isinstance(arg, str) else arg
+                checks.append("(" + " or ".join(
+                    _TYPE_SOURCES[name].format(value) for name in names) + ")")
+            elif keyword == "const":
+                checks.append(self.equals(value, arg))
+            elif keyword == "enum":
+                keys = [_scalar_key(each) for each in arg]
+                if None in keys:
+                    checks.append(
+                        f"any(_json_equal({value}, each) "
+                        f"for each in {self.constant(arg, 'enum')})")
+                else:
+                    checks.append(f"_scalar_key({value}) in "
+                                  f"{self.constant(frozenset(keys), 'enum')}")
+            elif keyword == "required" and arg:
+                checks.append(
+                    f"(not isinstance({value}, dict) or ("
+                    + " and ".join(f"{name!r} in {value}" for name in arg)
+                    + "))")
+            elif keyword == "properties":
+                properties = []
+                for _property, subschema in arg.items():
+                    check = self.predicate(
+                        subschema, f"{value}[{_property!r}]")
+                    if check != "True":
+                        properties.append(
+                            f"({_property!r} not in {value} or {check})")
+                if properties:
+                    checks.append(
+                        f"(not isinstance({value}, dict) or ("
+                        + " and ".join(properties) + "))")
+        if not checks:
+            return "True"
+        return checks[0] if len(checks) == 1 \
+            else "(" + " and ".join(checks) + ")"
+
+    def equals(self, value: str, const) -> str:
+        """Return the source of whether a value equals a "const\""""
+        if const is None or isinstance(const, bool):
+            return f"{value} is {const!r}"
+        if isinstance(const, str):
+            return f"{value} == {const!r}"
+        if isinstance(const, Number):
+            literal = _literal(const)
+            if literal is None:
+                literal = self.constant(const, "const")
+            return f"({value} == {literal} and not isinstance({value}, bool))"
+        return f"_json_equal({value}, {self.constant(const, 'const')})"
+
+    def case_function(self, node: _Node) -> str:
+        """Return the name of a function that fills an instance with a
+        "oneOf" or "anyOf" node if it is valid to it, and returns validity"""
+        return self.schedule(node, "case", self.case_definition)
+
+    def case_definition(self, node: _Node, name: str):
+        function = self.function(node)
+        self.line(0, f"def {name}(instance):")
+        self.line(1, f"if {self.condition(node)}:")
+        if function is not None:
+            self.line(2, f"{function}(instance)")
+        self.line(2, "return True")
+        self.line(1, "return False")
+
+    def branches(self, indent: int, branches: _Branches, first: bool):
+        """Fill with the first, or every, "oneOf" or "anyOf" node the
+        instance is valid to, like `_FillPass._fill_oneof` and
+        `_FillPass._fill_anyof`"""
+        if branches.discriminator is not None \
+                and len(branches.nodes) > _MAX_UNROLLED_BRANCHES:
+            # Look up the candidates by the discriminator
+            cases = _Branches(tuple(map(self.case_function, branches.nodes)))
+            cases.discriminator = branches.discriminator
+            cases.index = {
+                key: tuple(map(self.case_function, nodes))
+                for key, nodes in branches.index.items()}
+            cases.unindexed = tuple(
+                map(self.case_function, branches.unindexed))
+            self.tables.append(cases)
+            self.line(indent, f"for case in "
+                              f"{self.constant(cases, 'cases')}"
+                              f".candidates(instance):")
+            self.line(indent + 1, "if case(instance):" if first
+                      else "case(instance)")
+            if first:
+                self.line(indent + 2, "break")
+            return
+        keyword = "if"
+        for node in branches.nodes:
+            function = self.function(node)
+            self.line(indent, f"{keyword} {self.condition(node)}:")
+            self.line(indent + 1, f"{function}(instance)"
+                      if function is not None else "pass")
+            if first:
+                keyword = "elif"
+
+    def anyof(self, indent: int, branches: _Branches):
+        self.branches(indent, branches, first=False)
+
+    def oneof(self, indent: int, branches: _Branches):
+        self.branches(indent, branches, first=True)
+
+    def ifthenelse(self, indent: int, nodes: tuple):
+        if_node, then_node, else_node = nodes
+        then_function = None if then_node is None \
+            else self.function(then_node)
+        else_function = None if else_node is None \
+            else self.function(else_node)
+        self.line(indent, f"if {self.condition(if_node)}:")
+        self.line(indent + 1, f"{then_function}(instance)"
+                  if then_function is not None else "pass")
+        if else_function is not None:
+            self.line(indent, "else:")
+            self.line(indent + 1, f"{else_function}(instance)")
+
+    def dependentschemas(self, indent: int, dependents: tuple):
+        self.line(indent, "if isinstance(instance, dict):")
+        start = len(self.lines)
+        for _property, node in dependents:
+            function = self.function(node)
+            if function is not None:
+                self.line(indent + 1, f"if {_property!r} in instance:")
+                self.line(indent + 2, f"{function}(instance)")
+        self.block(indent + 1, start)
+
+    def default(self, indent: int, default_items: tuple):
+        self.line(indent, "if not instance and isinstance(instance, dict):")
+        start = len(self.lines)
+        for key, copier in default_items:
+            self.line(indent + 1, f"instance[{key!r}] = "
+                                  f"{self.copy(copier(), copier)}")
+        self.block(indent + 1, start)
+
+
+def _renamed(code: CodeType, filename: str) -> CodeType:
+    """Return a code object and the code objects it defines with another
+    file name"""
+    return code.replace(co_filename=filename, co_consts=tuple(
+        _renamed(const, filename) if isinstance(const, CodeType) else const
+        for const in code.co_consts))
+
+
+def generate_fill(
+        filler: Filler, compiled: Union[tuple, None] = None) -> tuple:
+    """Generate and execute the source of a fill function of a filler
+
+    Args:
+        filler (Filler): Compiled filler, filling in place without stats
+        compiled (tuple | None): (source, code) of an earlier generation,
+            e.g. unpickled, whose code is executed instead of compiling the
+            source again if the source is the same
+
+    Returns:
+        fill (callable): Function filling an instance in place and returning
+            it, like `filler.fill`
+        source (str): Python source of the function
+        code (types.CodeType): Code object of the source
+    """
+    generator = _Generator(filler)
+    source = generator.generate()
+    filename = f"<jsonschema_fill_default.codegen-{next(_FILE_NUMBERS)}>"
+    if compiled is not None and compiled[0] == source:
+        code = _renamed(compiled[1], filename)
+    else:
+        code = compile(source, filename, "exec")
+    exec(code, generator.namespace)
+    generator.link()
+    fill = generator.namespace["fill"]
+    # Tracebacks show the lines of the source while the function exists
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(True), filename)
+    weakref.finalize(fill, linecache.cache.pop, filename, None)
+    return fill, source, code
+
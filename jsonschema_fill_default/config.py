@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+from .stats import FillStats
+
+
+@dataclass
+class FillConfig:
+    """Configuration for `fill_default` and its private methods
+
+    Args:
+        create_missing_parents (bool): If a parent is missing in the instance
+            and the schema has sub-defaults in the parent, then create that
+            parent in the instance and fill its sub-defaults.
+        validator_cache_size (int): Maximum number of validators a `Filler`
+            caches for selecting "oneOf", "anyOf", and "if" branches.
+        schema_dir (str | Path | None): Directory to load schema files of
+            relative "$ref" from. If None, only local "$ref" (e.g.
+            "#/$defs/name") and "$ref" to embedded "$id" resolve.
+        default_copy (str): How defaults are inserted into instances:
+            - "share" (default): the value of the schema itself, shared by
+              all filled instances and the schema. Fastest, but mutating an
+              inserted object or array default mutates the schema.
+            - "shallow": a new object or array whose items are shared
+            - "deep": a new deep copy, independent of the schema
+            - "frozen": an immutable copy made once and shared. Inserted
+              objects and arrays raise TypeError on mutation, and are copied
+              when filled into.
+        mutate (bool): If True, fill instances in place. If False, return a
+            filled copy instead, copying only the containers on the paths
+            where defaults are inserted and sharing all other subtrees with
+            the input.
+        engine (str): "recursive" (default) fills nested instances by
+            recursion. "iterative" fills them on an explicit work stack, with
+            the same result and keyword order, so the depth of instances and
+            of nested schemas is only limited by memory (but for custom
+            keywords and the validation of "if", "oneOf", and "anyOf"
+            subschemas, which recurse).
+            "codegen" generates and executes Python source of a fill
+            function specialized to the schema, with the same result, for
+            mutating fills of whole instances without stats (others use
+            "recursive").
+        keywords (dict | None): Handlers of custom keywords by name, as
+            `Keyword`, added to (or replacing) the built-in `KEYWORDS`.
+        stats (FillStats | None): If given, count keyword visits, validations,
+            inserted defaults, and created and discarded parents, and
+            optionally time keywords, into it. If None, fills are not
+            instrumented.
+    """
+    create_missing_parents: bool = True
+    validator_cache_size: int = 1024
+    schema_dir: Union[str, Path, None] = None
+    default_copy: str = "share"
+    mutate: bool = True
+    engine: str = "recursive"
+    keywords: Union[dict, None] = None
+    stats: Union[FillStats, None] = None
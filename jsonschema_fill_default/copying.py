@@ -0,0 +1,169 @@
+from functools import partial
+from itertools import repeat
+from typing import Callable
+
+
+# Strategies of `FillConfig.default_copy`
+COPY_STRATEGIES = ("share", "shallow", "deep", "frozen")
+
+# Maximum depth of nested copiers, below which values are copied on a stack
+_MAX_COPIER_DEPTH = 32
+
+
+def _immutable(*args, **kwargs):
+    raise TypeError("frozen default values cannot be mutated")
+
+
+class FrozenDict(dict):
+    """Immutable dict of a frozen default value
+
+    Compares, serializes, and reads like a dict, but raises TypeError on
+    mutation. Copies of it are itself.
+    """
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+
+class FrozenList(list):
+    """Immutable list of a frozen default value
+
+    Compares, serializes, and reads like a list, but raises TypeError on
+    mutation. Copies of it are itself.
+    """
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = _immutable
+    sort = reverse = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+
+_FROZEN_TYPES = (FrozenDict, FrozenList)
+
+
+def freeze(value):
+    """Return an immutable copy of a JSON value made of frozen containers"""
+    if type(value) in _FROZEN_TYPES:
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Return a mutable shallow copy of a frozen container, else the value"""
+    if type(value) is FrozenDict:
+        return dict(value)
+    if type(value) is FrozenList:
+        return list(value)
+    return value
+
+
+def is_frozen(value) -> bool:
+    """True if a value is a frozen container"""
+    return type(value) in _FROZEN_TYPES
+
+
+def _is_immutable(value) -> bool:
+    return not isinstance(value, (dict, list)) or type(value) in _FROZEN_TYPES
+
+
+def _deep_copy(value):
+    """Return a deep copy of a JSON container, copied on an explicit stack
+    instead of recursing"""
+    copy = value.copy()
+    stack = [copy]
+    while stack:
+        container = stack.pop()
+        keys = container.keys() if isinstance(container, dict) \
+            else range(len(container))
+        for key in keys:  # Replacing values does not change the keys
+            item = container[key]
+            if not _is_immutable(item):
+                item = container[key] = item.copy()
+                stack.append(item)
+    return copy
+
+
+def compile_deep_copier(value, _depth: int = 0) -> Callable[[], object]:
+    """Return a function returning a new deep copy of a JSON value
+
+    The copier is specialized to the structure of the value: immutable
+    values and frozen containers are shared, containers of only immutable
+    values are copied with their C `copy` method, and other containers by
+    nested copiers. Containers nested deeper than `_MAX_COPIER_DEPTH` are
+    copied on an explicit stack, so that deeply nested values do not hit
+    the recursion limit.
+    """
+    if _is_immutable(value):
+        return repeat(value).__next__
+    items = value.values() if isinstance(value, dict) else value
+    if all(_is_immutable(item) for item in items):
+        return value.copy
+    if _depth >= _MAX_COPIER_DEPTH:
+        return partial(_deep_copy, value)
+    _depth += 1
+    if isinstance(value, dict):
+        copiers = tuple(
+            (key, compile_deep_copier(item, _depth))
+            for key, item in value.items())
+
+        def copy_dict():
+            return {key: copier() for key, copier in copiers}
+        return copy_dict
+    copiers = tuple(compile_deep_copier(item, _depth) for item in value)
+
+    def copy_list():
+        return [copier() for copier in copiers]
+    return copy_list
+
+
+def compile_copier(value, strategy: str) -> Callable[[], object]:
+    """Return a function returning the value to insert for a default value
+
+    Args:
+        value: JSON value of a "default" keyword
+        strategy (str): One of `COPY_STRATEGIES`:
+            - "share": the value itself, shared by all filled instances
+            - "shallow": a new container with the items of the value shared
+            - "deep": a new deep copy
+            - "frozen": an immutable copy of the value made once and shared
+
+    Returns:
+        copier (callable): Function without arguments returning the value
+    """
+    if strategy == "share" or _is_immutable(value):
+        return repeat(value).__next__
+    if strategy == "shallow":
+        return value.copy
+    if strategy == "deep":
+        return compile_deep_copier(value)
+    if strategy == "frozen":
+        return repeat(freeze(value)).__next__
+    raise ValueError(
+        f"default_copy must be one of {COPY_STRATEGIES}, not {strategy!r}")
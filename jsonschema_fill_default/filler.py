@@ -0,0 +1,1867 @@
+import marshal
+import re
+import sys
+import time
+from copy import deepcopy
+from dataclasses import replace
+from threading import RLock
+from types import MappingProxyType
+from typing import Iterable, Iterator, Union
+from urllib.parse import urldefrag, urljoin
+
+from referencing import Resource
+from referencing.jsonschema import DRAFT202012
+
+from .config import FillConfig
+from .keywords import Keyword
+from .stats import FillStats
+from .paths import array_index, path_tree
+from .predicates import compile_predicate
+from .copying import (
+    COPY_STRATEGIES, compile_copier, compile_deep_copier, is_frozen, thaw)
+from .refs import contains_ref, join_pointer, registry_for, target_location
+from .validator_cache import ValidatorCache
+
+
+# Markers of node values that are not yet computed or are being computed
+_UNSET = object()
+_COMPUTING = object()
+
+# Maximum number of keys whose matching "patternProperties" are memoized
+_MAX_MATCHES = 4096
+
+# Engines of `FillConfig.engine`
+ENGINES = ("recursive", "iterative", "codegen")
+
+
+class _Node:
+    """Fill plan of a single (sub)schema
+
+    Attributes:
+        schema (dict, bool): Schema the node was compiled from
+        ops (tuple): (keyword, fill, argument) of the keywords of the schema
+            that have a handler, in schema order
+        location (str | None): URI of the schema with a JSON pointer fragment
+            (just the fragment if the root schema has no "$ref" but stats
+            are timed), or None if the root schema has no "$ref" or the
+            schema is below an "$anchor"
+        ref (_Node | None): Node of the schema referenced by "$ref"
+        recurses (bool): The schema, or a schema it references, has a keyword
+            that fills nested defaults
+        has_default (bool): The schema, or a schema it references, has a
+            "default" keyword
+        default: Value of the first "default" keyword
+        copy_default (callable | None): Returns the value to insert for the
+            default, copied per `FillConfig.default_copy`
+        default_items (tuple): (key, copier) pairs of an object default
+        has_items (bool): The schema, or a schema it references, has a
+            "prefixItems" or "items" keyword
+        prefixitems (tuple): Nodes of the "prefixItems" subschemas
+        items (_Node | None): Node of the "items" subschema
+        prefix_tail (int): Index from which all "prefixItems" resolve to a
+            default, computed on first use
+        empty_parent (callable | None): Returns a copy of a missing parent
+            filled with the node, or None if it gets no defaults, computed on
+            first use
+        empty_value (callable | None): Returns a copy of the value an empty
+            property filled with the node resolves to, or None if it does not
+            resolve to a default, computed on first use
+        predicate (callable | None): True if an instance is valid against
+            the schema, if the schema is simple enough to compile into one
+            (for "if", "anyOf", and "oneOf" subschemas only)
+    """
+    __slots__ = (
+        "schema", "ops", "location", "ref", "recurses", "has_default",
+        "default", "copy_default", "default_items", "has_items",
+        "prefixitems", "items", "prefix_tail", "empty_parent", "empty_value",
+        "predicate")
+
+    def __init__(
+            self, schema: Union[dict, bool], location: Union[str, None]):
+        self.schema = schema
+        self.ops = ()
+        self.location = location
+        self.ref = None
+        self.recurses = False
+        self.has_default = False
+        self.default = None
+        self.copy_default = None
+        self.default_items = ()
+        self.has_items = False
+        self.prefixitems = ()
+        self.items = None
+        self.prefix_tail = _UNSET
+        self.empty_parent = _UNSET
+        self.empty_value = _UNSET
+        self.predicate = None
+
+    def __getstate__(self) -> tuple:
+        """Return the attributes to pickle
+
+        The keywords and copiers are set up by the filler, memoized values
+        are computed again, and the predicate is compiled again on its first
+        call, when unpickled.
+        """
+        return (
+            self.schema, self.location, self.ref, self.recurses,
+            self.has_default, self.default, self.has_items, self.prefixitems,
+            self.items, self.predicate is not None)
+
+    def __setstate__(self, state: tuple):
+        (self.schema, self.location, self.ref, self.recurses,
+         self.has_default, self.default, self.has_items, self.prefixitems,
+         self.items, has_predicate) = state
+        self.ops = ()
+        self.copy_default = None
+        self.default_items = ()
+        self.prefix_tail = self.empty_parent = self.empty_value = _UNSET
+        self.predicate = _predicate_on_first_call(self) if has_predicate \
+            else None
+
+
+def _predicate_on_first_call(node: _Node):
+    """Return a predicate of an unpickled node that compiles its predicate
+    again on its first call"""
+    def predicate(instance) -> bool:
+        node.predicate = compile_predicate(node.schema)
+        return node.predicate(instance)
+    return predicate
+
+
+def _discriminator_key(value):
+    """Return a hashable key of a JSON scalar, or None if not a scalar
+
+    Keys compare like JSON values: booleans differ from numbers, and integers
+    equal floats of the same value.
+    """
+    if isinstance(value, bool):
+        return ("boolean", value)
+    if isinstance(value, (int, float)):
+        return ("number", value)
+    if isinstance(value, str):
+        return ("string", value)
+    if value is None:
+        return ("null", None)
+    return None
+
+
+def _discriminator_values(schema):
+    """Return the discriminator keys allowed by a property subschema
+
+    Returns None if the subschema does not pin the property with a "const" or
+    an "enum" of scalars.
+    """
+    if not isinstance(schema, dict):
+        return None
+    if "const" in schema:
+        values = [schema["const"]]
+    elif isinstance(schema.get("enum"), list):
+        values = schema["enum"]
+    else:
+        return None
+    keys = [_discriminator_key(value) for value in values]
+    if None in keys:
+        return None
+    return keys
+
+
+class _Branches:
+    """Nodes of "oneOf" or "anyOf" subschemas indexed by a discriminator
+
+    A discriminator is a property that subschemas pin with a "const" or
+    "enum". For an instance with that property, only the subschemas allowing
+    its value, and those that do not pin it, are candidates.
+
+    Attributes:
+        nodes (tuple): Nodes of all subschemas, in schema order
+        discriminator (str | None): Name of the discriminator property, or
+            None if no property discriminates at least two subschemas
+        index (dict): Candidate nodes, in schema order, by discriminator key
+        unindexed (tuple): Nodes of subschemas without the discriminator
+    """
+    __slots__ = ("nodes", "discriminator", "index", "unindexed")
+
+    def __init__(self, nodes: tuple):
+        self.nodes = nodes
+        self.discriminator = None
+        self.index = {}
+        self.unindexed = nodes
+
+    def index_discriminator(self):
+        """Pick the property pinned by the most subschemas and index by it
+
+        Subschemas that only "$ref" another are indexed by the properties of
+        the referenced subschema.
+        """
+        nodes = self.nodes
+        pinned = {}  # Property: [allowed keys per subschema]
+        for i, node in enumerate(nodes):
+            while node.ref is not None and "properties" not in node.schema:
+                node = node.ref
+            properties = node.schema.get("properties") \
+                if isinstance(node.schema, dict) else None
+            if not isinstance(properties, dict):
+                continue
+            for _property, subschema in properties.items():
+                keys = _discriminator_values(subschema)
+                if keys is not None:
+                    pinned.setdefault(_property, [None] * len(nodes))[i] = keys
+        counts = {
+            _property: len(nodes) - keys_per_node.count(None)
+            for _property, keys_per_node in pinned.items()}
+        if not counts or max(counts.values()) < 2:
+            return
+        self.discriminator = max(counts, key=counts.get)
+        keys_per_node = pinned[self.discriminator]
+
+        self.unindexed = tuple(
+            node for node, keys in zip(nodes, keys_per_node) if keys is None)
+        for key in {key for keys in keys_per_node if keys for key in keys}:
+            self.index[key] = tuple(
+                node for node, keys in zip(nodes, keys_per_node)
+                if keys is None or key in keys)
+
+    def candidates(self, instance) -> tuple:
+        """Return the nodes the instance may be valid to, in schema order"""
+        if self.discriminator is None \
+                or not isinstance(instance, dict) \
+                or self.discriminator not in instance:
+            return self.nodes
+        key = _discriminator_key(instance[self.discriminator])
+        if key is None:
+            return self.nodes
+        return self.index.get(key, self.unindexed)
+
+
+class _Patterns:
+    """Nodes of "patternProperties" subschemas with their compiled regexes
+
+    The nodes matching a property name are memoized, so the regexes run once
+    per distinct name (up to `_MAX_MATCHES` names, then the memo restarts).
+
+    Attributes:
+        patterns (tuple): (compiled regex, node) pairs, in schema order
+        matches (dict): Matching nodes, in schema order, by property name
+    """
+    __slots__ = ("patterns", "matches")
+
+    def __init__(self, patterns: tuple):
+        self.patterns = patterns
+        self.matches = {}
+
+    def __getstate__(self) -> dict:
+        return {"patterns": self.patterns}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["patterns"])
+
+    def match(self, _property: str) -> tuple:
+        """Return the nodes whose pattern matches a property name"""
+        nodes = self.matches.get(_property)
+        if nodes is None:
+            nodes = tuple(
+                node for regex, node in self.patterns
+                if regex.search(_property))
+            if len(self.matches) >= _MAX_MATCHES:
+                self.matches.clear()
+            self.matches[_property] = nodes
+        return nodes
+
+
+def _with_predicate(node: _Node) -> _Node:
+    """Compile the predicate of a node whose validity selects a branch"""
+    if node.predicate is None:
+        node.predicate = compile_predicate(node.schema)
+    return node
+
+
+def _compile_properties(
+        filler, value: dict, schema: dict, compile_at) -> tuple:
+    return tuple(
+        (_property, compile_at(subschema, "properties", _property))
+        for _property, subschema in value.items())
+
+
+def _compile_allof(filler, value: list, schema: dict, compile_at) -> tuple:
+    return tuple(
+        compile_at(subschema, "allOf", i) for i, subschema in enumerate(value))
+
+
+def _compile_branches(keyword: str):
+    """Return the compile function of "anyOf" or "oneOf\""""
+    def compile_branches(
+            filler, value: list, schema: dict, compile_at) -> _Branches:
+        branches = _Branches(tuple(
+            _with_predicate(compile_at(subschema, keyword, i))
+            for i, subschema in enumerate(value)))
+        filler._branches.append(branches)  # Indexed once all are compiled
+        return branches
+    return compile_branches
+
+
+def _compile_ifthenelse(filler, value, schema: dict, compile_at) -> tuple:
+    return (
+        _with_predicate(compile_at(value, "if")),
+        compile_at(schema["then"], "then") if "then" in schema else None,
+        compile_at(schema["else"], "else") if "else" in schema else None)
+
+
+def _compile_dependentschemas(
+        filler, value: dict, schema: dict, compile_at) -> tuple:
+    return tuple(
+        (_property, compile_at(subschema, "dependentSchemas", _property))
+        for _property, subschema in value.items())
+
+
+def _compile_patternproperties(
+        filler, value: dict, schema: dict, compile_at) -> _Patterns:
+    return _Patterns(tuple(
+        (re.compile(pattern), compile_at(subschema, "patternProperties",
+                                         pattern))
+        for pattern, subschema in value.items()))
+
+
+def _compile_additionalproperties(
+        filler, value, schema: dict, compile_at) -> Union[tuple, None]:
+    """Compile "additionalProperties" with the property names and patterns
+    of its sibling "properties" and "patternProperties", which it excludes"""
+    if not isinstance(value, dict):  # Boolean schemas have no defaults
+        return None
+    patterns = schema.get("patternProperties")
+    return (
+        compile_at(value, "additionalProperties"),
+        frozenset(schema.get("properties", ())),
+        _compile_patternproperties(filler, patterns, schema, compile_at)
+        if patterns else None)
+
+
+def _compile_default(
+        filler, value, schema: dict, compile_at) -> Union[tuple, None]:
+    """Compile an object "default" into (key, copier) pairs, else skip it"""
+    if not isinstance(value, dict):
+        return None
+    return filler._compile_default_items(value)
+
+
+class Filler:
+    """A schema compiled into a reusable plan for filling instances
+
+    Compiling walks the schema once and precomputes, per subschema, the
+    keywords to apply (in schema order), the properties to visit and whether
+    they recurse, so that `fill` only does the work the instance needs.
+
+    Subschemas that are the same object (e.g., shared by a dereferenced
+    "$ref") are compiled once.
+
+    "$ref" are resolved natively: local ones (e.g. "#/$defs/name"), ones to
+    embedded "$id", and, if `FillConfig.schema_dir` is given, relative ones to
+    schema files in that directory. Each referenced subschema is compiled
+    once and shared, so recursive schemas do not expand infinitely. A missing
+    parent is not created again while it is being created, so a recursive
+    schema creates missing parents only one level deep.
+
+    Defaults are inserted as the value of the schema, or as copies of it,
+    per `FillConfig.default_copy`. The copier of each default is compiled
+    once for its structure.
+
+    With `FillConfig(engine="iterative")`, filling runs on an explicit work
+    stack instead of recursing, so deeply nested instances and schemas do
+    not hit the recursion limit.
+
+    With `FillConfig(engine="codegen")`, the plan is generated into the
+    Python source of a function specialized to the schema, with unrolled
+    properties, inlined defaults, and inlined predicates, which fills whole
+    instances. Its source is the `source` attribute of the filler. Patches,
+    targeted paths, and non-mutating or instrumented fills use the
+    recursive engine instead.
+
+    If `FillConfig.mutate` is False, instances are not mutated. Filling
+    copies a container only on the way to where a default is inserted; all
+    other subtrees of the filled copy are shared with the input.
+
+    Keywords are filled by the handlers of `KEYWORDS`, and of
+    `FillConfig.keywords` for custom or replaced keywords.
+
+    Fillers can be pickled, e.g. by `PlanCache`, if their custom keywords
+    can. The compiled plan is pickled; validators, stats, and memoized
+    values are not, but created again when unpickled.
+
+    "oneOf", "anyOf", and "if" subschemas with only "type", "const",
+    "enum", "required", and "properties" of such subschemas are compiled
+    into predicates, which select branches without `jsonschema`. Validators
+    for selecting other branches are created on first use and kept in the
+    bounded `validators` cache of the filler.
+    "oneOf" and "anyOf" subschemas that pin a discriminator property with
+    "const" or "enum" are indexed by its value, so only the candidate
+    subschemas are validated.
+
+    Args:
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+    """
+
+    def __init__(self, schema: dict, config: Union[FillConfig, None] = None):
+        self.schema = schema
+        self._configure(FillConfig() if config is None else config)
+        self._nodes = {}
+        self._complete = True  # Has the nodes of all subschemas
+        self._full = None  # Compiled filler of an unpickled one, if needed
+        self._branches = []
+        self._schema_files = []  # Paths of the files loaded from schema_dir
+        if contains_ref(schema):
+            registry, base_uri = registry_for(
+                schema, self.config.schema_dir, self._schema_files)
+            self.validators = ValidatorCache(
+                self.config.validator_cache_size, registry)
+            self._root = self._compile(
+                schema, registry.resolver(base_uri), base_uri + "#")
+        else:
+            self.validators = ValidatorCache(self.config.validator_cache_size)
+            self._root = self._compile(
+                schema, None, "#" if self.config.stats is not None else None)
+        self._link()
+        self._prepare()
+
+    def __getstate__(self) -> dict:
+        """Return the compiled plan to pickle
+
+        Only the nodes that filling may visit are pickled, see `_plan_nodes`.
+        Validators, stats, locks, copiers of defaults, memoized values, and
+        the generated fill function are not pickled, but created again when
+        unpickled. The code of the generated source is pickled, so that it is
+        not compiled again.
+        """
+        nodes = self._plan_nodes()
+        plain_ops = self._plain_ops or {}
+        return {
+            "schema": self.schema,
+            "config": replace(self.config, stats=None),
+            "nodes": nodes,
+            "ops": tuple(
+                tuple((keyword, fill, None if fill is _FillPass._fill_default
+                       else arg)  # Copiers of object defaults
+                      for keyword, fill, arg in plain_ops.get(node, node.ops))
+                for node in nodes),
+            "root": self._root,
+            "has_refs": self.validators.registry is not None,
+            "schema_files": tuple(self._schema_files),
+            # Marshaled code objects only load in the same Python version
+            "code": None if self._code is None else (
+                sys.implementation.cache_tag, self.source,
+                marshal.dumps(self._code)),
+        }
+
+    def __setstate__(self, state: dict):
+        self._restore(state, state["config"])
+
+    @classmethod
+    def _from_state(cls, state: dict, config: FillConfig) -> "Filler":
+        """Return a filler of a pickled plan, see `__getstate__`, with a
+        configuration the plan was compiled with (but for `stats`)"""
+        filler = cls.__new__(cls)
+        filler._restore(state, config)
+        return filler
+
+    def _restore(self, state: dict, config: FillConfig):
+        """Set up a filler from a pickled plan, see `_from_state`
+
+        The nodes and their keywords are restored as they were compiled.
+        Only the copiers of their defaults are compiled again.
+        """
+        self.schema = state["schema"]
+        self._configure(config)
+        nodes = state["nodes"]
+        self._nodes = {id(node.schema): node for node in nodes}
+        self._complete = False
+        self._full = None
+        self._branches = []
+        self._schema_files = list(state["schema_files"])
+        for node, ops in zip(nodes, state["ops"]):
+            self._compile_copiers(node)
+            if ops:
+                node.ops = tuple(
+                    (keyword, fill, node.default_items
+                     if fill is _FillPass._fill_default else arg)
+                    for keyword, fill, arg in ops)
+        self._root = state["root"]
+        registry = None
+        if state["has_refs"]:
+            registry, _ = registry_for(
+                self.schema, config.schema_dir, self._schema_files)
+        self.validators = ValidatorCache(
+            config.validator_cache_size, registry)
+        compiled = None
+        if state["code"] is not None \
+                and state["code"][0] == sys.implementation.cache_tag:
+            _, source, code = state["code"]
+            compiled = (source, marshal.loads(code))
+        self._prepare(compiled)
+
+    def _configure(self, config: FillConfig):
+        """Check a configuration and set up the keywords of the filler"""
+        if config.default_copy not in COPY_STRATEGIES:
+            raise ValueError(
+                f"default_copy must be one of {COPY_STRATEGIES}, "
+                f"not {config.default_copy!r}")
+        if config.engine not in ENGINES:
+            raise ValueError(
+                f"engine must be one of {ENGINES}, not {config.engine!r}")
+        self.config = config
+        self._pass_type = _IterativeFillPass \
+            if config.engine == "iterative" else _FillPass
+        self.keywords = dict(KEYWORDS)
+        self.keywords.update(config.keywords or {})
+        # Keywords that make filling visit a property ("default" is inserted
+        # by the parent, and a "$ref" visits if its target does)
+        self._visiting = frozenset(self.keywords) - {"default", "$ref"}
+        self._checks = {}  # Validation plans of `validate_and_fill` by node
+        self._memo_lock = RLock()
+        self._plain_ops = None  # Ops of the nodes before instrumenting
+
+    def _prepare(self, compiled: Union[tuple, None] = None):
+        """Prepare filling with the compiled plan
+
+        Args:
+            compiled (tuple | None): (source, code) of the generated fill
+                function of an unpickled plan, see `generate_fill`
+        """
+        self._tasks = _IterativeFillPass._TASKS
+        self._along = {
+            keyword: fill_along
+            for keyword, fill_along in _FillPass._ALONG.items()
+            if self.keywords.get(keyword) is KEYWORDS[keyword]}
+        if self.config.stats is not None:
+            self._instrument(self.config.stats)
+        self.source = None
+        self._generated = None  # Generated fill function, if any
+        self._code = None  # Code object of the generated source
+        if self.config.engine == "codegen" and self.config.mutate \
+                and self.config.stats is None:
+            from .codegen import generate_fill  # Imports this module
+            self._generated, self.source, self._code = generate_fill(
+                self, compiled)
+
+    def fill(
+            self, instance: Union[dict, list],
+            paths: Union[str, Iterable[str], None] = None
+            ) -> Union[dict, list]:
+        """Fill a JSON instance with the defaults of the compiled schema
+
+        Mutates the instance input, unless `FillConfig.mutate` is False.
+
+        If `paths` are given, only the subtrees at those JSON pointers are
+        filled. Schema and instance are walked together along the paths
+        only, applying the "oneOf", "anyOf", "if-then-else",
+        "dependentSchemas", "allOf", and "$ref" of their ancestors, so that
+        the rest of the instance is not traversed. The subtrees are filled
+        as by a full fill if the conditions of their ancestors do not depend
+        on defaults outside them. Missing ancestors are created if they get
+        defaults, but the defaults of the ancestors themselves and custom
+        keywords of ancestors are not applied, and missing array items are
+        only appended if their array is targeted.
+
+        Args:
+            instance (dict, list): JSON instance valid against the schema
+            paths (str, iterable, None): JSON pointer, or JSON pointers, of
+                the subtrees to fill, e.g. "/settings/render". If None,
+                fills the whole instance.
+
+        Returns:
+            instance (dict, list): Mutated filled instance, or a filled copy
+                sharing unchanged subtrees with the input if not mutating.
+        """
+        if paths is None:
+            return self._fill_root()(instance)
+        return self._pass_type(self).fill_paths(instance, path_tree(paths))
+
+    def fill_patch(
+            self, instance: Union[dict, list], pairs: bool = False
+            ) -> list:
+        """Fill a JSON instance and return the defaults added to it
+
+        Mutates the instance input, unless `FillConfig.mutate` is False, in
+        which case only the patch is returned.
+
+        Args:
+            instance (dict, list): JSON instance valid against the schema
+            pairs (bool): If True, return (JSON pointer, value) pairs instead
+                of JSON Patch operations
+
+        Returns:
+            patch (list): RFC 6902 JSON Patch "add" operations, or (JSON
+                pointer, value) pairs, of the added defaults in the order
+                they were added. Applied in order to the original instance,
+                they give the filled instance. A missing parent created with
+                nested defaults is a single operation.
+        """
+        patch = []
+        self._pass_type(self).fill_root(instance, patch)
+        if pairs:
+            return patch
+        return [{"op": "add", "path": pointer, "value": value}
+                for pointer, value in patch]
+
+    def validate_and_fill(
+            self, instance: Union[dict, list], check_defaults: bool = False
+            ) -> tuple:
+        """Fill a JSON instance and validate it in a single traversal
+
+        See `validate_and_fill`.
+
+        Args:
+            instance (dict, list): JSON instance
+            check_defaults (bool): If True, also validate inserted defaults
+
+        Returns:
+            instance (dict, list): Filled instance, see `fill`
+            errors (list): `jsonschema.ValidationError` of the filled
+                instance. Empty if it is valid.
+        """
+        from .validating import _ValidatingFillPass  # Imports this module
+        filler = self
+        if not self._complete:  # Walking needs the nodes of all subschemas
+            if self._full is None:
+                self._full = Filler(self.schema, self.config)
+            filler = self._full
+        fill_pass = _ValidatingFillPass(filler, check_defaults)
+        instance = fill_pass.validate_and_fill_root(instance)
+        return instance, fill_pass.errors
+
+    def fill_many(
+            self, instances: Iterable[Union[dict, list]]
+            ) -> Union[list, Iterator[Union[dict, list]]]:
+        """Fill many JSON instances with the defaults of the compiled schema
+
+        Mutates the instance inputs, unless `FillConfig.mutate` is False.
+
+        Args:
+            instances (iterable): JSON instances valid against the schema. If
+                an iterator (e.g., a generator), instances are filled lazily.
+
+        Returns:
+            instances (list, iterator): Filled instances, as a generator if
+                `instances` is an iterator, else as a list.
+        """
+        if iter(instances) is instances:
+            return self._fill_iter(instances)
+        fill_root = self._fill_root()
+        return [fill_root(instance) for instance in instances]
+
+    def _fill_iter(self, instances: Iterator) -> Iterator:
+        """Lazily fill and yield each instance of an iterator"""
+        fill_root = self._fill_root()
+        for instance in instances:
+            yield fill_root(instance)
+
+    def _fill_root(self):
+        """Return a function filling whole instances, the generated one if
+        any, else `fill_root` of a new fill pass"""
+        if self._generated is not None:
+            return self._generated
+        return self._pass_type(self).fill_root
+
+    def clear_cache(self):
+        """Evict all cached validators of the filler"""
+        self.validators.clear()
+
+    def _compile(
+            self, schema: Union[dict, bool], resolver,
+            location: Union[str, None]) -> _Node:
+        """Return the node of a schema, compiling it if not yet compiled
+
+        The schema and its subschemas are compiled from an explicit work
+        stack instead of recursing, so that deeply nested schemas do not hit
+        the recursion limit. The node of a subschema is created when first
+        reached, and its keywords are compiled once it is popped.
+
+        Args:
+            schema (dict, bool): (Sub)schema to compile
+            resolver (referencing.Resolver | None): Resolver of "$ref" in the
+                schema, or None if the root schema has no "$ref"
+            location (str | None): URI of the schema with a JSON pointer
+                fragment, or None if unknown
+        """
+        stack = []
+        node = self._add_node(schema, resolver, location, stack)
+        while stack:
+            self._compile_node(*stack.pop(), stack)
+        return node
+
+    def _add_node(
+            self, schema: Union[dict, bool], resolver,
+            location: Union[str, None], stack: list) -> _Node:
+        """Return the node of a schema, creating it and pushing it onto the
+        stack of nodes to compile if not yet created"""
+        node = self._nodes.get(id(schema))
+        if node is None:
+            node = self._nodes[id(schema)] = _Node(schema, location)
+            if isinstance(schema, dict):  # Boolean schemas have no defaults
+                stack.append((node, resolver))
+        return node
+
+    def _compile_node(self, node: _Node, resolver, stack: list):
+        """Compile the keywords of the node of a schema, adding the nodes of
+        its subschemas to the stack"""
+        schema = node.schema
+        location = node.location
+        if resolver is not None and isinstance(schema.get("$id"), str):
+            resolver = resolver.in_subresource(Resource.from_contents(
+                schema, default_specification=DRAFT202012))
+            if location is not None:
+                location = urldefrag(urljoin(
+                    location.split("#")[0], schema["$id"]))[0] + "#"
+
+        def compile_at(subschema, *segments):
+            return self._add_node(
+                subschema, resolver, join_pointer(location, *segments), stack)
+
+        ops = []
+        keywords = self.keywords
+        for keyword, value in schema.items():  # Keep keyword order
+            handler = keywords.get(keyword)
+            if handler is None:
+                continue
+            if keyword == "$ref":  # Resolved by the filler
+                if resolver is None:
+                    continue
+                resolved = resolver.lookup(value)
+                node.ref = arg = self._add_node(
+                    resolved.contents, resolved.resolver,
+                    target_location(location.split("#")[0], value)
+                    if location is not None else None, stack)
+            elif handler.compile is None:
+                arg = value
+            else:
+                arg = handler.compile(self, value, schema, compile_at)
+            if arg is not None:
+                ops.append((keyword, handler.fill, arg))
+        node.ops = tuple(ops)
+        node.recurses = not self._visiting.isdisjoint(schema)
+        node.has_default = "default" in schema
+        node.default = schema.get("default")
+        node.has_items = "prefixItems" in schema or "items" in schema
+        if "prefixItems" in schema:
+            node.prefixitems = tuple(
+                compile_at(subschema, "prefixItems", i)
+                for i, subschema in enumerate(schema["prefixItems"]))
+        if "items" in schema:
+            node.items = compile_at(schema["items"], "items")
+
+    def _link(self):
+        """Complete the nodes once all referenced nodes are compiled
+
+        A node that "$ref" another recurses or has items if any node along
+        its chain of "$ref" does, and gets the first "default" along it.
+        The copiers of the defaults are compiled once they are linked.
+        """
+        for node in self._nodes.values():
+            seen = {node}
+            target = node.ref
+            while target is not None and target not in seen:
+                seen.add(target)
+                node.recurses = node.recurses or target.recurses
+                node.has_items = node.has_items or target.has_items
+                if not node.has_default and target.has_default:
+                    node.has_default = True
+                    node.default = target.default
+                target = target.ref
+            self._compile_copiers(node)
+        self._prune()
+        for branches in self._branches:
+            branches.index_discriminator()
+
+    def _prune(self):
+        """Remove the parts of the plan that cannot add a default
+
+        A node is productive if filling with it may add a default, i.e., if
+        it has an object "default", a custom keyword, array items that may
+        add one, or a keyword with a productive subschema or with a property
+        subschema that has a "default" or is productive. Productive nodes are
+        found up to a fixed point, so recursive "$ref" are handled. Nodes are
+        checked in reverse order of compiling, so that nested subschemas are
+        checked before the schemas they are nested in, and a tree of
+        subschemas is done in one round.
+
+        Nodes that are not productive are not visited and not created as
+        missing parents, and keywords skip their subschemas that are not
+        productive ("oneOf" only those after its last productive one, as it
+        fills the first valid one). Keywords left without any are removed,
+        so, e.g., an "if" whose "then" and "else" have no defaults is never
+        validated. The filled instance is the same.
+        """
+        nodes = list(self._nodes.values())
+        productive = set()
+        changed = True
+        while changed:
+            changed = False
+            for node in reversed(nodes):
+                if node not in productive \
+                        and self._is_productive(node, productive):
+                    productive.add(node)
+                    changed = True
+        for node in nodes:
+            if node not in productive:
+                node.ops = ()
+                node.recurses = node.has_items = False
+                node.prefixitems = ()
+                node.items = None
+                continue
+            ops = []
+            for keyword, fill, arg in node.ops:
+                if self.keywords[keyword] is KEYWORDS.get(keyword):
+                    arg = self._prune_arg(keyword, arg, productive)
+                if arg is not None:
+                    ops.append((keyword, fill, arg))
+            node.ops = tuple(ops)
+            node.recurses = node.recurses and bool(ops)
+            if node.items not in productive:
+                node.items = None
+        self._branches = [
+            arg for node in nodes for _, _, arg in node.ops
+            if isinstance(arg, _Branches)]
+
+    def _is_productive(self, node: _Node, productive: set) -> bool:
+        """True if filling with a node may add a default, given the nodes
+        known to be productive"""
+        if node.items in productive or any(
+                prefixitem.has_default or prefixitem in productive
+                for prefixitem in node.prefixitems):
+            return True
+        return any(
+            self.keywords[keyword] is not KEYWORDS.get(keyword)  # Custom
+            or self._prune_arg(keyword, arg, productive) is not None
+            for keyword, fill, arg in node.ops)
+
+    @staticmethod
+    def _prune_arg(keyword: str, arg, productive: set):
+        """Return the compiled argument of a built-in keyword without the
+        subschemas that cannot add a default, or None if none can"""
+        def fills(node):  # Filling an instance with the node may add one
+            return node in productive
+
+        def inserts(node):  # Filling a property with the node may add one
+            return node.has_default or node in productive
+
+        if keyword in ("properties", "dependentSchemas"):
+            check = inserts if keyword == "properties" else fills
+            pruned = tuple(
+                (_property, node) for _property, node in arg if check(node))
+            return (arg if len(pruned) == len(arg) else pruned) or None
+        if keyword == "allOf":
+            pruned = tuple(filter(fills, arg))
+            return (arg if len(pruned) == len(arg) else pruned) or None
+        if keyword in ("anyOf", "oneOf"):
+            nodes = arg.nodes
+            if keyword == "anyOf":
+                pruned = tuple(filter(fills, nodes))
+            else:  # The first valid node is filled, so keep those before
+                last = max((i for i, node in enumerate(nodes) if fills(node)),
+                           default=-1)
+                pruned = nodes[:last + 1]
+            if not pruned:
+                return None
+            return arg if len(pruned) == len(nodes) else _Branches(pruned)
+        if keyword == "if":
+            if_node, then_node, else_node = arg
+            if not (fills(then_node) or fills(else_node)):
+                return None
+            return (if_node, then_node if fills(then_node) else None,
+                    else_node if fills(else_node) else None)
+        if keyword == "patternProperties":
+            pruned = tuple(
+                (regex, node) for regex, node in arg.patterns if inserts(node))
+            if not pruned:
+                return None
+            return arg if len(pruned) == len(arg.patterns) \
+                else _Patterns(pruned)
+        if keyword == "additionalProperties":
+            return arg if inserts(arg[0]) else None
+        if keyword == "$ref":
+            return arg if fills(arg) else None
+        return arg  # An object "default"
+
+    def _plan_nodes(self) -> tuple:
+        """Return the nodes that filling may visit, from the root
+
+        Nodes whose subschemas are pruned from the plan, e.g., of a "not" or
+        of properties without defaults, are left out. Walking with
+        `validate_and_fill` needs the nodes of all subschemas, so an
+        unpickled filler compiles its schema again for it. With custom
+        keywords, whose arguments may hold any nodes, all nodes are
+        returned.
+        """
+        if self.config.keywords:
+            return tuple(self._nodes.values())
+        plain_ops = self._plain_ops or {}
+        nodes = {self._root: None}  # Ordered set
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            reached = [*node.prefixitems, node.items, node.ref]
+            for _, _, arg in plain_ops.get(node, node.ops):
+                reached.extend(_arg_nodes(arg))
+            for other in reached:
+                if other is not None and other not in nodes:
+                    nodes[other] = None
+                    stack.append(other)
+        return tuple(nodes)
+
+    def _instrument(self, stats: FillStats):
+        """Wrap the keyword handlers of all nodes with counters of `stats`
+
+        The tasks of the iterative engine are wrapped alike.
+        """
+        tasks = dict(self._tasks)
+        self._plain_ops = {
+            node: node.ops for node in self._nodes.values()}
+        for node in self._nodes.values():
+            ops = []
+            for keyword, fill, arg in node.ops:
+                path = join_pointer(node.location, keyword) or keyword
+                counted = _counted(fill, stats, keyword, path)
+                if fill in self._tasks:
+                    tasks[counted] = _counted(
+                        self._tasks[fill], stats, keyword, path)
+                ops.append((keyword, counted, arg))
+            node.ops = tuple(ops)
+        self._tasks = tasks
+
+    def _compile_copiers(self, node: _Node):
+        """Compile the copiers of the default of a linked node"""
+        if node.has_default:
+            node.copy_default = compile_copier(
+                node.default, self.config.default_copy)
+            if isinstance(node.default, dict):
+                node.default_items = self._compile_default_items(
+                    node.default)
+
+    def _compile_default_items(self, default: dict) -> tuple:
+        """Return (key, copier) pairs of the values of an object default"""
+        return tuple(
+            (key, compile_copier(value, self.config.default_copy))
+            for key, value in default.items())
+
+
+def _arg_nodes(arg) -> Iterator[_Node]:
+    """Iterate over the nodes in the compiled argument of a keyword"""
+    if isinstance(arg, _Node):
+        yield arg
+    elif isinstance(arg, _Branches):
+        yield from arg.nodes
+    elif isinstance(arg, _Patterns):
+        for _, node in arg.patterns:
+            yield node
+    elif isinstance(arg, tuple):
+        for item in arg:
+            yield from _arg_nodes(item)
+
+
+def _counted(function, stats: FillStats, keyword: str, path: str):
+    """Wrap a keyword handler or task to count (and time) its calls"""
+    keywords = stats.keywords
+    if not stats.timing:
+        def counted(*args):
+            keywords[keyword] += 1
+            return function(*args)
+        return counted
+    seconds = stats.seconds
+    clock = time.perf_counter
+
+    def timed(*args):
+        keywords[keyword] += 1
+        start = clock()
+        try:
+            return function(*args)
+        finally:
+            seconds[path] += clock() - start
+    return timed
+
+
+def compile_filler(
+        schema: dict,
+        config: Union[FillConfig, None] = None
+        ) -> Filler:
+    """Compile a schema into a `Filler` for filling many instances
+
+    Args:
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+
+    Returns:
+        filler (Filler): Compiled filler whose `fill` method fills an instance
+    """
+    return Filler(schema, config)
+
+
+class _FillPass:
+    """Fill of one instance with the plan of a `Filler`
+
+    Args:
+        filler (Filler): Compiled filler
+    """
+
+    def __init__(self, filler: Filler):
+        self.filler = filler
+        self.config = filler.config
+        self._creating = set()  # Nodes of missing parents being created
+        self._thaw = filler.config.default_copy == "frozen"
+        self._copy_on_write = not filler.config.mutate
+        self._owned = set()  # Ids of containers copied or created by the pass
+        self._writes = 0  # Number of writes into containers
+        self._patch = None  # (JSON pointer, value) of added defaults
+        self._path = None  # Keys from the root to the filled instance
+        self._stats = filler.config.stats
+
+    def fill_root(self, instance, patch: Union[list, None] = None):
+        """Fill an instance with the root node and return it
+
+        If not mutating, fills a shallow copy of the instance instead.
+
+        Args:
+            instance (dict, list): JSON instance valid against the schema
+            patch (list | None): List to append a (JSON pointer, value) pair
+                of every default added to the instance to, in order
+        """
+        instance = self._start(instance, patch)
+        self.fill(instance, self.filler._root)
+        return instance
+
+    def fill_paths(self, instance, tree: Union[dict, None]):
+        """Fill only the subtrees of an instance in a path tree and return it
+
+        See `Filler.fill`.
+
+        Args:
+            instance (dict, list): JSON instance valid against the schema
+            tree (dict | None): Path tree of the subtrees to fill, see
+                `paths.path_tree`, or None to fill the whole instance
+        """
+        instance = self._start(instance)
+        if tree is None:
+            self.fill(instance, self.filler._root)
+        else:
+            self._fill_along(instance, self.filler._root, tree)
+        return instance
+
+    def _start(self, instance, patch: Union[list, None] = None):
+        """Prepare the pass for filling a root instance, see `fill_root`
+
+        Returns:
+            instance (dict, list): The instance to fill, which is a shallow
+                copy of the instance if not mutating
+        """
+        if self._copy_on_write and isinstance(instance, (dict, list)):
+            instance = instance.copy()
+            self._owned = {id(instance)}
+        self._patch = patch
+        self._path = None if patch is None else []
+        return instance
+
+    def fill(self, instance, node: _Node):
+        """Recursively fill an instance with the defaults of a node"""
+        for keyword, fill, arg in node.ops:  # Apply keywords in order
+            fill(self, instance, arg)
+        if isinstance(instance, list) \
+                and (node.prefixitems or node.items is not None):
+            self._fill_prefixitems_and_items(instance, node)
+        return None
+
+    def _fill_properties(self, instance, properties: tuple):
+        """Fill a dict with the defaults of "properties" nodes"""
+        if not isinstance(instance, dict):
+            return None
+        for _property, node in properties:  # Inlines `_fill_property`
+            if node.recurses:
+                if _property in instance:
+                    self._fill_child(instance, _property, node)
+                else:
+                    self._create_parent(instance, _property, node)
+            if node.has_default:
+                self._fill_property_default(instance, _property, node)
+            if node.has_items and _property in instance:
+                self._fill_child(instance, _property, node)
+        return None
+
+    def _fill_property(self, instance: dict, _property: str, node: _Node):
+        """Fill a single property of a dict with the defaults of its node"""
+        if node.recurses:
+            if _property in instance:
+                self._fill_child(instance, _property, node)
+            else:
+                self._create_parent(instance, _property, node)
+        if node.has_default:
+            self._fill_property_default(instance, _property, node)
+        if node.has_items and _property in instance:
+            self._fill_child(instance, _property, node)
+        return None
+
+    def _create_parent(self, instance: dict, _property: str, node: _Node):
+        """Add a missing parent filled with a node, if it gets defaults"""
+        if self.config.create_missing_parents \
+                and node not in self._creating:
+            parent = self._empty_parent(node)
+            if parent is not None:
+                instance[_property] = parent
+                if self._stats is not None and not self._creating:
+                    self._stats.parents_created += 1
+                self._wrote(parent, (_property,))
+        return None
+
+    def _fill_property_default(
+            self, instance: dict, _property: str, node: _Node):
+        """Add the default of a missing property, or merge an object default
+        into the keys missing in an existing object"""
+        if _property not in instance:
+            instance[_property] = node.copy_default()
+            self.added(instance[_property], _property)
+        # Fill missing keys if instance already exists as object
+        elif node.default_items and isinstance(instance[_property], dict):
+            existing = None
+            for default_key, copy_value in node.default_items:
+                if default_key not in instance[_property]:
+                    if existing is None:
+                        existing = self._child(instance, _property)
+                    existing[default_key] = copy_value()
+                    self.added(
+                        existing[default_key], _property, default_key)
+        return None
+
+    def _child(self, instance: Union[dict, list], key: Union[str, int]):
+        """Return a child container of an instance to write into
+
+        A frozen default is replaced by a mutable copy first. If not
+        mutating, a child not yet owned by the pass is replaced by a shallow
+        copy first.
+        """
+        child = instance[key]
+        if self._copy_on_write:
+            if id(child) not in self._owned:
+                child = instance[key] = child.copy()
+                self._owned.add(id(child))
+        elif self._thaw and is_frozen(child):
+            child = instance[key] = thaw(child)
+        return child
+
+    def _fill_child(
+            self, instance: Union[dict, list], key: Union[str, int],
+            node: _Node):
+        """Fill a child of an instance with a node
+
+        If not mutating, a copied child that gets no defaults is replaced by
+        the original again, so that unchanged subtrees stay shared.
+        """
+        child = instance[key]
+        if not isinstance(child, (dict, list)):
+            self.fill(child, node)
+            return None
+        writes = self._writes
+        copied = self._enter_child(instance, key)
+        self.fill(copied, node)
+        self._leave_child(instance, key, child, copied, writes)
+        return None
+
+    def _enter_child(self, instance: Union[dict, list], key: Union[str, int]):
+        """Return a child container to fill, descending the path into it"""
+        if self._path is not None:
+            self._path.append(key)
+        return self._child(instance, key)
+
+    def _leave_child(
+            self, instance: Union[dict, list], key: Union[str, int],
+            child, copied, writes: int):
+        """Ascend the path from a filled child container
+
+        If not mutating, a copied child that got no writes is replaced by the
+        original again.
+        """
+        if self._writes == writes and copied is not child:
+            self._owned.discard(id(copied))
+            instance[key] = child
+        if self._path is not None:
+            self._path.pop()
+        return None
+
+    def added(self, value, *keys):
+        """Count a default added to the filled instance at keys below it
+
+        See `_wrote`.
+        """
+        if self._stats is not None and not self._creating:
+            self._stats.defaults += 1
+        self._wrote(value, keys)
+
+    def _wrote(self, value, keys: tuple):
+        """Count a value added to the filled instance at keys below it
+
+        If recording a patch, appends the JSON pointer of the value and a
+        snapshot of it, unless the value is added to a new missing parent,
+        which is recorded as a whole.
+        """
+        self._writes += 1
+        if self._patch is not None and not self._creating:
+            self._patch.append((
+                "".join(
+                    "/" + str(key).replace("~", "~0").replace("/", "~1")
+                    for key in (*self._path, *keys)),
+                deepcopy(value)))
+
+    def _memoized(self, node: _Node, attribute: str, compute) -> object:
+        """Return a value of a node, computing it once in a new fill pass
+
+        A fill pass fills the same way on every call only if it is not
+        creating missing parents, so values are computed in a new pass. It
+        is an iterative pass whatever the engine, which fills the same, so
+        that missing parents of any depth are created without recursing.
+
+        Args:
+            node (_Node): Node the value is memoized on
+            attribute (str): Name of the attribute memoizing the value
+            compute (callable): Function of a `_FillPass` and the node that
+                computes the value
+
+        Returns:
+            value: Memoized value, or `_COMPUTING` if the value is being
+                computed by this thread (a cycle)
+        """
+        value = getattr(node, attribute)
+        if value is _UNSET or value is _COMPUTING:
+            with self.filler._memo_lock:
+                value = getattr(node, attribute)
+                if value is _UNSET:
+                    setattr(node, attribute, _COMPUTING)
+                    try:
+                        fill_pass = _IterativeFillPass(self.filler)
+                        if self._stats is not None:
+                            # Only deleted parents count, once per filler
+                            fill_pass._stats = FillStats()
+                        else:
+                            fill_pass._stats = None
+                        value = compute(fill_pass, node)
+                        if self._stats is not None:
+                            self._stats.parents_deleted += \
+                                fill_pass._stats.parents_deleted
+                    finally:
+                        setattr(node, attribute, _UNSET if value is _UNSET
+                                else value)
+        return value
+
+    def _fill_new_parent(self, node: _Node) -> Union[dict, None]:
+        """Return a new parent filled with a node, or None if not filled"""
+        parent = {}
+        self._owned.add(id(parent))
+        self._creating.add(node)
+        try:
+            self.fill(parent, node)
+        finally:
+            self._creating.discard(node)
+        if not parent:
+            self._owned.discard(id(parent))
+            if self._stats is not None:
+                self._stats.parents_deleted += 1
+            return None
+        return parent
+
+    def _compile_new_parent(self, node: _Node):
+        """Return a copier of a new parent filled with a node, or None"""
+        parent = self._fill_new_parent(node)
+        return None if parent is None else compile_deep_copier(parent)
+
+    def _empty_parent(self, node: _Node) -> Union[dict, None]:
+        """Return a copy of the memoized missing parent filled with a node
+
+        While creating other missing parents, which may be created again
+        inside this one, the parent is filled instead.
+        """
+        if self._creating:
+            return self._fill_new_parent(node)
+        copy_parent = self._memoized(
+            node, "empty_parent", _FillPass._compile_new_parent)
+        if copy_parent is _COMPUTING:
+            return self._fill_new_parent(node)
+        return None if copy_parent is None else copy_parent()
+
+    def _fill_empty_property(self, node: _Node):
+        """Return a copier of the value of an empty property filled with a
+        node, or None if it does not resolve to a default"""
+        mock_instance = {}
+        self._fill_property(mock_instance, "property", node)
+        value = mock_instance.get("property")
+        return None if value is None else compile_deep_copier(value)
+
+    def _empty_value(self, node: _Node):
+        """Return the memoized copier of the value of an empty property
+        filled with a node, or None if it does not resolve to a default"""
+        copy_value = self._memoized(
+            node, "empty_value", _FillPass._fill_empty_property)
+        return None if copy_value is _COMPUTING else copy_value
+
+    def _compute_prefix_tail(self, node: _Node) -> int:
+        """Return the index from which all "prefixItems" resolve to a default
+
+        Loops over the "prefixItems" in reverse until one does not resolve to
+        a default.
+        """
+        prefix_tail = len(node.prefixitems)
+        for prefixitem in reversed(node.prefixitems):
+            if self._empty_value(prefixitem) is None:
+                break
+            prefix_tail -= 1
+        return prefix_tail
+
+    def _fill_prefixitems_and_items(self, instance: list, node: _Node):
+        """Fill a list with the defaults of "prefixItems" and "items" nodes
+
+        Missing "prefixItems" are only appended if all remaining ones resolve
+        to a default.
+        """
+        n_instance = len(instance)
+        n_prefixitems = len(node.prefixitems)
+        if n_instance > n_prefixitems:  # Fill items
+            if node.items is not None:
+                for i in range(n_prefixitems, n_instance):
+                    self._fill_child(instance, i, node.items)
+            n_existing_prefixitems = n_prefixitems
+        else:
+            n_existing_prefixitems = n_instance
+            self._append_prefixitems(instance, node)
+
+        # For all existing prefixitems, fill default if dict or list
+        for i in range(n_existing_prefixitems):
+            if isinstance(instance[i], (dict, list)):
+                self._fill_child(instance, i, node.prefixitems[i])
+        return None
+
+    def _append_prefixitems(self, instance: list, node: _Node):
+        """Append the defaults of missing "prefixItems" of a list, if all of
+        them resolve to a default"""
+        n_instance = len(instance)
+        prefix_tail = node.prefix_tail
+        if prefix_tail is _UNSET or prefix_tail is _COMPUTING:
+            prefix_tail = self._memoized(
+                node, "prefix_tail", _FillPass._compute_prefix_tail)
+        if prefix_tail is not _COMPUTING and n_instance >= prefix_tail:
+            for prefixitem in node.prefixitems[n_instance:]:
+                copy_value = self._empty_value(prefixitem)
+                instance.append(None if copy_value is None else copy_value())
+                self.added(instance[-1], len(instance) - 1)
+        return None
+
+    def is_valid(self, instance, node: _Node) -> bool:
+        """True if the instance is valid against the schema of a node
+
+        Evaluates the predicate of the node if it has one, else validates
+        with a cached validator.
+        """
+        if self._stats is not None:
+            self._stats.validations += 1
+        if node.predicate is not None:
+            return node.predicate(instance)
+        return self.filler.validators.is_valid(
+            instance, node.schema, node.location)
+
+    def _fill_allof(self, instance, nodes: tuple):
+        """Fill with all "allOf" nodes, as the instance is valid to all"""
+        for node in nodes:
+            self.fill(instance, node)
+        return None
+
+    def _fill_anyof(self, instance, branches: _Branches):
+        """Fill with every "anyOf" node the instance is valid to"""
+        for node in branches.candidates(instance):
+            if self.is_valid(instance, node):
+                self.fill(instance, node)
+        return None
+
+    def _fill_oneof(self, instance, branches: _Branches):
+        """Fill with the first "oneOf" node the instance is valid to"""
+        for node in branches.candidates(instance):
+            if self.is_valid(instance, node):
+                self.fill(instance, node)
+                return None
+        return None
+
+    def _fill_ifthenelse(self, instance, nodes: tuple):
+        """Fill with the "then" or "else" node depending on the "if" node"""
+        if_node, then_node, else_node = nodes
+        branch = then_node if self.is_valid(instance, if_node) else else_node
+        if branch is not None:
+            self.fill(instance, branch)
+        return None
+
+    def _fill_dependentschemas(self, instance, dependents: tuple):
+        """Fill with the "dependentSchemas" nodes of present properties"""
+        if not isinstance(instance, dict):
+            return None
+        for _property, node in dependents:
+            if _property in instance:
+                self.fill(instance, node)
+        return None
+
+    def _fill_patternproperties(self, instance, patterns: _Patterns):
+        """Fill the existing properties of a dict with the defaults of the
+        "patternProperties" nodes their names match"""
+        if not isinstance(instance, dict):
+            return None
+        for _property in list(instance):
+            for node in patterns.match(_property):
+                self._fill_property(instance, _property, node)
+        return None
+
+    def _fill_additionalproperties(self, instance, additional: tuple):
+        """Fill the existing properties of a dict that are neither in
+        "properties" nor match "patternProperties" with the defaults of the
+        "additionalProperties" node"""
+        if not isinstance(instance, dict):
+            return None
+        node, declared, patterns = additional
+        for _property in list(instance):
+            if _property not in declared \
+                    and (patterns is None or not patterns.match(_property)):
+                self._fill_property(instance, _property, node)
+        return None
+
+    def _fill_ref(self, instance, node: _Node):
+        """Fill with the node referenced by "$ref\""""
+        self.fill(instance, node)
+        return None
+
+    def _fill_default(self, instance, default_items: tuple):
+        """Fill an empty dict with an object "default\""""
+        if not instance and isinstance(instance, dict):
+            for key, copy_value in default_items:
+                instance[key] = copy_value()
+                self.added(instance[key], key)
+        return None
+
+    def _fill_along(self, instance, node: _Node, tree: dict):
+        """Fill an instance with a node only along the paths of a path tree
+
+        Keywords that select or fill subschemas for the instance itself are
+        applied; keywords that fill its properties and items only follow the
+        tokens of the tree.
+        """
+        along = self.filler._along
+        for keyword, fill, arg in node.ops:
+            fill_along = along.get(keyword)
+            if fill_along is not None:
+                fill_along(self, instance, arg, tree)
+        if isinstance(instance, list) \
+                and (node.prefixitems or node.items is not None):
+            n_prefixitems = len(node.prefixitems)
+            for token, subtree in tree.items():
+                i = array_index(token, len(instance))
+                if i is None:
+                    continue
+                item = node.prefixitems[i] if i < n_prefixitems \
+                    else node.items
+                if item is not None:
+                    self._fill_key_along(instance, i, item, subtree)
+        return None
+
+    def _fill_key_along(
+            self, instance: Union[dict, list], key: Union[str, int],
+            node: _Node, tree: Union[dict, None]):
+        """Fill the child of an instance at a key with a node along a path
+        tree, or entirely if the tree is None"""
+        if tree is None:
+            if isinstance(instance, dict):
+                self._fill_property(instance, key, node)
+            else:
+                self._fill_child(instance, key, node)
+            return None
+        if isinstance(instance, dict) and key not in instance:
+            self._create_parent_along(instance, key, node, tree)
+            return None
+        child = instance[key]
+        if not isinstance(child, (dict, list)):
+            return None
+        writes = self._writes
+        copied = self._enter_child(instance, key)
+        self._fill_along(copied, node, tree)
+        self._leave_child(instance, key, child, copied, writes)
+        return None
+
+    def _create_parent_along(
+            self, instance: dict, _property: str, node: _Node, tree: dict):
+        """Add a missing parent filled with a node along a path tree, if it
+        gets defaults"""
+        if not (self.config.create_missing_parents and node.recurses) \
+                or node in self._creating:
+            return None
+        parent = {}
+        self._owned.add(id(parent))
+        self._creating.add(node)
+        try:
+            self._fill_along(parent, node, tree)
+        finally:
+            self._creating.discard(node)
+        if not parent:
+            self._owned.discard(id(parent))
+            return None
+        instance[_property] = parent
+        if self._stats is not None and not self._creating:
+            self._stats.parents_created += 1
+        self._wrote(parent, (_property,))
+        return None
+
+    def _properties_along(self, instance, properties: tuple, tree: dict):
+        if isinstance(instance, dict):
+            for _property, node in properties:
+                if _property in tree:
+                    self._fill_key_along(
+                        instance, _property, node, tree[_property])
+        return None
+
+    def _patternproperties_along(
+            self, instance, patterns: _Patterns, tree: dict):
+        if isinstance(instance, dict):
+            for _property, subtree in tree.items():
+                if _property in instance:
+                    for node in patterns.match(_property):
+                        self._fill_key_along(
+                            instance, _property, node, subtree)
+        return None
+
+    def _additionalproperties_along(
+            self, instance, additional: tuple, tree: dict):
+        if isinstance(instance, dict):
+            node, declared, patterns = additional
+            for _property, subtree in tree.items():
+                if _property in instance and _property not in declared \
+                        and (patterns is None
+                             or not patterns.match(_property)):
+                    self._fill_key_along(instance, _property, node, subtree)
+        return None
+
+    def _allof_along(self, instance, nodes: tuple, tree: dict):
+        for node in nodes:
+            self._fill_along(instance, node, tree)
+        return None
+
+    def _anyof_along(self, instance, branches: _Branches, tree: dict):
+        for node in branches.candidates(instance):
+            if self.is_valid(instance, node):
+                self._fill_along(instance, node, tree)
+        return None
+
+    def _oneof_along(self, instance, branches: _Branches, tree: dict):
+        for node in branches.candidates(instance):
+            if self.is_valid(instance, node):
+                self._fill_along(instance, node, tree)
+                return None
+        return None
+
+    def _ifthenelse_along(self, instance, nodes: tuple, tree: dict):
+        if_node, then_node, else_node = nodes
+        branch = then_node if self.is_valid(instance, if_node) else else_node
+        if branch is not None:
+            self._fill_along(instance, branch, tree)
+        return None
+
+    def _dependentschemas_along(self, instance, dependents: tuple, tree: dict):
+        if isinstance(instance, dict):
+            for _property, node in dependents:
+                if _property in instance:
+                    self._fill_along(instance, node, tree)
+        return None
+
+    def _ref_along(self, instance, node: _Node, tree: dict):
+        self._fill_along(instance, node, tree)
+
+    _ALONG = {  # Fill along a path tree of each built-in keyword, by keyword
+        "properties": _properties_along,
+        "patternProperties": _patternproperties_along,
+        "additionalProperties": _additionalproperties_along,
+        "allOf": _allof_along,
+        "anyOf": _anyof_along,
+        "if": _ifthenelse_along,
+        "oneOf": _oneof_along,
+        "dependentSchemas": _dependentschemas_along,
+        "$ref": _ref_along,
+    }
+
+
+# Handlers of the keywords a `Filler` fills by default
+KEYWORDS = MappingProxyType({
+    "properties": Keyword(_FillPass._fill_properties, _compile_properties),
+    "patternProperties": Keyword(
+        _FillPass._fill_patternproperties, _compile_patternproperties),
+    "additionalProperties": Keyword(
+        _FillPass._fill_additionalproperties, _compile_additionalproperties),
+    "allOf": Keyword(_FillPass._fill_allof, _compile_allof),
+    "anyOf": Keyword(_FillPass._fill_anyof, _compile_branches("anyOf")),
+    "if": Keyword(_FillPass._fill_ifthenelse, _compile_ifthenelse),
+    "oneOf": Keyword(_FillPass._fill_oneof, _compile_branches("oneOf")),
+    "dependentSchemas": Keyword(
+        _FillPass._fill_dependentschemas, _compile_dependentschemas),
+    "default": Keyword(_FillPass._fill_default, _compile_default),
+    "$ref": Keyword(_FillPass._fill_ref),  # Compiled by resolving it
+})
+
+
+class _IterativeFillPass(_FillPass):
+    """Fill of one instance on an explicit work stack instead of recursion
+
+    Every step that `_FillPass` runs by recursing into a nested instance or
+    subschema is pushed as a task instead. Tasks are pushed in reverse, so
+    they pop in the order `_FillPass` runs them, and they check their
+    conditions when they pop, so the filled instance and the order of
+    keywords are the same. Missing parents created inside other ones are
+    filled on the same stack. The depth of instances and schemas is only
+    limited by memory.
+
+    A task is a (function, args) pair, called as `function(pass, stack,
+    *args)`.
+    """
+
+    def fill(self, instance, node: _Node):
+        """Fill an instance with the defaults of a node, to completion"""
+        stack = [(_IterativeFillPass._push_node, (instance, node))]
+        pop = stack.pop
+        while stack:
+            function, args = pop()
+            function(self, stack, *args)
+        return None
+
+    def _push_node(self, stack: list, instance, node: _Node):
+        """Push the keywords of a node in order, then its array items"""
+        if isinstance(instance, list) \
+                and (node.prefixitems or node.items is not None):
+            stack.append((_IterativeFillPass._push_prefixitems_and_items,
+                          (instance, node)))
+        tasks = self.filler._tasks
+        for keyword, fill, arg in reversed(node.ops):
+            task = tasks.get(fill)
+            if task is None:  # Custom keyword, filled by recursing
+                stack.append((_IterativeFillPass._call, (fill, instance, arg)))
+            else:
+                stack.append((task, (instance, arg)))
+        return None
+
+    def _call(self, stack: list, fill, instance, arg):
+        fill(self, instance, arg)
+
+    def _push_child(
+            self, stack: list, instance: Union[dict, list],
+            key: Union[str, int], node: _Node):
+        """Push the fill of a child of an instance, see `_fill_child`"""
+        child = instance[key]
+        if not isinstance(child, (dict, list)):
+            stack.append((_IterativeFillPass._push_node, (child, node)))
+            return None
+        writes = self._writes
+        copied = self._enter_child(instance, key)
+        stack.append((_IterativeFillPass._leave,
+                      (instance, key, child, copied, writes)))
+        stack.append((_IterativeFillPass._push_node, (copied, node)))
+        return None
+
+    def _leave(self, stack: list, *args):
+        self._leave_child(*args)
+
+    def _push_properties(
+            self, stack: list, instance, properties: tuple, start: int = 0):
+        """Fill the properties from `start` until one needs a nested fill,
+        then push it and the remaining properties
+
+        Properties without nested fills are filled right away, so that flat
+        properties do not cost a task each.
+        """
+        if not isinstance(instance, dict):
+            return None
+        for i in range(start, len(properties)):
+            _property, node = properties[i]
+            if node.recurses:
+                if _property in instance:
+                    stack.append((_IterativeFillPass._push_properties,
+                                  (instance, properties, i + 1)))
+                    if node.has_items:
+                        stack.append((_IterativeFillPass._push_property_items,
+                                      (instance, _property, node)))
+                    if node.has_default:
+                        stack.append((_IterativeFillPass._property_default,
+                                      (instance, _property, node)))
+                    self._push_child(stack, instance, _property, node)
+                    return None
+                if self._creating:  # Create nested parents on the stack
+                    if self.config.create_missing_parents \
+                            and node not in self._creating:
+                        stack.append((_IterativeFillPass._push_properties,
+                                      (instance, properties, i + 1)))
+                        if node.has_items:
+                            stack.append((
+                                _IterativeFillPass._push_property_items,
+                                (instance, _property, node)))
+                        if node.has_default:
+                            stack.append((
+                                _IterativeFillPass._property_default,
+                                (instance, _property, node)))
+                        self._push_new_parent(
+                            stack, instance, _property, node)
+                        return None
+                else:
+                    self._create_parent(instance, _property, node)
+            if node.has_default:
+                self._fill_property_default(instance, _property, node)
+            if node.has_items and _property in instance:
+                stack.append((_IterativeFillPass._push_properties,
+                              (instance, properties, i + 1)))
+                self._push_child(stack, instance, _property, node)
+                return None
+        return None
+
+    def _push_new_parent(
+            self, stack: list, instance: dict, _property: str, node: _Node):
+        """Push the fill of a missing parent created inside another one, see
+        `_fill_new_parent`"""
+        parent = {}
+        self._owned.add(id(parent))
+        self._creating.add(node)
+        stack.append((_IterativeFillPass._add_new_parent,
+                      (instance, _property, parent, node)))
+        stack.append((_IterativeFillPass._push_node, (parent, node)))
+        return None
+
+    def _add_new_parent(
+            self, stack: list, instance: dict, _property: str, parent: dict,
+            node: _Node):
+        """Add a filled missing parent to its instance, if filled"""
+        self._creating.discard(node)
+        if not parent:
+            self._owned.discard(id(parent))
+            if self._stats is not None:
+                self._stats.parents_deleted += 1
+            return None
+        instance[_property] = parent
+        self._wrote(parent, (_property,))
+        return None
+
+    def _push_patternproperties(
+            self, stack: list, instance, patterns: _Patterns):
+        if isinstance(instance, dict):
+            self._push_properties(stack, instance, tuple(
+                (_property, node) for _property in list(instance)
+                for node in patterns.match(_property)))
+        return None
+
+    def _push_additionalproperties(
+            self, stack: list, instance, additional: tuple):
+        if isinstance(instance, dict):
+            node, declared, patterns = additional
+            self._push_properties(stack, instance, tuple(
+                (_property, node) for _property in list(instance)
+                if _property not in declared
+                and (patterns is None or not patterns.match(_property))))
+        return None
+
+    def _property_default(
+            self, stack: list, instance: dict, _property: str, node: _Node):
+        self._fill_property_default(instance, _property, node)
+
+    def _push_property_items(
+            self, stack: list, instance: dict, _property: str, node: _Node):
+        if _property in instance:
+            self._push_child(stack, instance, _property, node)
+        return None
+
+    def _push_prefixitems_and_items(
+            self, stack: list, instance: list, node: _Node):
+        """Push the fills of `_fill_prefixitems_and_items` in reverse"""
+        n_instance = len(instance)
+        n_prefixitems = len(node.prefixitems)
+        if n_instance > n_prefixitems:
+            n_existing_prefixitems = n_prefixitems
+        else:
+            n_existing_prefixitems = n_instance
+            self._append_prefixitems(instance, node)
+        for i in reversed(range(n_existing_prefixitems)):
+            stack.append((_IterativeFillPass._push_prefixitem,
+                          (instance, i, node.prefixitems[i])))
+        if n_instance > n_prefixitems and node.items is not None:
+            for i in reversed(range(n_prefixitems, n_instance)):
+                stack.append((_IterativeFillPass._push_child,
+                              (instance, i, node.items)))
+        return None
+
+    def _push_prefixitem(
+            self, stack: list, instance: list, i: int, node: _Node):
+        if isinstance(instance[i], (dict, list)):
+            self._push_child(stack, instance, i, node)
+        return None
+
+    def _push_allof(self, stack: list, instance, nodes: tuple):
+        for node in reversed(nodes):
+            stack.append((_IterativeFillPass._push_node, (instance, node)))
+        return None
+
+    def _push_anyof(self, stack: list, instance, branches: _Branches):
+        stack.append((_IterativeFillPass._push_next_anyof,
+                      (instance, branches.candidates(instance), 0)))
+        return None
+
+    def _push_next_anyof(
+            self, stack: list, instance, candidates: tuple, start: int):
+        """Push the next "anyOf" node from `start` the instance is valid to,
+        after filling with the previous ones"""
+        for i in range(start, len(candidates)):
+            if self.is_valid(instance, candidates[i]):
+                stack.append((_IterativeFillPass._push_next_anyof,
+                              (instance, candidates, i + 1)))
+                stack.append((_IterativeFillPass._push_node,
+                              (instance, candidates[i])))
+                return None
+        return None
+
+    def _push_oneof(self, stack: list, instance, branches: _Branches):
+        for node in branches.candidates(instance):
+            if self.is_valid(instance, node):
+                stack.append((_IterativeFillPass._push_node, (instance, node)))
+                return None
+        return None
+
+    def _push_ifthenelse(self, stack: list, instance, nodes: tuple):
+        if_node, then_node, else_node = nodes
+        branch = then_node if self.is_valid(instance, if_node) else else_node
+        if branch is not None:
+            stack.append((_IterativeFillPass._push_node, (instance, branch)))
+        return None
+
+    def _push_dependentschemas(self, stack: list, instance, dependents: tuple):
+        if isinstance(instance, dict):
+            stack.append((_IterativeFillPass._push_next_dependent,
+                          (instance, dependents, 0)))
+        return None
+
+    def _push_next_dependent(
+            self, stack: list, instance: dict, dependents: tuple, start: int):
+        """Push the next "dependentSchemas" node from `start` whose property
+        is present, after filling with the previous ones"""
+        for i in range(start, len(dependents)):
+            _property, node = dependents[i]
+            if _property in instance:
+                stack.append((_IterativeFillPass._push_next_dependent,
+                              (instance, dependents, i + 1)))
+                stack.append((_IterativeFillPass._push_node, (instance, node)))
+                return None
+        return None
+
+    def _push_ref(self, stack: list, instance, node: _Node):
+        stack.append((_IterativeFillPass._push_node, (instance, node)))
+
+    def _default(self, stack: list, instance, default_items: tuple):
+        self._fill_default(instance, default_items)
+
+    _TASKS = {  # Task of each built-in keyword handler
+        _FillPass._fill_properties: _push_properties,
+        _FillPass._fill_patternproperties: _push_patternproperties,
+        _FillPass._fill_additionalproperties: _push_additionalproperties,
+        _FillPass._fill_allof: _push_allof,
+        _FillPass._fill_anyof: _push_anyof,
+        _FillPass._fill_ifthenelse: _push_ifthenelse,
+        _FillPass._fill_oneof: _push_oneof,
+        _FillPass._fill_dependentschemas: _push_dependentschemas,
+        _FillPass._fill_default: _default,
+        _FillPass._fill_ref: _push_ref,
+    }
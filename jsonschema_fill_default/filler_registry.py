@@ -0,0 +1,223 @@
+import sys
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable, Union
+from urllib.parse import urldefrag
+
+from .config import FillConfig
+from .filler import Filler
+from .plan_cache import PlanCache
+
+
+def _schema_id(schema_id: str) -> str:
+    """Return an "$id" without its (empty) fragment, as resolved by "$ref"
+    """
+    return urldefrag(schema_id)[0]
+
+
+def _size_of(filler: Filler) -> int:
+    """Estimate the bytes a filler takes
+
+    Sums the sizes of the containers and objects of this library reachable
+    from the filler, counting shared objects once. Other objects (e.g.,
+    validators and functions) are counted without their contents, as they
+    are largely shared between fillers.
+    """
+    seen = set()
+    size = 0
+    stack = [filler]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif type(obj).__module__.startswith(__package__):
+            stack.extend(getattr(obj, "__dict__", {}).values())
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return size
+
+
+class FillerRegistry:
+    """Registry of schemas by "$id", prepared as fillers on first use
+
+    Registering a schema does not compile it. `filler` compiles a schema
+    the first time it is used and keeps its `Filler`, so that later fills
+    skip compiling. The least recently used fillers are evicted once more
+    than `max_fillers` are kept, or they take more than `max_bytes`, and
+    compiled again when used again.
+
+    A registry and its fillers can be shared between threads. A schema used
+    by several threads at once is compiled once.
+
+    Args:
+        schemas (Iterable[dict]): JSON schemas adhering to Draft 2020-12, each
+            with an "$id", to register
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+        max_fillers (int | None): Maximum number of fillers kept. If None,
+            unlimited.
+        max_bytes (int | None): Maximum estimated size of the fillers kept in
+            bytes. If None, unlimited.
+        cache (PlanCache | None): On-disk cache to load fillers from instead
+            of compiling
+
+    Attributes:
+        hits (int): Number of uses of a kept filler
+        misses (int): Number of fillers compiled or loaded
+        evictions (int): Number of fillers evicted
+        bytes (int): Estimated size of the fillers kept in bytes
+    """
+
+    def __init__(
+            self, schemas: Iterable[dict] = (),
+            config: Union[FillConfig, None] = None,
+            max_fillers: Union[int, None] = None,
+            max_bytes: Union[int, None] = None,
+            cache: Union[PlanCache, None] = None):
+        self.config = FillConfig() if config is None else config
+        self.max_fillers = max_fillers
+        self.max_bytes = max_bytes
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._lock = Lock()
+        self._schemas = {}
+        self._fillers = OrderedDict()  # "$id": (filler, size), oldest first
+        self._preparing = {}  # "$id": lock held while compiling
+        for schema in schemas:
+            self.register(schema)
+
+    def __contains__(self, schema_id: str) -> bool:
+        return _schema_id(schema_id) in self._schemas
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def register(self, schema: dict):
+        """Register a schema by its "$id", replacing a schema with the same
+        "$id" and its filler
+
+        Args:
+            schema (dict): JSON schema adhering to Draft 2020-12 with an "$id"
+
+        Raises:
+            ValueError: If the schema has no "$id"
+        """
+        schema_id = schema.get("$id") if isinstance(schema, dict) else None
+        if not isinstance(schema_id, str):
+            raise ValueError('Registered schemas must have an "$id"')
+        schema_id = _schema_id(schema_id)
+        with self._lock:
+            self._schemas[schema_id] = schema
+            self._discard(schema_id)
+
+    def unregister(self, schema_id: str):
+        """Remove a schema and its filler
+
+        Args:
+            schema_id (str): "$id" of the schema
+
+        Raises:
+            KeyError: If no schema has the "$id"
+        """
+        schema_id = _schema_id(schema_id)
+        with self._lock:
+            del self._schemas[schema_id]
+            self._discard(schema_id)
+
+    def filler(self, schema_id: str) -> Filler:
+        """Return the filler of a schema, compiling it on first use
+
+        Args:
+            schema_id (str): "$id" of the schema
+
+        Returns:
+            filler (Filler): Compiled filler of the schema
+
+        Raises:
+            KeyError: If no schema has the "$id"
+        """
+        schema_id = _schema_id(schema_id)
+        with self._lock:
+            filler = self._kept(schema_id)
+            if filler is not None:
+                return filler
+            schema = self._schemas[schema_id]
+            preparing = self._preparing.setdefault(schema_id, Lock())
+        with preparing:  # Other threads wait for this one to compile
+            with self._lock:
+                filler = self._kept(schema_id)
+                if filler is not None:
+                    return filler
+                self.misses += 1
+            if self.cache is None:
+                filler = Filler(schema, self.config)
+            else:
+                filler = self.cache.filler(schema, self.config)
+            size = 0 if self.max_bytes is None else _size_of(filler)
+            with self._lock:
+                if self._schemas.get(schema_id) is schema:  # Not replaced
+                    self._fillers[schema_id] = (filler, size)
+                    self.bytes += size
+                    self._evict()
+                if self._preparing.get(schema_id) is preparing:
+                    del self._preparing[schema_id]
+        return filler
+
+    def fill(self, schema_id: str, instance: dict) -> dict:
+        """Fill a JSON instance with the defaults of a registered schema
+
+        Args:
+            schema_id (str): "$id" of the schema
+            instance (dict): JSON instance valid against the schema
+
+        Returns:
+            instance (dict): Instance filled with schema defaults
+        """
+        return self.filler(schema_id).fill(instance)
+
+    def clear(self):
+        """Evict all fillers, keeping the registered schemas"""
+        with self._lock:
+            self.evictions += len(self._fillers)
+            self._fillers.clear()
+            self.bytes = 0
+
+    def _kept(self, schema_id: str) -> Union[Filler, None]:
+        """Return a kept filler as used most recently, or None if not kept.
+        Must hold the lock."""
+        entry = self._fillers.get(schema_id)
+        if entry is None:
+            return None
+        self._fillers.move_to_end(schema_id)
+        self.hits += 1
+        return entry[0]
+
+    def _discard(self, schema_id: str):
+        """Drop the filler of a schema, if kept. Must hold the lock."""
+        entry = self._fillers.pop(schema_id, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _evict(self):
+        """Evict the least recently used fillers until within the budgets.
+        Must hold the lock."""
+        while self._fillers and (
+                (self.max_fillers is not None
+                 and len(self._fillers) > self.max_fillers)
+                or (self.max_bytes is not None
+                    and self.bytes > self.max_bytes)):
+            _, (_, size) = self._fillers.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
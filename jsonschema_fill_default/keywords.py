@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Callable, Union
+
+
+@dataclass(frozen=True)
+class Keyword:
+    """Handler of a schema keyword for filling
+
+    A `Filler` compiles each keyword of a (sub)schema that has a handler into
+    an argument once, and calls the handler's `fill` with that argument for
+    every instance the subschema applies to, in schema keyword order.
+
+    Like the built-in keywords other than "default" and "$ref", a keyword
+    with a handler in a property subschema makes filling visit the property,
+    and create it if missing and it gets defaults (see
+    `FillConfig.create_missing_parents`).
+
+    Args:
+        fill (callable): `fill(fill_pass, instance, arg)` fills an instance
+            with the compiled argument of the keyword. `fill_pass.fill(
+            instance, node)` fills an instance with a compiled subschema, and
+            `fill_pass.is_valid(instance, node)` validates an instance
+            against it. After adding a value at a key of the instance, call
+            `fill_pass.added(value, key)`, so that non-mutating fills keep
+            the change and `fill_patch` records it.
+        compile (callable | None): `compile(filler, value, schema,
+            compile_subschema)` returns the argument of the keyword from its
+            value in a schema, or None to skip the keyword.
+            `compile_subschema(subschema, *segments)` compiles a subschema at
+            the JSON pointer segments below the schema (e.g. `"properties",
+            "name"`) into a node. If None, the argument is the value.
+    """
+    fill: Callable
+    compile: Union[Callable, None] = None
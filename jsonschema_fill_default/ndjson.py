@@ -0,0 +1,187 @@
+import io
+import json
+import pickle
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import BinaryIO, Callable, Iterable, Union
+
+from . import parallel
+from .config import FillConfig
+from .filler import Filler
+from .plan_cache import PlanCache
+
+
+@dataclass
+class NdjsonError:
+    """Error of a single NDJSON line
+
+    Args:
+        line_number (int): 1-based number of the line in the input
+        error (Exception): Error raised while decoding or filling the line
+    """
+    line_number: int
+    error: Exception
+
+
+@dataclass
+class NdjsonReport:
+    """Counts and throughput of an NDJSON fill
+
+    Args:
+        lines (int): Number of non-blank lines read
+        filled (int): Number of lines filled and written
+        failed (int): Number of lines that could not be filled, which are
+            written unchanged
+        bytes_read (int): Number of bytes read
+        bytes_written (int): Number of bytes written
+        seconds (float): Elapsed wall-clock time
+        errors (list): First `max_errors` errors, as `NdjsonError`
+    """
+    lines: int = 0
+    filled: int = 0
+    failed: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_read / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def fill_ndjson(
+        source: Union[BinaryIO, Iterable[bytes]],
+        sink: BinaryIO,
+        schema: dict,
+        config: Union[FillConfig, None] = None,
+        on_error: Union[Callable[[NdjsonError], None], None] = None,
+        progress: Union[Callable[[NdjsonReport], None], None] = None,
+        chunksize: int = 1024,
+        max_errors: int = 100,
+        workers: int = 1,
+        cache: Union[PlanCache, None] = None
+        ) -> NdjsonReport:
+    """Fill a stream of NDJSON (JSON Lines) instances with schema defaults
+
+    Reads one JSON instance per line, fills it, and writes it as one compact
+    JSON line. Lines are read and written in chunks, so memory stays
+    constant regardless of the stream length.
+
+    A line that cannot be decoded or filled does not abort the stream: it is
+    written unchanged and reported as an `NdjsonError`. Blank lines are
+    skipped.
+
+    With more than one worker, chunks are decoded, filled, and encoded in
+    worker processes (see `fill_default_parallel`) and written in order.
+
+    Args:
+        source (binary file, iterable): Binary file or iterable of lines as
+            bytes
+        sink (binary file): Binary file to write the filled lines to
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+        on_error (callable | None): Called with each `NdjsonError`
+        progress (callable | None): Called with the report after each chunk
+        chunksize (int): Number of lines read before they are written
+        max_errors (int): Maximum number of errors kept in the report
+        workers (int): Number of processes filling chunks
+        cache (PlanCache | None): On-disk cache to load the compiled schema
+            from, also in worker processes, instead of compiling it
+
+    Returns:
+        report (NdjsonReport): Counts and throughput of the fill
+    """
+    if isinstance(source, io.RawIOBase):
+        source = io.BufferedReader(source, buffer_size=1 << 20)
+    report = NdjsonReport()
+    start = time.perf_counter()
+    tasks = _chunk_lines(iter(source), chunksize)
+    if workers > 1:
+        results = parallel._map_in_workers(
+            _fill_lines_in_worker, tasks, schema,
+            FillConfig() if config is None else config, workers, True,
+            cache)
+    else:
+        if cache is not None:
+            filler = cache.filler(schema, config)
+        else:
+            filler = Filler(schema, config)
+        results = (_fill_lines(chunk, line_number, filler)
+                   for chunk, line_number in tasks)
+    for bytes_read, output, n_filled, errors in results:
+        sink.write(output)
+        report.bytes_read += bytes_read
+        report.bytes_written += len(output)
+        report.filled += n_filled
+        report.failed += len(errors)
+        report.lines += n_filled + len(errors)
+        for error in errors:
+            if len(report.errors) < max_errors:
+                report.errors.append(error)
+            if on_error is not None:
+                on_error(error)
+        report.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(report)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _chunk_lines(lines: Iterable[bytes], chunksize: int) -> Iterable[tuple]:
+    """Yield chunks of lines with the number of lines before each chunk"""
+    line_number = 0
+    for chunk in iter(lambda: list(islice(lines, chunksize)), []):
+        yield chunk, line_number
+        line_number += len(chunk)
+
+
+def _fill_lines_in_worker(task: tuple) -> tuple:
+    """Fill a chunk of NDJSON lines with the filler of a worker process"""
+    result = _fill_lines(*task, parallel._worker_filler)
+    for error in result[3]:  # Not all errors can be sent back, e.g. JSON's
+        try:
+            pickle.loads(pickle.dumps(error.error))
+        except Exception:
+            error.error = ValueError(
+                f"{type(error.error).__name__}: {error.error}")
+    return result
+
+
+def _fill_lines(lines: list, line_number: int, filler: Filler) -> tuple:
+    """Fill a chunk of NDJSON lines
+
+    Args:
+        lines (list): Lines as bytes
+        line_number (int): Number of lines before the chunk in the input
+        filler (Filler): Compiled filler
+
+    Returns:
+        bytes_read (int): Number of bytes of the lines
+        output (bytes): Filled lines, and unchanged lines of errors
+        n_filled (int): Number of filled lines
+        errors (list): `NdjsonError` of each line that could not be filled
+    """
+    output = []
+    errors = []
+    n_filled = 0
+    for line_number, line in enumerate(lines, line_number + 1):
+        if not line.strip():
+            continue
+        try:
+            instance = filler.fill(json.loads(line))
+            output.append(json.dumps(
+                instance, ensure_ascii=False, separators=(",", ":")
+                ).encode())
+            output.append(b"\n")
+            n_filled += 1
+        except Exception as error:
+            errors.append(NdjsonError(line_number, error))
+            output.append(line if line.endswith(b"\n") else line + b"\n")
+    return sum(len(line) for line in lines), b"".join(output), n_filled, errors
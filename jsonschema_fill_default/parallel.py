@@ -0,0 +1,137 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Union
+
+from .config import FillConfig
+from .filler import Filler
+from .plan_cache import PlanCache
+
+
+_worker_filler = None  # Filler of a worker process, set by `_init_worker`
+
+
+def _init_worker(
+        schema: dict, config: FillConfig, cache: Union[PlanCache, None]):
+    """Compile the schema once per worker process, or load it from a cache
+    """
+    global _worker_filler
+    if cache is None:
+        _worker_filler = Filler(schema, config)
+    else:
+        _worker_filler = cache.filler(schema, config)
+
+
+def _fill_chunk(chunk: list) -> list:
+    """Fill a chunk of instances in a worker process"""
+    return [_worker_filler.fill(instance) for instance in chunk]
+
+
+def fill_default_parallel(
+        instances: Iterable[Union[dict, list]],
+        schema: dict,
+        config: Union[FillConfig, None] = None,
+        workers: Union[int, None] = None,
+        chunksize: int = 256,
+        ordered: bool = True
+        ) -> Union[list, Iterator[Union[dict, list]]]:
+    """Fill many JSON instances with schema defaults in worker processes
+
+    The schema and config are sent to each worker once, where the schema is
+    compiled once. Instances are sent to the workers in chunks, with at most
+    two chunks per worker in flight, so iterators are consumed lazily.
+
+    Does not mutate the instance inputs, as they are filled in other
+    processes. The filled instances are returned instead.
+
+    Args:
+        instances (iterable): JSON instances valid against the given schema.
+            If an iterator (e.g., a generator), instances are filled lazily.
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+        workers (int | None): Number of worker processes. If None, uses the
+            number of processors.
+        chunksize (int): Number of instances sent to a worker at a time
+        ordered (bool): If True, return filled instances in input order. If
+            False, return them chunk by chunk as soon as a chunk is filled.
+
+    Returns:
+        instances (list, iterator): Filled instances, as a generator if
+            `instances` is an iterator, else as a list.
+    """
+    if config is None:
+        config = FillConfig()
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, not {chunksize}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    filled = _fill_parallel(
+        iter(instances), schema, config, workers, chunksize, ordered)
+    if iter(instances) is instances:
+        return filled
+    return list(filled)
+
+
+def _fill_parallel(
+        instances: Iterator, schema: dict, config: FillConfig,
+        workers: int, chunksize: int, ordered: bool
+        ) -> Iterator:
+    """Yield instances filled by a process pool, chunk by chunk"""
+    chunks = iter(lambda: list(islice(instances, chunksize)), [])
+    for chunk in _map_in_workers(
+            _fill_chunk, chunks, schema, config, workers, ordered):
+        yield from chunk
+
+
+def _map_in_workers(
+        function: Callable, tasks: Iterator, schema: dict,
+        config: FillConfig, workers: int, ordered: bool,
+        cache: Union[PlanCache, None] = None) -> Iterator:
+    """Yield the results of a function applied to tasks in worker processes
+
+    Each worker compiles the schema once into the filler the function may
+    use through `_worker_filler`, or loads it from a cache, which is stored
+    before the workers start. At most two tasks per worker are in flight.
+
+    Args:
+        function (callable): Module-level function of a single task
+        tasks (iterator): Picklable tasks
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig): Configuration for filling
+        workers (int): Number of worker processes
+        ordered (bool): If True, yield results in task order, else as soon
+            as they are done
+        cache (PlanCache | None): On-disk cache to load the filler from
+
+    Returns:
+        results (iterator): Results of the function
+    """
+    if cache is not None:  # Compiled here once, and loaded by the workers
+        cache.filler(schema, config)
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(schema, config, cache)) as executor:
+        max_in_flight = 2 * workers
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, task))
+            while len(pending) >= max_in_flight:
+                yield _pop_result(pending, ordered)
+        while pending:
+            yield _pop_result(pending, ordered)
+
+
+def _pop_result(pending: deque, ordered: bool):
+    """Remove and return the result of the next finished future
+
+    If ordered, waits for the oldest future, else for any future.
+    """
+    if ordered:
+        return pending.popleft().result()
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    future = next(iter(done))
+    pending.remove(future)
+    return future.result()
@@ -0,0 +1,59 @@
+from typing import Iterable, Union
+
+
+def split_pointer(pointer: str) -> tuple:
+    """Return the unescaped reference tokens of a JSON pointer (RFC 6901)
+
+    Raises:
+        ValueError: If the pointer is neither empty nor starts with "/"
+    """
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise ValueError(
+            f"JSON pointer must be empty or start with '/', not {pointer!r}")
+    return tuple(
+        token.replace("~1", "/").replace("~0", "~")
+        for token in pointer[1:].split("/"))
+
+
+def path_tree(pointers: Union[str, Iterable[str]]) -> Union[dict, None]:
+    """Return the tree of the reference tokens of JSON pointers
+
+    Each key of a tree is a token, and its value is the tree of the tokens
+    below it, or None if the whole subtree at the token is targeted. A
+    pointer below another one is covered by it.
+
+    Args:
+        pointers (str, iterable): JSON pointer, or JSON pointers, of the
+            targeted subtrees
+
+    Returns:
+        tree (dict | None): Tree of the tokens, or None if a pointer targets
+            the whole document ("")
+    """
+    if isinstance(pointers, str):
+        pointers = (pointers,)
+    tree = {}
+    for pointer in pointers:
+        tokens = split_pointer(pointer)
+        if not tokens:
+            return None
+        branch = tree
+        for token in tokens[:-1]:
+            branch = branch.setdefault(token, {})
+            if branch is None:  # Covered by a shorter pointer
+                break
+        else:
+            branch[tokens[-1]] = None
+    return tree
+
+
+def array_index(token: str, length: int) -> Union[int, None]:
+    """Return the index of an existing array item a token refers to, or None
+    """
+    if not (token.isascii() and token.isdigit()) \
+            or (token != "0" and token.startswith("0")):
+        return None
+    index = int(token)
+    return index if index < length else None
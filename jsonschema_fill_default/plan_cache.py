@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from dataclasses import fields
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Union
+
+from .config import FillConfig
+from .filler import Filler
+
+
+# Version of the format of cache entries
+_FORMAT = 2
+
+
+@lru_cache(maxsize=None)
+def _library_version() -> str:
+    """Return the version of the library and a digest of its source, so that
+    plans of other versions or of edited source checkouts never match"""
+    try:
+        version = metadata.version("jsonschema-fill-default")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.read_bytes())
+    return f"{version}+{digest.hexdigest()[:16]}"
+
+
+def _qualified_name(function) -> Union[str, None]:
+    if function is None:
+        return None
+    return f"{function.__module__}.{function.__qualname__}"
+
+
+def _config_key(config: FillConfig) -> dict:
+    """Return the fields of a configuration as JSON, with the names of the
+    functions of custom keywords and without the stats"""
+    key = {}
+    for field in fields(config):
+        value = getattr(config, field.name)
+        if field.name == "stats":  # Only whether to compile for stats
+            value = value is not None
+        elif field.name == "schema_dir" and value is not None:
+            value = str(Path(value).resolve())
+        elif field.name == "keywords" and value is not None:
+            value = {
+                name: [_qualified_name(keyword.fill),
+                       _qualified_name(keyword.compile)]
+                for name, keyword in value.items()}
+        key[field.name] = value
+    return key
+
+
+def plan_key(schema: dict, config: Union[FillConfig, None] = None
+             ) -> Union[str, None]:
+    """Return the key of the compiled plan of a schema and configuration
+
+    The key is a SHA-256 hash of the schema as JSON, the configuration, and
+    the version of the library. The keys of the schema are hashed in order,
+    as defaults are filled in schema order.
+
+    Args:
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+
+    Returns:
+        key (str | None): Hexadecimal hash, or None if the schema is not
+            serializable as JSON (e.g., cyclic)
+    """
+    config = FillConfig() if config is None else config
+    try:
+        schema_json = json.dumps(
+            schema, ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    digest = hashlib.sha256()
+    for part in (
+            str(_FORMAT), _library_version(),
+            json.dumps(_config_key(config), sort_keys=True), schema_json):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _stat(path: str) -> Union[tuple, None]:
+    """Return the modification time and size of a file, or None if missing
+    """
+    try:
+        result = os.stat(path)
+    except OSError:
+        return None
+    return (result.st_mtime_ns, result.st_size)
+
+
+def _touch(path: Path):
+    """Set the modification time of an entry to now, from the same clock for
+    written and loaded entries, as file systems may write coarser times"""
+    now = time.time_ns()
+    try:
+        os.utime(path, ns=(now, now))
+    except OSError:
+        pass
+
+
+class PlanCache:
+    """On-disk cache of compiled fillers for fast process startup
+
+    `filler` returns the `Filler` of a schema from a cache entry if there is
+    one, skipping all compiling of the schema, else compiles it and stores
+    the entry. Entries are pickled plans keyed by `plan_key`, so a schema
+    compiled with another configuration or library version is compiled
+    again. An entry is stale, and deleted, if a schema file it loaded from
+    `FillConfig.schema_dir` changed. The least recently used entries are
+    evicted once the entries take more than `max_bytes`.
+
+    Entries are unpickled, so the directory must only be writable by trusted
+    users.
+
+    Args:
+        directory (str, Path): Cache directory, created if missing
+        max_bytes (int): Maximum total size of the entries in bytes
+
+    Attributes:
+        hits (int): Number of fillers loaded from entries
+        misses (int): Number of fillers compiled
+    """
+
+    def __init__(
+            self, directory: Union[str, Path], max_bytes: int = 256 * 2**20):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def filler(
+            self, schema: dict, config: Union[FillConfig, None] = None
+            ) -> Filler:
+        """Return the filler of a schema, loaded from the cache if possible
+
+        A loaded filler fills like one compiled from the schema, but its
+        `schema` is a copy of the schema, unpickled with the plan.
+
+        Args:
+            schema (dict): JSON schema adhering to Draft 2020-12
+            config (FillConfig | None): Configuration for filling. If None,
+                uses default `FillConfig`.
+
+        Returns:
+            filler (Filler): Compiled filler
+        """
+        config = FillConfig() if config is None else config
+        key = plan_key(schema, config)
+        if key is None:
+            self.misses += 1
+            return Filler(schema, config)
+        path = self.directory / f"{key}.pickle"
+        state = self._load(path, key)
+        if state is not None:
+            self.hits += 1
+            return Filler._from_state(state, config)
+        self.misses += 1
+        filler = Filler(schema, config)
+        self._store(path, key, filler)
+        return filler
+
+    def clear(self):
+        """Delete all entries"""
+        for path in self.directory.glob("*.pickle"):
+            path.unlink(missing_ok=True)
+
+    def _load(self, path: Path, key: str) -> Union[dict, None]:
+        """Return the plan of an entry, or None if missing or stale
+
+        Stale and unreadable entries are deleted. A loaded entry is touched,
+        as it was used most recently.
+        """
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+            if entry["key"] != key or any(
+                    _stat(file_path) != stat
+                    for file_path, stat in entry["files"]):
+                raise ValueError("stale entry")
+        except FileNotFoundError:
+            return None
+        except Exception:  # Stale, or written by another version
+            path.unlink(missing_ok=True)
+            return None
+        _touch(path)
+        return entry["state"]
+
+    def _store(self, path: Path, key: str, filler: Filler):
+        """Write the entry of a filler, unless it cannot be pickled (e.g.,
+        a custom keyword is a lambda) or written, and evict entries beyond
+        the size cap"""
+        entry = {
+            "key": key,
+            "files": tuple(
+                (file_path, _stat(file_path))
+                for file_path in dict.fromkeys(filler._schema_files)),
+            "state": filler.__getstate__(),
+        }
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                    dir=self.directory, suffix=".tmp", delete=False) as file:
+                file.write(data)
+            os.replace(file.name, path)  # Readers never see partial entries
+        except OSError:  # Filling works without the cache
+            return
+        _touch(path)
+        self._evict()
+
+    def _evict(self):
+        """Delete the least recently used entries until the entries take at
+        most `max_bytes`"""
+        entries = []
+        for path in self.directory.glob("*.pickle"):
+            try:
+                stat = path.stat()
+            except OSError:  # Deleted by another process
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,185 @@
+from collections.abc import Mapping, Sequence
+from numbers import Number
+from typing import Callable, Union
+
+
+# Types of the values of keywords without effect on validation
+_ANNOTATIONS = {
+    "title": str, "description": str, "$comment": str, "default": object,
+    "examples": list, "deprecated": bool, "readOnly": bool,
+    "writeOnly": bool}
+
+
+def json_equal(one, two) -> bool:
+    """True if two JSON values are equal like in JSON Schema
+
+    Booleans differ from numbers, integers equal floats of the same value,
+    and arrays and objects are compared item by item.
+    """
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) \
+            and all(json_equal(i, j) for i, j in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return len(one) == len(two) and all(
+            key in two and json_equal(value, two[key])
+            for key, value in one.items())
+    if isinstance(one, bool) or isinstance(two, bool):
+        return False  # Not the same boolean, nor a boolean and a number
+    return one == two
+
+
+def _scalar_key(value):
+    """Return a hashable key of a JSON scalar that is equal for values that
+    are `json_equal`, or None if not a scalar"""
+    if isinstance(value, bool):
+        return ("boolean", value)
+    if isinstance(value, Number):
+        return ("number", value)
+    if isinstance(value, str):
+        return ("string", value)
+    if value is None:
+        return ("null", None)
+    return None
+
+
+def _is_integer(instance) -> bool:
+    if isinstance(instance, bool):
+        return False
+    return isinstance(instance, int) \
+        or isinstance(instance, float) and instance.is_integer()
+
+
+# Checks of the instance types of "type"
+_TYPES = {
+    "null": lambda instance: instance is None,
+    "boolean": lambda instance: isinstance(instance, bool),
+    "integer": _is_integer,
+    "number": lambda instance: isinstance(instance, Number)
+    and not isinstance(instance, bool),
+    "string": lambda instance: isinstance(instance, str),
+    "array": lambda instance: isinstance(instance, list),
+    "object": lambda instance: isinstance(instance, dict),
+}
+
+
+def _compile_type(value) -> Union[Callable, None]:
+    names = [value] if isinstance(value, str) else value
+    if not isinstance(names, list) or not names \
+            or not all(name in _TYPES for name in names) \
+            or len(set(names)) < len(names):
+        return None
+    checks = tuple(_TYPES[name] for name in names)
+    if len(checks) == 1:
+        return checks[0]
+    return lambda instance: any(check(instance) for check in checks)
+
+
+def _compile_const(value) -> Callable:
+    key = _scalar_key(value)
+    if key is None:
+        return lambda instance: json_equal(instance, value)
+    return lambda instance: _scalar_key(instance) == key
+
+
+def _compile_enum(value) -> Union[Callable, None]:
+    if not isinstance(value, list):
+        return None
+    keys = [_scalar_key(each) for each in value]
+    if None in keys:
+        return lambda instance: any(
+            json_equal(each, instance) for each in value)
+    keys = frozenset(keys)
+    return lambda instance: _scalar_key(instance) in keys
+
+
+def _compile_required(value) -> Union[Callable, None]:
+    if not isinstance(value, list) \
+            or not all(isinstance(name, str) for name in value) \
+            or len(set(value)) < len(value):
+        return None
+    names = tuple(value)
+    return lambda instance: not isinstance(instance, dict) \
+        or all(name in instance for name in names)
+
+
+def _compile_properties(value) -> Union[Callable, None]:
+    if not isinstance(value, dict):
+        return None
+    checks = []
+    for _property, subschema in value.items():
+        check = compile_predicate(subschema)
+        if check is None:
+            return None
+        checks.append((_property, check))
+    checks = tuple(checks)
+
+    def properties(instance) -> bool:
+        if not isinstance(instance, dict):
+            return True
+        for _property, check in checks:
+            if _property in instance and not check(instance[_property]):
+                return False
+        return True
+    return properties
+
+
+# Compile function of each supported keyword
+_KEYWORDS = {
+    "type": _compile_type,
+    "const": _compile_const,
+    "enum": _compile_enum,
+    "required": _compile_required,
+    "properties": _compile_properties,
+}
+
+
+def compile_predicate(schema: Union[dict, bool]) -> Union[Callable, None]:
+    """Compile a simple schema into a predicate of instances valid against it
+
+    Schemas with only "type", "const", "enum", "required", and "properties"
+    of such schemas (and annotations, e.g. "title") are supported. The
+    predicate is True exactly if `jsonschema` finds the instance valid
+    against the schema (Draft 2020-12).
+
+    Args:
+        schema (dict, bool): JSON (sub)schema
+
+    Returns:
+        predicate (callable | None): Function of an instance that is True if
+            the instance is valid against the schema, or None if the schema
+            is not supported (or not valid to its meta-schema)
+    """
+    if isinstance(schema, bool):
+        return (lambda instance: True) if schema \
+            else (lambda instance: False)
+    if not isinstance(schema, dict):
+        return None
+    checks = []
+    for keyword, value in schema.items():
+        if keyword in _ANNOTATIONS:
+            if not isinstance(value, _ANNOTATIONS[keyword]):
+                return None
+            continue
+        compile_keyword = _KEYWORDS.get(keyword)
+        if compile_keyword is None:
+            return None
+        check = compile_keyword(value)
+        if check is None:
+            return None
+        checks.append(check)
+    if not checks:
+        return lambda instance: True
+    if len(checks) == 1:
+        return checks[0]
+    checks = tuple(checks)
+
+    def all_checks(instance) -> bool:
+        for check in checks:
+            if not check(instance):
+                return False
+        return True
+    return all_checks
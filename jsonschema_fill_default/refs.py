@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+from typing import Union
+from urllib.parse import quote, unquote, urldefrag, urljoin
+
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource
+from referencing.jsonschema import DRAFT202012
+
+
+# Base URI of a root schema without "$id" and without a schema directory
+ROOT_URI = "urn:jsonschema-fill-default:root"
+
+
+class DirectoryRetriever:
+    """Retrieve referenced schema documents from a local directory
+
+    A URI under the directory URI is loaded from the JSON file at the same
+    relative path under the directory. Each document is loaded once. URIs
+    resolving to files outside the directory (e.g., with a percent-encoded
+    "%2E%2E/" or a symlink) are not retrieved.
+
+    Args:
+        directory (str, Path): Directory of schema files
+        directory_uri (str): URI that relative "$ref" resolve under
+        loaded (list | None): List to append the path of every loaded file
+            to
+    """
+
+    def __init__(
+            self, directory: Union[str, Path], directory_uri: str,
+            loaded: Union[list, None] = None):
+        self.directory = Path(directory).resolve()
+        self.directory_uri = directory_uri
+        self.loaded = [] if loaded is None else loaded
+        self._resources = {}
+
+    def __call__(self, uri: str) -> Resource:
+        resource = self._resources.get(uri)
+        if resource is not None:
+            return resource
+        if not uri.startswith(self.directory_uri):
+            raise NoSuchResource(ref=uri)
+        path = (self.directory / unquote(uri[len(self.directory_uri):])
+                ).resolve()
+        if not path.is_relative_to(self.directory):
+            raise NoSuchResource(ref=uri)
+        try:
+            with open(path, "r") as file:
+                document = json.load(file)
+        except OSError as error:
+            raise NoSuchResource(ref=uri) from error
+        resource = Resource.from_contents(
+            document, default_specification=DRAFT202012)
+        self._resources[uri] = resource
+        self.loaded.append(str(path))
+        return resource
+
+
+def registry_for(
+        schema: Union[dict, bool],
+        schema_dir: Union[str, Path, None] = None,
+        loaded: Union[list, None] = None
+        ) -> tuple:
+    """Return a registry of a root schema and the base URI of the schema
+
+    The root schema is registered under its "$id". Without an "$id", it is
+    registered under the URI of `schema_dir` if given, else under a fixed
+    URN, so that local "$ref" (e.g. "#/$defs/name") resolve to it.
+
+    Args:
+        schema (dict, bool): Root JSON schema
+        schema_dir (str, Path, None): Directory to load relatively referenced
+            schema files from. If None, only local and embedded "$ref"
+            resolve.
+        loaded (list | None): List to append the path of every schema file
+            loaded from `schema_dir` to
+
+    Returns:
+        registry (referencing.Registry): Registry with the root schema
+        base_uri (str): URI the root schema is registered under
+    """
+    schema_id = schema.get("$id") if isinstance(schema, dict) else None
+    if schema_dir is not None:
+        directory_uri = Path(schema_dir).resolve().as_uri().rstrip("/") + "/"
+        base_uri = urldefrag(schema_id)[0] if schema_id else directory_uri
+        registry = Registry(retrieve=DirectoryRetriever(
+            schema_dir, urljoin(base_uri, "."), loaded))
+    else:
+        base_uri = urldefrag(schema_id)[0] if schema_id else ROOT_URI
+        registry = Registry()
+    resource = Resource.from_contents(
+        schema, default_specification=DRAFT202012)
+    return registry.with_resource(base_uri, resource), base_uri
+
+
+def join_pointer(location: Union[str, None], *segments) -> Union[str, None]:
+    """Append segments to the JSON pointer fragment of a URI
+
+    Returns None if the location is None, e.g. below an "$anchor".
+    """
+    if location is None:
+        return None
+    return location + "".join(
+        "/" + quote(str(segment).replace("~", "~0").replace("/", "~1"),
+                    safe="")
+        for segment in segments)
+
+
+def target_location(base_uri: str, ref: str) -> Union[str, None]:
+    """Return the URI with a JSON pointer fragment that a "$ref" targets
+
+    Returns None if the "$ref" targets a plain-name fragment (an "$anchor").
+    """
+    if ref.startswith("#"):  # urljoin drops the base of URNs
+        uri, fragment = base_uri, ref[1:]
+    else:
+        uri, fragment = urldefrag(urljoin(base_uri, ref))
+    if fragment and not fragment.startswith("/"):
+        return None
+    return f"{uri}#{fragment}"
+
+
+def contains_ref(schema) -> bool:
+    """True if a schema has a "$ref" or "$dynamicRef" at any depth
+
+    Walks the schema with an explicit stack, so that deeply nested schemas
+    do not hit the recursion limit.
+    """
+    stack = [schema]
+    seen = set()
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if "$ref" in value or "$dynamicRef" in value:
+                return True
+            values = value.values()
+        elif isinstance(value, list):
+            values = value
+        else:
+            continue
+        if id(value) in seen:  # Cyclic, e.g. dereferenced by jsonref
+            continue
+        seen.add(id(value))
+        stack.extend(values)
+    return False
@@ -0,0 +1,63 @@
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+@dataclass
+class FillStats:
+    """Counters and timers of the fills of a `Filler`
+
+    Collected only if passed as `FillConfig.stats`. Without it, fills are
+    not instrumented at all. Keyword handlers are wrapped with counters (and
+    timers) when the schema is compiled, so the stats of one `FillConfig`
+    accumulate over all fills of all fillers compiled with it.
+
+    Counts are not synchronized between threads, and stats of worker
+    processes (e.g., `fill_default_parallel`) stay in the workers.
+
+    Args:
+        timing (bool): If True, also measure the cumulative time spent in
+            each keyword, by schema path. With the recursive engine, the time
+            of a keyword includes the keywords it fills nested instances
+            with. With the iterative engine, it only includes its own work.
+
+    Attributes:
+        keywords (Counter): Number of times each keyword was applied
+        validations (int): Number of instances validated to select "oneOf",
+            "anyOf", and "if" branches
+        defaults (int): Number of defaults inserted, including keys of object
+            defaults merged into existing objects
+        parents_created (int): Number of missing parents created with nested
+            defaults
+        parents_deleted (int): Number of missing parents created and
+            discarded because they got no defaults. Missing parents are
+            memoized per filler, so this is counted once per filler.
+        seconds (Counter): Cumulative seconds per schema path of a keyword,
+            e.g. "#/properties/a/oneOf", if `timing`
+    """
+    timing: bool = False
+    keywords: Counter = field(default_factory=Counter)
+    validations: int = 0
+    defaults: int = 0
+    parents_created: int = 0
+    parents_deleted: int = 0
+    seconds: Counter = field(default_factory=Counter)
+
+    def reset(self):
+        """Reset all counters and timers to zero"""
+        self.keywords.clear()
+        self.validations = 0
+        self.defaults = 0
+        self.parents_created = 0
+        self.parents_deleted = 0
+        self.seconds.clear()
+
+    def as_dict(self) -> dict:
+        """Return the stats as a JSON-serializable dict"""
+        return {
+            "keywords": dict(self.keywords),
+            "validations": self.validations,
+            "defaults": self.defaults,
+            "parents_created": self.parents_created,
+            "parents_deleted": self.parents_deleted,
+            "seconds": dict(self.seconds),
+        }
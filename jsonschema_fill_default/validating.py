@@ -0,0 +1,630 @@
+import re
+from typing import Union
+
+from jsonschema import Draft202012Validator, ValidationError
+from jsonschema.validators import validator_for
+
+from .config import FillConfig
+from .filler import Filler, KEYWORDS, _Branches, _FillPass, _Node
+from .refs import join_pointer
+
+
+# Keywords validated on an instance alone, without subschemas
+_LOCAL = frozenset({
+    "type", "enum", "const", "multipleOf", "maximum", "exclusiveMaximum",
+    "minimum", "exclusiveMinimum", "maxLength", "minLength", "pattern",
+    "format", "maxItems", "minItems", "uniqueItems", "maxProperties",
+    "minProperties", "required", "dependentRequired"})
+
+# Keywords whose subschemas are not walked, so that a schema with any of
+# them is filled and then validated in full
+_UNWALKED = frozenset({
+    "unevaluatedProperties", "unevaluatedItems", "contains", "propertyNames",
+    "$dynamicRef", "$recursiveRef"})
+
+
+class _Check:
+    """Validation plan of a single (sub)schema
+
+    Attributes:
+        iter_local (callable | None): Iterates over the errors of an instance
+            against the keywords of the schema without subschemas, or None
+            if it has none
+        walked (bool): The subschemas of the schema are walked, else the
+            schema is validated in full
+        custom (dict): (fill, argument) of the custom keywords of the node,
+            by keyword
+        branches (dict): `_Branches` of all "anyOf" and "oneOf" subschemas,
+            by keyword
+        patterns (tuple): (pattern, compiled regex, subschema) of the
+            "patternProperties"
+        default_errors (list | None): Errors of the value a missing property
+            filled with the node resolves to, computed on first use
+    """
+    __slots__ = (
+        "iter_local", "walked", "custom", "branches", "patterns",
+        "default_errors")
+
+    def __init__(self, filler: Filler, schema: dict, node: _Node):
+        keywords = filler.keywords
+        self.walked = _UNWALKED.isdisjoint(schema) and all(
+            keywords[keyword] is KEYWORDS.get(keyword)  # Not replaced
+            for keyword in _WALKS if keyword in schema and keyword in keywords)
+        local = {
+            keyword: value for keyword, value in schema.items()
+            if keyword in _LOCAL}
+        if schema.get("additionalProperties") is False:
+            # Stub the properties it excludes, which are walked
+            local["additionalProperties"] = False
+            for keyword in ("properties", "patternProperties"):
+                if keyword in schema:
+                    local[keyword] = dict.fromkeys(schema[keyword], True)
+        if schema.get("items") is False:
+            local["items"] = False
+            local["prefixItems"] = [True] * len(schema.get("prefixItems", ()))
+        self.iter_local = Draft202012Validator(local).iter_errors \
+            if local else None
+        self.custom = {
+            keyword: (fill, arg) for keyword, fill, arg in node.ops
+            if filler.keywords[keyword] is not KEYWORDS.get(keyword)}
+        self.branches = {}
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in schema:
+                branches = _Branches(tuple(
+                    filler._nodes[id(subschema)]
+                    for subschema in schema[keyword]))
+                branches.index_discriminator()
+                self.branches[keyword] = branches
+        self.patterns = tuple(
+            (pattern, re.compile(pattern), subschema)
+            for pattern, subschema in schema.get(
+                "patternProperties", {}).items())
+        self.default_errors = None
+
+
+class _ValidatingFillPass(_FillPass):
+    """Fill of one instance that validates it in the same traversal
+
+    Walks the schema and the instance together. Each subschema fills the
+    instance like `_FillPass` and then validates it against its keywords
+    without subschemas, while subschemas of properties, items, "allOf",
+    "dependentSchemas", "then", "else", and "$ref" are walked in turn.
+
+    The validity of "anyOf", "oneOf", and "if" subschemas selects the
+    subschemas to fill with, like `_FillPass`. "anyOf" and "oneOf"
+    subschemas the instance is valid to are then filled without validating
+    them again.
+
+    Defaults of later keywords may still change an instance after a
+    subschema was walked, so the errors are only computed once the whole
+    instance is filled: walking a subschema defers its checks, which
+    `_check_deferred` runs on the filled instance. The validity of "anyOf",
+    "oneOf", "if", and "not" subschemas is reused if nothing was filled
+    after they were walked, else computed again, and an "if" subschema that
+    the filled instance is valid to differently validates the other branch
+    instead of the walked one.
+
+    Inserted defaults and created parents are validated against the
+    subschema of their property only if `check_defaults`. Subschemas with
+    keywords that need the annotations of other subschemas (e.g.,
+    "unevaluatedProperties") or with "contains" or "propertyNames" are
+    filled and then validated in full, as are schemas of drafts before
+    2020-12.
+
+    Args:
+        filler (Filler): Compiled filler
+        check_defaults (bool): Validate inserted defaults
+    """
+
+    def __init__(self, filler: Filler, check_defaults: bool = False):
+        super().__init__(filler)
+        self.check_defaults = check_defaults
+        self.errors = []
+        self._deferred = None  # Checks run once filled, see `_defer`
+
+    def validate_and_fill_root(self, instance):
+        """Fill and validate an instance with the root schema and return it
+
+        The errors are appended to `errors`.
+        """
+        instance = self._start(instance)
+        self._path = []  # Keys from the root, for the paths of errors
+        schema = self.filler.schema
+        if validator_for(schema, default=Draft202012Validator) \
+                is not Draft202012Validator:
+            node = self.filler._root
+            self.fill(instance, node)
+            self._validate_fully(instance, (), node)
+        else:
+            self._deferred = []
+            self.walk(instance, schema, ())
+            self._check_deferred(instance)
+        return instance
+
+    def _defer(self, check, instance, schema_path: tuple, *args) -> list:
+        """Run a check on an instance at the current path once it is filled
+
+        Args:
+            check (callable): Method called with the filled instance, the
+                schema path, and the arguments. Returns the index of the
+                next deferred check to run, or None for the next one.
+            instance: JSON instance at the current path
+            schema_path (tuple): Keys from the root schema to the subschema
+            *args: Further arguments of the check
+
+        Returns:
+            entry (list): Deferred check, to append arguments to
+        """
+        entry = [check, instance, tuple(self._path), schema_path, *args]
+        self._deferred.append(entry)
+        return entry
+
+    def _check_deferred(self, root):
+        """Run the deferred checks on the filled instance, in order"""
+        deferred = self._deferred
+        # Copied and thawed containers replace the walked ones by path
+        by_path = self._copy_on_write or self._thaw
+        i = 0
+        while i < len(deferred):
+            check, instance, path, schema_path, *args = deferred[i]
+            if by_path:
+                instance = root
+                for key in path:
+                    instance = instance[key]
+            self._path = path
+            following = check(self, instance, schema_path, *args)
+            i = i + 1 if following is None else following
+        self._deferred = None
+        return None
+
+    def walk(
+            self, instance, schema: Union[dict, bool], schema_path: tuple,
+            merge: Union[tuple, None] = None):
+        """Fill an instance with a schema and validate it against the schema
+
+        Args:
+            instance: JSON instance at the current path
+            schema (dict, bool): (Sub)schema to fill and validate with
+            schema_path (tuple): Keys from the root schema to the subschema,
+                without "$ref" (like `jsonschema.ValidationError`)
+            merge (tuple | None): (parent, property, node) whose object
+                default is merged into the instance after filling it, before
+                validating it
+        """
+        if schema is True:
+            return None
+        node = self.filler._nodes.get(id(schema))
+        if node is None or schema is False:  # E.g., compiled by a replaced
+            # keyword handler
+            self._defer(_ValidatingFillPass._check_schema, instance,
+                        schema_path, schema)
+            return None
+        check = self._check(node)
+        if not check.walked:
+            self.fill(instance, node)
+            if merge is not None:
+                self._fill_property_default(*merge)
+            self._defer(_ValidatingFillPass._validate_fully, instance,
+                        schema_path, node)
+            return None
+        for keyword, value in schema.items():
+            walk_keyword = _WALKS.get(keyword)
+            if walk_keyword is not None:
+                walk_keyword(self, instance, value, node, schema_path, check)
+            elif keyword in check.custom:
+                fill, arg = check.custom[keyword]
+                fill(self, instance, arg)
+        if isinstance(instance, list) \
+                and ("prefixItems" in schema or "items" in schema):
+            self._walk_items(instance, schema, node, schema_path)
+        if merge is not None:
+            self._fill_property_default(*merge)
+        if check.iter_local is not None:
+            self._defer(_ValidatingFillPass._check_local, instance,
+                        schema_path, check.iter_local, schema)
+        return None
+
+    def _check(self, node: _Node) -> _Check:
+        """Return the memoized validation plan of a node"""
+        check = self.filler._checks.get(node)
+        if check is None:
+            check = self.filler._checks[node] = _Check(
+                self.filler, node.schema, node)
+        return check
+
+    def _report(
+            self, errors, schema_path: tuple,
+            schema: Union[dict, None] = None, keys: tuple = ()):
+        """Add errors relative to the current path and a subschema
+
+        Args:
+            errors (iterable): Errors with paths relative to the instance at
+                `keys` below the current path, and to the subschema
+            schema_path (tuple): Keys from the root schema to the subschema
+            schema (dict | None): Subschema to set as the schema of the
+                errors, if they were produced by a partial schema
+            keys (tuple): Keys from the current path to the instance
+        """
+        for error in errors:
+            error.path.extendleft(reversed((*self._path, *keys)))
+            error.schema_path.extendleft(reversed(schema_path))
+            if schema is not None:
+                error.schema = schema
+            self.errors.append(error)
+        return None
+
+    def _check_schema(self, instance, schema_path: tuple, schema):
+        """Validate an instance against an uncompiled subschema"""
+        self._report(self.filler.validators.iter_errors(
+            instance, schema), schema_path)
+        return None
+
+    def _check_local(
+            self, instance, schema_path: tuple, iter_local, schema: dict):
+        """Validate an instance against the keywords of a subschema without
+        subschemas"""
+        self._report(iter_local(instance), schema_path, schema)
+        return None
+
+    def _validate_fully(self, instance, schema_path: tuple, node: _Node):
+        """Validate an instance against the whole schema of a node"""
+        if self._stats is not None:
+            self._stats.validations += 1
+        self._report(self.filler.validators.iter_errors(
+            instance, node.schema, node.location), schema_path)
+        return None
+
+    def _keyword_errors(
+            self, instance, node: _Node, keyword: str, schema_path: tuple):
+        """Add the errors of a keyword of a node that the instance fails"""
+        self._report(
+            (error for error in self.filler.validators.iter_errors(
+                instance, node.schema, node.location)
+             if error.relative_schema_path
+             and error.relative_schema_path[0] == keyword),
+            schema_path)
+        return None
+
+    def _walk_child(
+            self, instance: Union[dict, list], key: Union[str, int],
+            schema: Union[dict, bool], schema_path: tuple,
+            merge: Union[_Node, None] = None):
+        """Walk the child of an instance at a key, see `walk`
+
+        Args:
+            merge (_Node | None): Node whose object default is merged into
+                the child if it is a dict
+        """
+        child = instance[key]
+        if not isinstance(child, (dict, list)):
+            self._path.append(key)
+            self.walk(child, schema, schema_path)
+            self._path.pop()
+            return None
+        writes = self._writes
+        copied = self._enter_child(instance, key)
+        self.walk(
+            copied, schema, schema_path,
+            (instance, key, merge)
+            if merge is not None and merge.default_items
+            and isinstance(copied, dict) else None)
+        self._leave_child(instance, key, child, copied, writes)
+        return None
+
+    def _walk_property(
+            self, instance: dict, _property: str, schema: Union[dict, bool],
+            schema_path: tuple):
+        """Fill a property like `_fill_property` and walk it if it exists"""
+        node = self.filler._nodes.get(id(schema))
+        if _property in instance:
+            self._walk_child(instance, _property, schema, schema_path, node)
+            return None
+        if node is None:
+            return None
+        if node.recurses:
+            self._create_parent(instance, _property, node)
+        if node.has_default:
+            self._fill_property_default(instance, _property, node)
+        if _property not in instance:  # May be filled by a later keyword
+            self._defer(_ValidatingFillPass._check_property, instance,
+                        schema_path, _property, node)
+        elif self.check_defaults:
+            self._check_default(instance, _property, node, schema_path)
+        return None
+
+    def _check_property(
+            self, instance, schema_path: tuple, _property: str,
+            node: _Node):
+        """Validate a property that was missing when its subschema was
+        walked, if another subschema filled it"""
+        if _property in instance:
+            if self._stats is not None:
+                self._stats.validations += 1
+            self._report(self.filler.validators.iter_errors(
+                instance[_property], node.schema, node.location),
+                schema_path, keys=(_property,))
+        return None
+
+    def _check_default(
+            self, instance: Union[dict, list], key: Union[str, int],
+            node: _Node, schema_path: tuple):
+        """Validate the value a missing key was filled with by a node
+
+        The value only depends on the node, so its errors are memoized. They
+        are reported once filled, unless the subschema turns out not to
+        apply (e.g., in "then" of an "if" the filled instance is invalid to).
+        """
+        check = self._check(node)
+        errors = check.default_errors
+        if errors is None:
+            errors = check.default_errors = list(
+                self.filler.validators.iter_errors(
+                    instance[key], node.schema, node.location))
+        self._defer(_ValidatingFillPass._report_default, instance,
+                    schema_path, key, node, self._writes, errors)
+        return None
+
+    def _report_default(
+            self, instance, schema_path: tuple, key: Union[str, int],
+            node: _Node, writes: int, errors: list):
+        """Report the memoized errors of an inserted default, or validate it
+        again if it is a container that may have been filled since"""
+        value = instance[key]
+        if self._writes != writes and isinstance(value, (dict, list)):
+            if self._stats is not None:
+                self._stats.validations += 1
+            errors = self.filler.validators.iter_errors(
+                value, node.schema, node.location)
+        else:
+            errors = (ValidationError.create_from(error) for error in errors)
+        self._report(errors, schema_path, keys=(key,))
+        return None
+
+    def _walk_items(
+            self, instance: list, schema: dict, node: _Node,
+            schema_path: tuple):
+        """Append missing "prefixItems" like `_fill_prefixitems_and_items`,
+        then walk the existing items"""
+        prefixitems = schema.get("prefixItems", ())
+        items = schema.get("items", True)
+        n_instance = len(instance)
+        if n_instance <= len(prefixitems) and node.prefixitems:
+            self._append_prefixitems(instance, node)
+            if self.check_defaults:
+                for i in range(n_instance, len(instance)):
+                    self._check_default(
+                        instance, i, node.prefixitems[i],
+                        (*schema_path, "prefixItems", i))
+        for i in range(n_instance):
+            if i < len(prefixitems):
+                self._walk_child(instance, i, prefixitems[i],
+                                 (*schema_path, "prefixItems", i))
+            elif isinstance(items, dict):
+                self._walk_child(instance, i, items, (*schema_path, "items"))
+        return None
+
+    def _walk_properties(
+            self, instance, properties: dict, node: _Node,
+            schema_path: tuple, check: _Check):
+        if isinstance(instance, dict):
+            for _property, subschema in properties.items():
+                self._walk_property(
+                    instance, _property, subschema,
+                    (*schema_path, "properties", _property))
+        return None
+
+    def _walk_patternproperties(
+            self, instance, patterns: dict, node: _Node,
+            schema_path: tuple, check: _Check):
+        if isinstance(instance, dict):
+            for _property in list(instance):
+                for pattern, regex, subschema in check.patterns:
+                    if regex.search(_property):
+                        self._walk_property(
+                            instance, _property, subschema,
+                            (*schema_path, "patternProperties", pattern))
+        return None
+
+    def _walk_additionalproperties(
+            self, instance, additional, node: _Node, schema_path: tuple,
+            check: _Check):
+        if isinstance(instance, dict) and isinstance(additional, dict):
+            declared = node.schema.get("properties", {})
+            for _property in list(instance):
+                if _property not in declared and not any(
+                        regex.search(_property)
+                        for _, regex, _ in check.patterns):
+                    self._walk_property(
+                        instance, _property, additional,
+                        (*schema_path, "additionalProperties"))
+        return None
+
+    def _walk_allof(
+            self, instance, subschemas: list, node: _Node,
+            schema_path: tuple, check: _Check):
+        for i, subschema in enumerate(subschemas):
+            self.walk(instance, subschema, (*schema_path, "allOf", i))
+        return None
+
+    def _walk_anyof(
+            self, instance, subschemas: list, node: _Node,
+            schema_path: tuple, check: _Check):
+        """Fill with every valid "anyOf" node like `_fill_anyof`, validating
+        the nodes without defaults only until one is valid"""
+        writes = self._writes
+        any_valid = False
+        for branch in check.branches["anyOf"].candidates(instance):
+            if (not any_valid or _fills(branch)) \
+                    and self.is_valid(instance, branch):
+                any_valid = True
+                self.fill(instance, branch)
+        self._defer(_ValidatingFillPass._check_anyof, instance, schema_path,
+                    node, check, writes, any_valid)
+        return None
+
+    def _check_anyof(
+            self, instance, schema_path: tuple, node: _Node, check: _Check,
+            writes: int, any_valid: bool):
+        if self._writes != writes:  # Filled since
+            any_valid = any(
+                self.is_valid(instance, branch)
+                for branch in check.branches["anyOf"].candidates(instance))
+        if not any_valid:
+            self._keyword_errors(instance, node, "anyOf", schema_path)
+        return None
+
+    def _walk_oneof(
+            self, instance, subschemas: list, node: _Node,
+            schema_path: tuple, check: _Check):
+        """Fill with the first valid "oneOf" node like `_fill_oneof`, after
+        validating that it is the only valid one"""
+        writes = self._writes
+        valid = [
+            branch for branch in check.branches["oneOf"].candidates(instance)
+            if self.is_valid(instance, branch)]
+        if valid:
+            self.fill(instance, valid[0])
+        self._defer(_ValidatingFillPass._check_oneof, instance, schema_path,
+                    node, check, writes, len(valid))
+        return None
+
+    def _check_oneof(
+            self, instance, schema_path: tuple, node: _Node, check: _Check,
+            writes: int, n_valid: int):
+        if self._writes != writes:  # Filled since
+            n_valid = sum(
+                self.is_valid(instance, branch)
+                for branch in check.branches["oneOf"].candidates(instance))
+        if n_valid != 1:
+            self._keyword_errors(instance, node, "oneOf", schema_path)
+        return None
+
+    def _walk_ifthenelse(
+            self, instance, if_schema, node: _Node, schema_path: tuple,
+            check: _Check):
+        if_node = self.filler._nodes[id(if_schema)]
+        valid = self.is_valid(instance, if_node)
+        entry = self._defer(_ValidatingFillPass._check_ifthenelse, instance,
+                            schema_path, node, if_node, self._writes, valid)
+        keyword = "then" if valid else "else"
+        if keyword in node.schema:
+            self.walk(
+                instance, node.schema[keyword], (*schema_path, keyword))
+        entry.append(len(self._deferred))  # End of the checks of the branch
+        return None
+
+    def _check_ifthenelse(
+            self, instance, schema_path: tuple, node: _Node, if_node: _Node,
+            writes: int, valid: bool, end: int) -> Union[int, None]:
+        """Validate the other branch instead of the walked one, and skip the
+        checks of the walked one, if the filled instance is valid to "if"
+        differently"""
+        if self._writes == writes \
+                or self.is_valid(instance, if_node) == valid:
+            return None
+        keyword = "else" if valid else "then"
+        if keyword in node.schema:
+            if self._stats is not None:
+                self._stats.validations += 1
+            self._report(self.filler.validators.iter_errors(
+                instance, node.schema[keyword],
+                join_pointer(node.location, keyword)),
+                (*schema_path, keyword))
+        return end
+
+    def _walk_not(
+            self, instance, not_schema, node: _Node, schema_path: tuple,
+            check: _Check):
+        self._defer(_ValidatingFillPass._check_not, instance, schema_path,
+                    node)
+        return None
+
+    def _check_not(self, instance, schema_path: tuple, node: _Node):
+        if self._stats is not None:
+            self._stats.validations += 1
+        if self.filler.validators.is_valid(
+                instance, node.schema["not"],
+                join_pointer(node.location, "not")):
+            self._keyword_errors(instance, node, "not", schema_path)
+        return None
+
+    def _walk_dependentschemas(
+            self, instance, dependents: dict, node: _Node,
+            schema_path: tuple, check: _Check):
+        if isinstance(instance, dict):
+            for _property, subschema in dependents.items():
+                if _property in instance:
+                    self.walk(instance, subschema,
+                              (*schema_path, "dependentSchemas", _property))
+        return None
+
+    def _walk_ref(
+            self, instance, ref: str, node: _Node, schema_path: tuple,
+            check: _Check):
+        if node.ref is not None:
+            self.walk(instance, node.ref.schema, schema_path)
+        return None
+
+    def _walk_default(
+            self, instance, default, node: _Node, schema_path: tuple,
+            check: _Check):
+        if isinstance(default, dict):
+            self._fill_default(instance, node.default_items)
+        return None
+
+
+def _fills(node: _Node) -> bool:
+    """True if filling with a node may add a default (it is not pruned)"""
+    return bool(node.ops or node.prefixitems or node.items is not None)
+
+
+# Walk of each keyword validated by walking its subschemas, by keyword
+_WALKS = {
+    "properties": _ValidatingFillPass._walk_properties,
+    "patternProperties": _ValidatingFillPass._walk_patternproperties,
+    "additionalProperties": _ValidatingFillPass._walk_additionalproperties,
+    "allOf": _ValidatingFillPass._walk_allof,
+    "anyOf": _ValidatingFillPass._walk_anyof,
+    "oneOf": _ValidatingFillPass._walk_oneof,
+    "if": _ValidatingFillPass._walk_ifthenelse,
+    "not": _ValidatingFillPass._walk_not,
+    "dependentSchemas": _ValidatingFillPass._walk_dependentschemas,
+    "$ref": _ValidatingFillPass._walk_ref,
+    "default": _ValidatingFillPass._walk_default,
+}
+
+
+def validate_and_fill(
+        instance: Union[dict, list],
+        schema: dict,
+        config: Union[FillConfig, None] = None,
+        check_defaults: bool = False
+        ) -> tuple:
+    """Fill a JSON instance with schema defaults and validate it at once
+
+    Replaces validating, filling, and validating again with a single walk of
+    the instance and the schema, which fills and defers the validation of
+    each subschema until the whole instance is filled. The validation of
+    "anyOf", "oneOf", and "if" subschemas selects the subschemas to fill
+    with, and is only done again if the instance was filled since.
+
+    Inserted defaults are trusted, unless `check_defaults`, in which case
+    each is validated against the subschema of the property it is inserted
+    for (once per subschema, as the inserted value only depends on it).
+
+    Mutates the instance input, unless `FillConfig.mutate` is False.
+
+    Args:
+        instance (dict, list): JSON instance
+        schema (dict): JSON schema adhering to Draft 2020-12
+        config (FillConfig | None): Configuration for filling. If None, uses
+            default `FillConfig`.
+        check_defaults (bool): If True, also validate inserted defaults
+
+    Returns:
+        instance (dict, list): Filled instance, see `fill_default`
+        errors (list): `jsonschema.ValidationError` of the filled instance,
+            with paths from the root of the instance and schema. Empty if
+            the filled instance is valid.
+    """
+    return Filler(schema, config).validate_and_fill(instance, check_defaults)
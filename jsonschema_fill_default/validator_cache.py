@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterator, Union
+
+from jsonschema import Draft202012Validator, ValidationError
+from jsonschema.validators import validator_for
+from referencing import Registry
+
+from .refs import contains_ref
+
+
+class ValidatorCache:
+    """Bounded cache of compiled validators keyed by subschema identity
+
+    Each subschema is checked against its meta-schema once, when its
+    validator is created. The least recently used validators are evicted once
+    more than `maxsize` are cached.
+
+    Subschemas with a "$ref" are validated through a "$ref" to their
+    location in the registry, so that their "$ref" resolve like in the root
+    schema.
+
+    Args:
+        maxsize (int): Maximum number of cached validators. If 0, validators
+            are not cached.
+        registry (referencing.Registry | None): Registry of the root schema
+            the subschemas belong to
+    """
+
+    def __init__(
+            self, maxsize: int = 1024,
+            registry: Union[Registry, None] = None):
+        self.maxsize = maxsize
+        self.registry = registry
+        # id(schema): (schema, is_valid, iter_errors)
+        self._validators = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._validators)
+
+    def is_valid(
+            self, instance, schema: Union[dict, bool],
+            location: Union[str, None] = None) -> bool:
+        """True if the instance is valid against the schema
+
+        Args:
+            instance: JSON instance
+            schema (dict, bool): JSON (sub)schema adhering to Draft 2020-12
+            location (str | None): URI of the schema in the registry with a
+                JSON pointer fragment, if known
+
+        Returns:
+            valid (bool): Whether the instance is valid against the schema
+
+        Raises:
+            jsonschema.SchemaError: If the schema is invalid to its
+                meta-schema
+        """
+        return self._entry(schema, location)[1](instance)
+
+    def iter_errors(
+            self, instance, schema: Union[dict, bool],
+            location: Union[str, None] = None) -> Iterator[ValidationError]:
+        """Iterate over the errors of an instance against the schema
+
+        Takes the same arguments as `is_valid`. The paths of the errors are
+        relative to the instance and the schema.
+        """
+        return self._entry(schema, location)[2](instance)
+
+    def clear(self):
+        """Evict all cached validators"""
+        with self._lock:
+            self._validators.clear()
+
+    def _entry(
+            self, schema: Union[dict, bool], location: Union[str, None]
+            ) -> tuple:
+        """Return the cached entry of a schema, creating it if not cached"""
+        key = id(schema)
+        with self._lock:
+            entry = self._validators.get(key)
+            if entry is not None:
+                self._validators.move_to_end(key)
+        if entry is None:
+            entry = self._add(schema, location)
+        return entry
+
+    def _add(
+            self, schema: Union[dict, bool], location: Union[str, None]
+            ) -> tuple:
+        """Create, cache, and return the (schema, is_valid, iter_errors) of a
+        schema"""
+        cls = validator_for(schema, default=Draft202012Validator)
+        cls.check_schema(schema)
+        if self.registry is None:
+            validator = cls(schema)
+        elif location is not None and contains_ref(schema):
+            validator = cls({"$ref": location}, registry=self.registry)
+        else:
+            validator = cls(schema, registry=self.registry)
+        # Keep the schema in the entry so its id is not reused while cached
+        entry = (schema, validator.is_valid, validator.iter_errors)
+        if self.maxsize > 0:
+            with self._lock:
+                self._validators[id(schema)] = entry
+                while len(self._validators) > self.maxsize:
+                    self._validators.popitem(last=False)
+        return entry
@@ -66,3 +66,43 @@ def test_load_dereference_fill(schema_filename, instance, expected):
     validate(instance, schema)
 
     assert instance == expected
+
+
+@pytest.mark.parametrize(
+    "schema_filename, instance, expected",
+    [(
+        "bicycle.schema.json",
+        {
+            "style": "city",
+            "tire": {}
+        },
+        {
+            "style": "city",
+            "color": "blue",
+            "tire": {
+                "width": 38,
+                "inner-diameter": 584
+            },
+            "rear-brake": True,
+            "front-brake": False
+        }
+    )]
+)
+def test_load_fill_without_dereferencing(schema_filename, instance, expected):
+    """Load schema JSON, fill instance defaults resolving "$ref", validate
+
+    This test follows the same use case as `test_load_dereference_fill`, but
+    leaves resolving "$ref" to `fill_default` instead of dereferencing the
+    schema first.
+    """
+    schema_absolute_path = Path(__file__).parent / schema_filename
+    with open(schema_absolute_path, 'r') as file:
+        schema = json.load(file)
+
+    protocols.Validator.check_schema(schema)
+    validate(instance, schema)
+
+    fill_default(instance, schema)
+    validate(instance, schema)
+
+    assert instance == expected
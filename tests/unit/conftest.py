@@ -0,0 +1,54 @@
+from copy import deepcopy
+from typing import NamedTuple
+
+import pytest
+
+from test_validate_and_fill import test_schemas_instances
+
+
+class FillCase(NamedTuple):
+    """Instance of `test_schemas_instances` with its schema"""
+    schema: dict
+    original: object
+    expected: object
+    config: dict
+
+
+class FillCaseGroup(NamedTuple):
+    """Instances of `test_schemas_instances` with the same schema and config
+    """
+    schema: dict
+    config: dict
+    originals: list
+    expecteds: list
+
+
+fill_cases = {}
+fill_case_groups = {}
+for name, test in test_schemas_instances.items():
+    for i, instance in enumerate(test["instances"]):
+        config = instance.get("config", {})
+        fill_cases[f"{name}-{i}"] = FillCase(
+            test["schema"], instance["original"], instance["expected"],
+            config)
+        group = fill_case_groups.setdefault(
+            f"{name}-{sorted(config.items())}",
+            FillCaseGroup(test["schema"], config, [], []))
+        group.originals.append(instance["original"])
+        group.expecteds.append(instance["expected"])
+
+
+# Each instance of test_validate_and_fill, to fill with other engines and
+# features. The original is a copy, so tests may fill it.
+@pytest.fixture(params=fill_cases.values(), ids=fill_cases.keys())
+def fill_case(request) -> FillCase:
+    return request.param._replace(original=deepcopy(request.param.original))
+
+
+# The instances of test_validate_and_fill grouped by schema and config, to
+# fill with one filler. The originals are copies.
+@pytest.fixture(
+    params=fill_case_groups.values(), ids=fill_case_groups.keys())
+def fill_case_group(request) -> FillCaseGroup:
+    return request.param._replace(
+        originals=deepcopy(request.param.originals))
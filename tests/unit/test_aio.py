@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from jsonschema_fill_default import (
+    FillConfig, afill_default, afill_default_many, aio)
+
+
+# Filled asynchronously, instances must equal their expected
+def test_afill_is_equal_to_expected(fill_case):
+    schema, instance, expected, config = fill_case
+    filled = asyncio.run(afill_default(
+        instance, schema, FillConfig(**config), yield_every=1))
+    assert filled is instance
+    assert filled == expected
+
+
+schema = {
+    "properties": {
+        "items": {"items": {"properties": {"a": {"default": 1}}}}
+    }
+}
+
+
+def test_afill_yields_to_event_loop():
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        ticker = asyncio.ensure_future(tick())
+        await asyncio.sleep(0)
+        n_ticks = len(ticks)
+        instance = {"items": [{} for _ in range(1000)]}
+        await afill_default(instance, schema, yield_every=100)
+        ticker.cancel()
+        return instance, len(ticks) - n_ticks
+
+    instance, n_ticks = asyncio.run(main())
+    assert instance["items"][-1] == {"a": 1}
+    assert n_ticks >= 10
+
+
+def test_afill_in_executor_without_mutating():
+    async def main():
+        with ThreadPoolExecutor(1) as executor:
+            return await afill_default(
+                instance, schema, FillConfig(mutate=False),
+                executor=executor)
+
+    instance = {"items": [{}]}
+    assert asyncio.run(main()) == {"items": [{"a": 1}]}
+    assert instance == {"items": [{}]}
+
+
+def test_afill_many_keeps_order_and_bounds_concurrency(monkeypatch):
+    in_flight = []
+    max_in_flight = []
+    afill = aio._afill
+
+    async def counting_afill(*args):
+        in_flight.append(None)
+        max_in_flight.append(len(in_flight))
+        try:
+            await asyncio.sleep(0)
+            return await afill(*args)
+        finally:
+            in_flight.pop()
+
+    monkeypatch.setattr(aio, "_afill", counting_afill)
+    instances = [{"items": [{}] * i} for i in range(20)]
+    filled = asyncio.run(afill_default_many(
+        instances, schema, concurrency=3, yield_every=2))
+    assert filled == [{"items": [{"a": 1}] * i} for i in range(20)]
+    assert max(max_in_flight) == 3
+
+
+def test_afill_many_async_iterable():
+    async def instances():
+        for i in range(5):
+            await asyncio.sleep(0)
+            yield {"items": [{"a": i}]}
+
+    filled = asyncio.run(afill_default_many(instances(), schema))
+    assert filled == [{"items": [{"a": i}]} for i in range(5)]
+
+
+def test_invalid_arguments_raise():
+    with pytest.raises(ValueError):
+        asyncio.run(afill_default({}, schema, yield_every=0))
+    with pytest.raises(ValueError):
+        asyncio.run(afill_default_many([{}], schema, concurrency=0))
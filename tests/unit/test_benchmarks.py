@@ -0,0 +1,26 @@
+import pytest
+from jsonschema import validate, protocols
+
+from benchmarks.compare import compare
+from benchmarks.generators import SHAPES
+from benchmarks.run import CONFIGS, run
+
+
+# Generated schemas and instances must be valid
+@pytest.mark.parametrize("name", SHAPES)
+def test_generated_shapes_are_valid(name):
+    shape = SHAPES[name](5)
+    assert protocols.Validator.check_schema(shape.schema) is None
+    assert validate(shape.instance(), shape.schema) is None
+
+
+def test_run_reports_every_combination():
+    report = run(list(SHAPES), [3], list(CONFIGS), n_fills=3)
+    assert len(report["results"]) == len(SHAPES) * len(CONFIGS)
+    for result in report["results"]:
+        assert result["fills_per_second"] > 0
+        assert result["latency_us"]["p50"] <= result["latency_us"]["p99"]
+        assert result["peak_memory_bytes"] >= 0
+    rows = compare(report, report, threshold=0.1)
+    assert len(rows) == len(report["results"])
+    assert not any(row[-1] for row in rows)
@@ -0,0 +1,108 @@
+import io
+import json
+import sys
+
+import pytest
+from jsonschema_fill_default.cli import main
+
+
+schema = {
+    "properties": {
+        "a": {"default": 1},
+        "pool": {"properties": {"size": {"default": 8}}}
+    }
+}
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(schema))
+    return str(path)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_json_files_to_stdout(schema_path, tmp_path, capsys, jobs):
+    paths = []
+    for i, instance in enumerate([{}, {"a": 2}, {"b": []}]):
+        paths.append(tmp_path / f"{i}.json")
+        paths[-1].write_text(json.dumps(instance))
+    assert main([schema_path, *map(str, paths), "--jobs", jobs]) == 0
+    assert [json.loads(line) for line in
+            capsys.readouterr().out.splitlines()] == [
+        {"a": 1, "pool": {"size": 8}},
+        {"a": 2, "pool": {"size": 8}},
+        {"b": [], "a": 1, "pool": {"size": 8}},
+    ]
+
+
+def test_json_file_in_place(schema_path, tmp_path, capsys):
+    path = tmp_path / "instance.json"
+    path.write_text("{}")
+    assert main([
+        schema_path, str(path), "-i", "--indent", "2",
+        "--no-create-missing-parents"]) == 0
+    assert path.read_text() == '{\n  "a": 1\n}\n'
+    assert capsys.readouterr().out == ""
+
+
+def test_json_stdin(schema_path, capsys, monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO('{"a": 0}'))
+    assert main([schema_path]) == 0
+    assert json.loads(capsys.readouterr().out) == {
+        "a": 0, "pool": {"size": 8}}
+
+
+def test_json_stdin_with_files_in_workers(
+        schema_path, tmp_path, capsys, monkeypatch):
+    path = tmp_path / "instance.json"
+    path.write_text("{}")
+    monkeypatch.setattr(sys, "stdin", io.StringIO('{"a": 0}'))
+    assert main([schema_path, str(path), "-", "--jobs", "2"]) == 0
+    assert [json.loads(line) for line in
+            capsys.readouterr().out.splitlines()] == [
+        {"a": 1, "pool": {"size": 8}},
+        {"a": 0, "pool": {"size": 8}},
+    ]
+
+
+@pytest.mark.parametrize("options", [
+    [], ["--jobs", "2"], ["--ndjson"], ["--ndjson", "--jobs", "2"]])
+def test_cache_dir(schema_path, tmp_path, capsys, options):
+    paths = []
+    for i in range(2):
+        paths.append(str(tmp_path / f"{i}.json"))
+        with open(paths[-1], "w") as file:
+            file.write('{"a": 0}\n')
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        assert main([
+            schema_path, *paths, "--cache-dir", str(cache_dir),
+            *options]) == 0
+        assert [json.loads(line) for line in
+                capsys.readouterr().out.splitlines()] \
+            == 2 * [{"a": 0, "pool": {"size": 8}}]
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+
+def test_missing_file_fails(schema_path, tmp_path, capsys):
+    assert main([schema_path, str(tmp_path / "missing.json")]) == 1
+    assert "FileNotFoundError" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_ndjson_in_place(schema_path, tmp_path, capsys, jobs):
+    path = tmp_path / "instances.ndjson"
+    path.write_text('{"a": 3}\n{bad\n{}\n')
+    assert main([
+        schema_path, "--ndjson", str(path), "-i", "-j", jobs,
+        "--stats"]) == 1
+    assert path.read_text() == (
+        '{"a":3,"pool":{"size":8}}\n{bad\n{"a":1,"pool":{"size":8}}\n')
+    err = capsys.readouterr().err
+    assert f"{path}:2: JSONDecodeError" in err
+    assert "2 filled, 1 failed" in err
+
+
+def test_in_place_needs_files(schema_path):
+    assert main([schema_path, "-i"]) == 2
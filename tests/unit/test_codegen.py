@@ -0,0 +1,144 @@
+import gc
+import itertools
+import linecache
+import traceback
+from copy import deepcopy
+
+import pytest
+from jsonschema import Draft202012Validator
+from jsonschema_fill_default import (
+    FillConfig, FillStats, Keyword, compile_filler, fill_patch)
+from jsonschema_fill_default.codegen import _Generator
+from jsonschema_fill_default.copying import is_frozen
+
+from test_predicates import instances, schemas
+
+# The generated function must fill like the recursive engine
+@pytest.mark.parametrize("default_copy", ["share", "deep", "frozen"])
+def test_codegen_is_equal_to_expected(fill_case, default_copy):
+    schema, original, expected, config = fill_case
+    config = {"default_copy": default_copy, **config}
+    filler = compile_filler(schema, FillConfig(**config, engine="codegen"))
+    assert filler.source is not None
+    instance = deepcopy(original)
+    filled = filler.fill(instance)
+    assert filled is instance
+    assert filled == expected
+    assert filler.fill_many([deepcopy(original)]) == [expected]
+    assert fill_patch(deepcopy(original), schema, FillConfig(
+        **config, engine="codegen")) == fill_patch(
+            deepcopy(original), schema, FillConfig(**config))
+
+
+# Inlined predicates must be True exactly if jsonschema finds the instance
+# valid
+@pytest.mark.parametrize(
+    "schema, instance", list(itertools.product(schemas, instances)))
+def test_predicate_source_equals_jsonschema(schema, instance):
+    generator = _Generator(compile_filler({}))
+    predicate = eval(
+        "lambda instance: " + generator.predicate(schema, "instance"),
+        generator.namespace)
+    assert predicate(instance) \
+        == Draft202012Validator(schema).is_valid(instance)
+
+
+schema = {
+    "properties": {
+        "name": {"default": "x"},
+        "server": {
+            "properties": {
+                "host": {"default": "localhost"},
+                "ports": {"default": [80, 443]}
+            }
+        },
+        "tags": {"prefixItems": [{"default": "a"}, {"default": "b"}]}
+    },
+    "if": {"properties": {"name": {"const": "y"}}, "required": ["name"]},
+    "then": {"properties": {"y": {"default": True}}},
+    "else": {"properties": {"y": {"default": False}}},
+    "anyOf": [{"minProperties": 3, "properties": {"many": {"default": 1}}}]
+}
+
+
+def test_source_is_inspectable():
+    filler = compile_filler(schema, FillConfig(engine="codegen"))
+    assert filler.source.startswith("def fill(instance):")
+    assert "'host' not in instance" in filler.source
+    assert "instance['name'] == 'y'" in filler.source
+    compile(filler.source, "<source>", "exec")
+    assert filler.fill({"name": "y"}) == {
+        "name": "y", "server": {"host": "localhost", "ports": [80, 443]},
+        "y": True, "many": 1}
+
+
+def test_tracebacks_show_the_source():
+    def fail(fill_pass, instance, arg):
+        raise RuntimeError(arg)
+
+    filler = compile_filler({"properties": {"a": {"fail": 1}}}, FillConfig(
+        engine="codegen", keywords={"fail": Keyword(fail)}))
+    with pytest.raises(RuntimeError) as info:
+        filler.fill({"a": {}})
+    frames = traceback.extract_tb(info.tb)
+    assert any("fill_" in frame.line for frame in frames)
+    filename = next(frame.filename for frame in frames
+                    if frame.filename.startswith("<"))
+    assert linecache.getlines(filename)
+    del filler, info, frames
+    gc.collect()  # The filler and its generated functions are a cycle
+    assert not linecache.getlines(filename)
+
+
+def test_custom_keywords_are_filled_by_their_handler():
+    def fill_upper(fill_pass, instance, arg):
+        if isinstance(instance, dict) and arg in instance:
+            instance[arg] = instance[arg].upper()
+            fill_pass.added(instance[arg], arg)
+
+    config = FillConfig(
+        engine="codegen", keywords={"upper": Keyword(fill_upper)})
+    custom = {"properties": {"a": {
+        "properties": {"b": {"default": "b"}}, "upper": "b"}}}
+    filler = compile_filler(custom, config)
+    assert filler.fill({}) == {"a": {"b": "B"}}
+    assert filler.fill({"a": {"b": "c"}}) == {"a": {"b": "C"}}
+
+
+def test_frozen_defaults_are_thawed_like_the_engine():
+    frozen = {
+        "properties": {
+            "a": {
+                "default": {"b": {}},
+                "properties": {"b": {"properties": {"c": {"default": 1}}}}
+            },
+            "d": {"default": {"e": 1}}
+        }
+    }
+    filled = compile_filler(frozen, FillConfig(
+        default_copy="frozen", engine="codegen")).fill({"d": {"f": 1}})
+    expected = compile_filler(frozen, FillConfig(
+        default_copy="frozen")).fill({"d": {"f": 1}})
+    assert filled == expected == {"a": {"b": {"c": 1}}, "d": {"f": 1, "e": 1}}
+    assert is_frozen(filled["a"]) == is_frozen(expected["a"])
+    assert is_frozen(filled["a"]["b"]) == is_frozen(expected["a"]["b"])
+
+
+def test_discriminated_branches_are_looked_up():
+    union = {"oneOf": [
+        {"properties": {"kind": {"const": i}, "i": {"default": i}},
+         "required": ["kind"]}
+        for i in range(20)]}
+    filler = compile_filler(union, FillConfig(engine="codegen"))
+    assert ".candidates(instance)" in filler.source
+    for i in (0, 7, 19):
+        assert filler.fill({"kind": i}) == {"kind": i, "i": i}
+    assert filler.fill({"kind": 20}) == {"kind": 20}
+
+
+@pytest.mark.parametrize("config", [
+    {"mutate": False}, {"stats": FillStats()}])
+def test_fills_fall_back_to_the_recursive_engine(config):
+    filler = compile_filler(schema, FillConfig(**config, engine="codegen"))
+    assert filler.source is None
+    assert filler.fill({"name": "y"})["y"] is True
@@ -0,0 +1,136 @@
+import json
+import pickle
+import sys
+from copy import deepcopy
+
+import pytest
+
+from jsonschema_fill_default import FillConfig, compile_filler, fill_default
+from jsonschema_fill_default.copying import (
+    FrozenDict, FrozenList, compile_copier, compile_deep_copier, freeze)
+
+
+schema = {
+    "properties": {
+        "tags": {"default": ["a", {"b": [1]}]},
+        "limits": {"default": {"cpu": 2, "disk": {"size": 10}}},
+        "name": {"default": "x"},
+    }
+}
+
+
+@pytest.mark.parametrize("strategy", ["share", "shallow", "deep", "frozen"])
+def test_strategies_fill_equal_values(strategy):
+    instance = {"limits": {"cpu": 4}}
+    fill_default(instance, schema, FillConfig(default_copy=strategy))
+    assert instance == {
+        "tags": ["a", {"b": [1]}],
+        "limits": {"cpu": 4, "disk": {"size": 10}},
+        "name": "x"}
+    assert json.loads(json.dumps(instance)) == instance
+
+
+def test_share_inserts_schema_values():
+    instance = fill_default_with({}, "share")
+    assert instance["tags"] is schema["properties"]["tags"]["default"]
+
+
+def test_shallow_copies_top_level_only():
+    instance = fill_default_with({}, "shallow")
+    default = schema["properties"]["tags"]["default"]
+    assert instance["tags"] is not default
+    assert instance["tags"][1] is default[1]
+
+
+def test_deep_copies_independent_of_schema():
+    original = deepcopy(schema)
+    first = fill_default_with({}, "deep")
+    second = fill_default_with({}, "deep")
+    first["tags"][1]["b"].append(2)
+    first["limits"]["disk"]["size"] = 0
+    assert schema == original
+    assert second["tags"] == ["a", {"b": [1]}]
+
+
+def test_frozen_defaults_are_shared_and_immutable():
+    filler = compile_filler(schema, FillConfig(default_copy="frozen"))
+    first = filler.fill({})
+    second = filler.fill({})
+    assert first["tags"] is second["tags"]
+    assert isinstance(first["tags"], FrozenList)
+    assert isinstance(first["tags"][1], FrozenDict)
+    with pytest.raises(TypeError):
+        first["tags"].append("c")
+    with pytest.raises(TypeError):
+        first["tags"][1]["b"] = 2
+
+
+def test_frozen_defaults_are_thawed_before_filling_into():
+    schema = {
+        "properties": {
+            "server": {
+                "default": {"port": 80},
+                "properties": {"host": {"default": "localhost"}}
+            }
+        },
+        "default": {"server": {"port": 80}}
+    }
+    filler = compile_filler(schema, FillConfig(default_copy="frozen"))
+    instance = filler.fill({})
+    assert instance == {"server": {"port": 80, "host": "localhost"}}
+    assert type(instance["server"]) is dict
+    assert filler.fill({}) == instance
+
+
+def test_frozen_list_items_are_thawed_before_filling_into():
+    schema = {
+        "properties": {
+            "points": {
+                "default": [{"x": 0}],
+                "items": {"properties": {"y": {"default": 0}}}
+            }
+        }
+    }
+    filler = compile_filler(schema, FillConfig(default_copy="frozen"))
+    assert filler.fill({}) == {"points": [{"x": 0, "y": 0}]}
+    assert filler.fill({}) == {"points": [{"x": 0, "y": 0}]}
+
+
+def test_unknown_strategy_raises():
+    with pytest.raises(ValueError):
+        compile_filler(schema, FillConfig(default_copy="clone"))
+
+
+@pytest.mark.parametrize("value", [
+    3, "a", None, [], {}, [1, [2, {"a": [3]}]], {"a": {"b": [1, {}]}}])
+def test_deep_copier_copies(value):
+    copied = compile_deep_copier(value)()
+    assert copied == value
+    if isinstance(value, (dict, list)):
+        assert copied is not value
+
+
+def test_deep_copier_of_deeply_nested_value():
+    value = leaf = {}
+    for i in range(5 * sys.getrecursionlimit()):
+        value = {"child": [value], "level": i}
+    copied = compile_deep_copier(value)()
+    assert copied["level"] == value["level"]
+    for _ in range(5 * sys.getrecursionlimit()):
+        assert copied is not value and copied["child"] is not value["child"]
+        copied, value = copied["child"][0], value["child"][0]
+    assert copied == leaf and copied is not leaf
+
+
+def test_frozen_values_copy_and_pickle_as_themselves():
+    frozen = freeze({"a": [1, {"b": 2}]})
+    assert deepcopy(frozen) is frozen
+    assert compile_copier(frozen, "deep")() is frozen
+    unpickled = pickle.loads(pickle.dumps(frozen))
+    assert unpickled == frozen
+    assert isinstance(unpickled["a"], FrozenList)
+
+
+def fill_default_with(instance, strategy):
+    fill_default(instance, schema, FillConfig(default_copy=strategy))
+    return instance
@@ -0,0 +1,62 @@
+import pytest
+from jsonschema_fill_default import FillConfig, FillStats, compile_filler
+
+
+schema = {
+    "oneOf": [
+        {
+            "properties": {
+                "kind": {"const": f"kind{i}"},
+                "number": {"default": i}
+            },
+            "required": ["kind"]
+        }
+        for i in range(30)
+    ] + [
+        {
+            "properties": {
+                "kind": {"enum": ["kind0", "other"]},
+                "number": {"default": -1},
+                "other": {"default": True}
+            },
+            "required": ["kind"]
+        },
+        {
+            "properties": {"number": {"default": -2}},
+            "required": ["name"]
+        }
+    ]
+}
+
+
+@pytest.mark.parametrize(
+    "original, expected, n_validations",
+    [
+        ({"kind": "kind7"}, {"kind": "kind7", "number": 7}, 1),
+        ({"kind": "other"}, {"kind": "other", "number": -1, "other": True}, 1),
+        ({"kind": "unknown", "name": "x"},
+         {"kind": "unknown", "name": "x", "number": -2}, 1),
+        ({"name": "x"}, {"name": "x", "number": -2}, 32),
+    ]
+)
+def test_oneof_selects_candidates_by_discriminator(
+        original, expected, n_validations):
+    stats = FillStats()
+    filler = compile_filler(schema, FillConfig(stats=stats))
+    filler.fill(original)
+    assert original == expected
+    assert stats.validations == n_validations
+
+
+def test_anyof_fills_candidates_in_schema_order():
+    filler = compile_filler({
+        "anyOf": [
+            {"properties": {"a": {"default": 1}}},
+            {"properties": {"kind": {"const": 1}, "b": {"default": 2}}},
+            {"properties": {"kind": {"const": True}, "c": {"default": 3}}},
+            {"properties": {"kind": {"enum": [1.0, 2]}, "d": {"default": 4}}},
+        ]
+    })
+    assert list(filler.fill({"kind": 1})) == ["kind", "a", "b", "d"]
+    assert list(filler.fill({"kind": True})) == ["kind", "a", "c"]
+    assert list(filler.fill({"kind": [1]})) == ["kind", "a"]
@@ -0,0 +1,34 @@
+import types
+
+from jsonschema_fill_default import fill_default_many, FillConfig
+
+
+# A batch of filled instances must equal their expected
+def test_filled_instances_are_equal_to_expected(fill_case_group):
+    schema, config, originals, expecteds = fill_case_group
+    filled = fill_default_many(originals, schema, FillConfig(**config))
+    assert isinstance(filled, list)
+    assert filled == expecteds
+    assert all(a is b for a, b in zip(filled, originals))
+
+
+def test_generator_is_filled_lazily():
+    schema = {"properties": {"a": {"default": 1}}}
+    consumed = []
+
+    def instances():
+        for i in range(3):
+            consumed.append(i)
+            yield {"i": i}
+
+    filled = fill_default_many(instances(), schema)
+    assert isinstance(filled, types.GeneratorType)
+    assert consumed == []
+    assert next(filled) == {"i": 0, "a": 1}
+    assert consumed == [0]
+    assert list(filled) == [{"i": 1, "a": 1}, {"i": 2, "a": 1}]
+
+
+def test_tuple_is_filled_as_list():
+    schema = {"properties": {"a": {"default": 1}}}
+    assert fill_default_many(({}, {"a": 2}), schema) == [{"a": 1}, {"a": 2}]
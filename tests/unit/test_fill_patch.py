@@ -0,0 +1,79 @@
+from copy import deepcopy
+
+from jsonschema_fill_default import FillConfig, compile_filler, fill_patch
+
+
+def apply_patch(instance, patch):
+    """Apply JSON Patch "add" operations in order"""
+    instance = deepcopy(instance)
+    for operation in patch:
+        assert operation["op"] == "add"
+        *keys, last = [
+            key.replace("~1", "/").replace("~0", "~")
+            for key in operation["path"].split("/")[1:]]
+        parent = instance
+        for key in keys:
+            parent = parent[int(key) if isinstance(parent, list) else key]
+        if isinstance(parent, list):
+            parent.insert(int(last), deepcopy(operation["value"]))
+        else:
+            parent[last] = deepcopy(operation["value"])
+    return instance
+
+
+# The patch applied to the original must give the expected
+def test_patch_applied_to_original_is_equal_to_expected(fill_case):
+    schema, original, expected, config = fill_case
+    instance = deepcopy(original)
+    patch = fill_patch(instance, schema, FillConfig(**config))
+    assert instance == expected
+    assert apply_patch(original, patch) == expected
+
+
+def test_patch_without_mutating(fill_case):
+    schema, original, expected, config = fill_case
+    instance = deepcopy(original)
+    patch = fill_patch(instance, schema, FillConfig(**config, mutate=False))
+    assert instance == original
+    assert apply_patch(original, patch) == expected
+
+
+schema = {
+    "properties": {
+        "a/b": {"default": 1},
+        "limits": {"default": {"cpu": 2, "ram": 4}},
+        "server": {
+            "properties": {
+                "tls": {"properties": {"enabled": {"default": False}}}
+            }
+        },
+        "point": {"prefixItems": [{"default": 0}, {"default": 0}]}
+    }
+}
+
+
+def test_patch_operations():
+    instance = {"limits": {"cpu": 1}, "point": [5]}
+    patch = fill_patch(instance, schema)
+    assert patch == [
+        {"op": "add", "path": "/a~1b", "value": 1},
+        {"op": "add", "path": "/limits/ram", "value": 4},
+        {"op": "add", "path": "/server",
+         "value": {"tls": {"enabled": False}}},
+        {"op": "add", "path": "/point/1", "value": 0},
+    ]
+
+
+def test_patch_pairs_are_snapshots():
+    filler = compile_filler(schema)
+    instance = {"limits": {"cpu": 1}, "point": [5, 6]}
+    pairs = filler.fill_patch(instance, pairs=True)
+    assert pairs[2] == ("/server", {"tls": {"enabled": False}})
+    instance["server"]["tls"]["enabled"] = True
+    assert pairs[2] == ("/server", {"tls": {"enabled": False}})
+
+
+def test_nothing_to_add_gives_empty_patch():
+    instance = {"a/b": 2, "limits": {"cpu": 1, "ram": 1},
+                "server": {"tls": {"enabled": True}}, "point": [1, 2]}
+    assert fill_patch(instance, schema) == []
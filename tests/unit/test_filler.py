@@ -0,0 +1,62 @@
+import sys
+from copy import deepcopy
+
+from jsonschema_fill_default import compile_filler, fill_default, FillConfig
+
+
+# Compile each schema once per config and fill all of its instances with it
+def test_compiled_filler_is_reusable(fill_case_group):
+    schema, config, originals, expecteds = fill_case_group
+    filler = compile_filler(schema, FillConfig(**config))
+    for _ in range(2):  # Filling must not change the filler
+        for original, expected in zip(originals, expecteds):
+            instance = deepcopy(original)
+            assert filler.fill(instance) is instance
+            assert instance == expected
+
+
+def test_shared_subschema_is_compiled_once():
+    shared = {"properties": {"a": {"default": 1}}}
+    schema = {"properties": {"x": shared, "y": shared}}
+    filler = compile_filler(schema)
+    assert len(filler._nodes) == 3
+    assert filler.fill({}) == {"x": {"a": 1}, "y": {"a": 1}}
+
+
+def test_empty_array_without_prefixitems():
+    filler = compile_filler({"items": {"properties": {"a": {"default": 1}}}})
+    assert filler.fill([]) == []
+    assert filler.fill([{}]) == [{"a": 1}]
+
+
+def test_pattern_matches_are_memoized_per_property_name():
+    schema = {
+        "patternProperties": {
+            "^x-": {"properties": {"a": {"default": 1}}},
+            "y$": {"properties": {"b": {"default": 2}}}
+        },
+        "additionalProperties": {"properties": {"c": {"default": 3}}}
+    }
+    filler = compile_filler(schema)
+    assert filler.fill({"x-y": {}, "x-z": {}, "w": {}}) == {
+        "x-y": {"a": 1, "b": 2}, "x-z": {"a": 1}, "w": {"c": 3}}
+    patterns = filler._root.ops[0][2]
+    assert patterns.matches.keys() == {"x-y", "x-z", "w"}
+    patterns.patterns = ()  # Memoized names do not run the regexes again
+    assert filler.fill({"x-y": {}}) == {"x-y": {"a": 1, "b": 2}}
+
+
+def test_one_shot_fills_compile_the_schema_as_it_is():
+    schema = {"properties": {"a": {"default": 1}}}
+    assert fill_default({}, schema) == {"a": 1}
+    schema["properties"]["b"] = {"default": 2}
+    assert fill_default({}, schema) == {"a": 1, "b": 2}
+
+
+def test_deeply_nested_schema_compiles():
+    schema = leaf = {"properties": {"leaf": {"default": 0}}}
+    for _ in range(5 * sys.getrecursionlimit()):
+        schema = {"properties": {"child": schema}}
+    filler = compile_filler(schema)
+    assert filler._nodes[id(leaf)].ops
+    assert filler._root.ops
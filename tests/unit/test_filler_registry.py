@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from threading import Barrier
+from unittest import mock
+
+import pytest
+from jsonschema_fill_default import (
+    FillConfig, Filler, FillerRegistry, PlanCache)
+
+
+def tenant(i):
+    return {
+        "$id": f"https://example.com/tenants/{i}.json",
+        "properties": {"tenant": {"default": i}},
+    }
+
+
+def tenant_id(i):
+    return tenant(i)["$id"]
+
+
+def test_fill():
+    registry = FillerRegistry([tenant(i) for i in range(3)])
+    assert len(registry) == 3
+    assert tenant_id(1) in registry
+    assert tenant_id(1) + "#" in registry
+    assert registry.fill(tenant_id(1), {}) == {"tenant": 1}
+    assert registry.fill(tenant_id(1) + "#", {}) == {"tenant": 1}
+    assert registry.filler(tenant_id(2)).fill({}) == {"tenant": 2}
+    assert (registry.hits, registry.misses, registry.evictions) == (1, 2, 0)
+    with pytest.raises(KeyError):
+        registry.filler("https://example.com/other.json")
+
+
+def test_schemas_are_compiled_on_first_use():
+    with mock.patch(
+            "jsonschema_fill_default.filler_registry.Filler",
+            wraps=Filler) as compiling:
+        registry = FillerRegistry([tenant(i) for i in range(3)])
+        assert compiling.call_count == 0
+        registry.filler(tenant_id(0))
+        registry.filler(tenant_id(0))
+        assert compiling.call_count == 1
+
+
+def test_register():
+    registry = FillerRegistry()
+    with pytest.raises(ValueError):
+        registry.register({"properties": {}})
+    registry.register(tenant(0))
+    assert registry.fill(tenant_id(0), {}) == {"tenant": 0}
+    replaced = deepcopy(tenant(0))
+    replaced["properties"]["tenant"]["default"] = "zero"
+    registry.register(replaced)
+    assert registry.fill(tenant_id(0), {}) == {"tenant": "zero"}
+    registry.unregister(tenant_id(0))
+    assert tenant_id(0) not in registry
+    with pytest.raises(KeyError):
+        registry.filler(tenant_id(0))
+
+
+def test_least_recently_used_fillers_are_evicted():
+    registry = FillerRegistry([tenant(i) for i in range(3)], max_fillers=2)
+    registry.filler(tenant_id(0))
+    registry.filler(tenant_id(1))
+    registry.filler(tenant_id(0))  # Used most recently
+    registry.filler(tenant_id(2))
+    assert registry.evictions == 1
+    registry.filler(tenant_id(0))
+    registry.filler(tenant_id(2))
+    registry.filler(tenant_id(1))
+    assert (registry.hits, registry.misses, registry.evictions) == (3, 4, 2)
+    registry.clear()
+    assert registry.evictions == 4
+    assert registry.fill(tenant_id(0), {}) == {"tenant": 0}
+
+
+def test_fillers_are_evicted_beyond_max_bytes():
+    registry = FillerRegistry([tenant(i) for i in range(3)], max_bytes=0)
+    assert registry.fill(tenant_id(0), {}) == {"tenant": 0}
+    assert (registry.misses, registry.evictions, registry.bytes) == (1, 1, 0)
+    registry.max_bytes = 10**9
+    registry.filler(tenant_id(0))
+    size = registry.bytes
+    assert size > 0
+    registry.max_bytes = 2 * size + size // 2
+    registry.filler(tenant_id(1))
+    registry.filler(tenant_id(2))
+    assert registry.evictions == 2
+    assert registry.bytes == 2 * size
+
+
+def test_threads_share_fillers():
+    registry = FillerRegistry([tenant(i) for i in range(4)])
+    barrier = Barrier(16)
+
+    def fill(i):
+        barrier.wait()
+        return registry.filler(tenant_id(i % 4)), registry.fill(
+            tenant_id(i % 4), {})
+
+    with ThreadPoolExecutor(16) as executor:
+        results = list(executor.map(fill, range(16)))
+    assert [filled for _, filled in results] \
+        == [{"tenant": i % 4} for i in range(16)]
+    assert len({id(filler) for filler, _ in results}) == 4
+    assert registry.misses == 4
+    assert registry.hits == 28
+
+
+def test_cache(tmp_path):
+    config = FillConfig(default_copy="deep")
+    FillerRegistry([tenant(0)], config, cache=PlanCache(tmp_path)).filler(
+        tenant_id(0))
+    cache = PlanCache(tmp_path)
+    registry = FillerRegistry([tenant(0)], config, cache=cache)
+    assert registry.fill(tenant_id(0), {}) == {"tenant": 0}
+    assert cache.hits == 1
@@ -0,0 +1,86 @@
+import sys
+from copy import deepcopy
+
+import pytest
+from jsonschema_fill_default import FillConfig, compile_filler, fill_patch
+
+
+# The iterative engine must fill like the recursive engine, in the same order
+@pytest.mark.parametrize("mutate", [True, False])
+def test_iterative_adds_same_defaults_in_same_order(fill_case, mutate):
+    schema, original, expected, config = fill_case
+    recursive_patch = fill_patch(
+        deepcopy(original), schema, FillConfig(**config, mutate=mutate))
+    instance = deepcopy(original)
+    iterative_patch = fill_patch(instance, schema, FillConfig(
+        **config, mutate=mutate, engine="iterative"))
+    assert iterative_patch == recursive_patch
+    assert instance == (expected if mutate else original)
+
+
+tree_schema = {
+    "$defs": {
+        "node": {
+            "properties": {
+                "kind": {"default": "leaf"},
+                "children": {"items": {"$ref": "#/$defs/node"}}
+            }
+        }
+    },
+    "$ref": "#/$defs/node"
+}
+
+
+def deep_tree(depth):
+    root = node = {}
+    for _ in range(depth):
+        child = {}
+        node["children"] = [child]
+        node = child
+    return root, node
+
+
+def test_deep_instance_does_not_hit_recursion_limit():
+    depth = 5 * sys.getrecursionlimit()
+    instance, leaf = deep_tree(depth)
+    filler = compile_filler(tree_schema, FillConfig(engine="iterative"))
+    filler.fill(instance)
+    assert instance["kind"] == "leaf"
+    assert leaf == {"kind": "leaf"}
+    with pytest.raises(RecursionError):
+        compile_filler(tree_schema).fill(deep_tree(depth)[0])
+
+
+@pytest.mark.parametrize("mutate", [True, False])
+def test_deeply_nested_schema_does_not_hit_recursion_limit(mutate):
+    depth = 5 * sys.getrecursionlimit()
+    schema = {"properties": {"leaf": {"default": 0}}}
+    for level in reversed(range(depth)):
+        schema = {"properties": {
+            "value": {"default": level}, "child": schema}}
+    instance = node = {}
+    for _ in range(depth // 2):  # Upper half present, lower half created
+        node["child"] = {}
+        node = node["child"]
+    filler = compile_filler(
+        schema, FillConfig(engine="iterative", mutate=mutate))
+    filled = filler.fill(instance)
+    for level in range(depth):
+        assert filled["value"] == level
+        filled = filled["child"]
+    assert filled == {"leaf": 0}
+    assert ("value" in instance) is mutate
+
+
+def test_deep_instance_without_mutating():
+    instance, leaf = deep_tree(5 * sys.getrecursionlimit())
+    filler = compile_filler(
+        tree_schema, FillConfig(engine="iterative", mutate=False))
+    filled = filler.fill(instance)
+    assert leaf == {}
+    assert "kind" in filled and "kind" not in instance
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError):
+        compile_filler(tree_schema, FillConfig(engine="threaded"))
@@ -0,0 +1,107 @@
+import pickle
+
+import pytest
+from jsonschema_fill_default import (
+    KEYWORDS, FillConfig, Keyword, compile_filler, fill_default, fill_patch)
+
+
+def fill_stamp(fill_pass, instance, stamp):
+    """Fill an object with the missing keys of the "x-stamp" object"""
+    if isinstance(instance, dict):
+        for key, value in stamp.items():
+            if key not in instance:
+                instance[key] = value
+                fill_pass.added(value, key)
+
+
+def compile_firstof(filler, value, schema, compile_subschema):
+    return tuple(
+        compile_subschema(subschema, "x-firstOf", i)
+        for i, subschema in enumerate(value))
+
+
+def fill_firstof(fill_pass, instance, nodes):
+    """Fill with the first "x-firstOf" subschema the instance is valid to"""
+    for node in nodes:
+        if fill_pass.is_valid(instance, node):
+            fill_pass.fill(instance, node)
+            return
+
+
+keywords = {
+    "x-stamp": Keyword(fill_stamp),
+    "x-firstOf": Keyword(fill_firstof, compile_firstof),
+}
+
+schema = {
+    "properties": {
+        "meta": {"x-stamp": {"version": 1}},
+        "shape": {
+            "x-firstOf": [
+                {"required": ["radius"],
+                 "properties": {"kind": {"default": "circle"}}},
+                {"properties": {"kind": {"default": "square"},
+                                "side": {"default": 1}}}
+            ]
+        }
+    }
+}
+
+
+@pytest.mark.parametrize("engine", ["recursive", "iterative"])
+def test_custom_keywords_are_filled(engine):
+    config = FillConfig(keywords=keywords, engine=engine)
+    instance = {"meta": {}, "shape": {"radius": 2}}
+    fill_default(instance, schema, config)
+    assert instance == {
+        "meta": {"version": 1}, "shape": {"radius": 2, "kind": "circle"}}
+
+
+def test_custom_keyword_additions_are_patched_without_mutating():
+    config = FillConfig(keywords=keywords, mutate=False)
+    instance = {"meta": {}, "shape": {"radius": 2}}
+    assert fill_patch(instance, schema, config) == [
+        {"op": "add", "path": "/meta/version", "value": 1},
+        {"op": "add", "path": "/shape/kind", "value": "circle"}]
+    assert instance == {"meta": {}, "shape": {"radius": 2}}
+
+
+@pytest.mark.parametrize("engine", ["recursive", "iterative"])
+def test_custom_keyword_creates_missing_parents(engine):
+    config = FillConfig(keywords=keywords, engine=engine)
+    assert fill_default({}, schema, config) == {
+        "meta": {"version": 1}, "shape": {"kind": "square", "side": 1}}
+
+
+def test_custom_keywords_are_ignored_by_default():
+    assert fill_default({"meta": {}}, schema) == {"meta": {}}
+
+
+def test_builtin_keyword_can_be_replaced():
+    def fill_nothing(fill_pass, instance, arg):
+        pass
+
+    schema = {"default": {"b": 2}, "properties": {"a": {"default": 1}}}
+    config = FillConfig(keywords={"default": Keyword(fill_nothing)})
+    assert fill_default({}, schema, config) == {"a": 1}
+    assert fill_default({}, schema) == {"b": 2, "a": 1}
+
+
+def test_builtin_keywords():
+    assert set(KEYWORDS) == {
+        "properties", "patternProperties", "additionalProperties", "allOf",
+        "anyOf", "oneOf", "if", "dependentSchemas",
+        "default", "$ref"}
+    with pytest.raises(TypeError):
+        KEYWORDS["x-stamp"] = keywords["x-stamp"]
+
+
+def test_keyword_handlers_are_dispatched_without_lookup():
+    filler = compile_filler(schema, FillConfig(keywords=keywords))
+    node = filler._root.ops[0][2][0][1]
+    assert node.ops == (("x-stamp", fill_stamp, {"version": 1}),)
+
+
+def test_config_with_module_level_keywords_pickles():
+    config = FillConfig(keywords=keywords)
+    assert pickle.loads(pickle.dumps(config)).keywords == keywords
@@ -0,0 +1,48 @@
+from jsonschema_fill_default import compile_filler
+
+
+def test_prefixitems_defaults_are_resolved_once_and_copied():
+    schema = {
+        "prefixItems": [
+            {"type": "string"},
+            {"properties": {"size": {"default": [1, 2]}}},
+            {"default": {"weight": 9}},
+        ]
+    }
+    filler = compile_filler(schema)
+    first = filler.fill(["a"])
+    assert first == ["a", {"size": [1, 2]}, {"weight": 9}]
+    prefixitems = filler._root.prefixitems
+    assert filler._root.prefix_tail == 1
+    assert prefixitems[1].empty_value() == {"size": [1, 2]}
+
+    second = filler.fill(["b"])
+    assert second == ["b", {"size": [1, 2]}, {"weight": 9}]
+    assert second[1] is not first[1]
+    assert second[1]["size"] is not first[1]["size"]
+    assert second[2] is not schema["prefixItems"][2]["default"]
+    first[1]["size"].append(3)
+    assert filler.fill(["c"])[1] == {"size": [1, 2]}
+
+
+def test_missing_parents_are_filled_once_and_copied():
+    schema = {
+        "properties": {
+            "pool": {
+                "if": {"required": ["size"], "minProperties": 1},
+                "else": {"properties": {"size": {"default": 8}}},
+                "properties": {"tags": {"default": ["a"]}}
+            }
+        }
+    }
+    filler = compile_filler(schema)
+    first = filler.fill({})
+    assert first == {"pool": {"size": 8, "tags": ["a"]}}
+    n_validators = len(filler.validators)
+    filler.clear_cache()
+    second = filler.fill({})
+    assert second == first
+    assert len(filler.validators) == 0 < n_validators  # Not validated again
+    assert second["pool"] is not first["pool"]
+    assert second["pool"]["tags"] is not first["pool"]["tags"]
+    assert filler.fill({"pool": {}}) == {"pool": {"size": 8, "tags": ["a"]}}
@@ -0,0 +1,49 @@
+import io
+import json
+
+from jsonschema_fill_default import fill_ndjson
+
+
+schema = {"properties": {"a": {"default": 1}, "b": {"default": "é"}}}
+
+
+def test_fill_ndjson_file():
+    source = io.BytesIO(b'{"a": 2}\n\n{}\n[1]\n{"b": "x"}')
+    sink = io.BytesIO()
+    reports = []
+    report = fill_ndjson(source, sink, schema, chunksize=2,
+                         progress=lambda r: reports.append(r.lines))
+    assert [json.loads(line) for line in sink.getvalue().splitlines()] == [
+        {"a": 2, "b": "é"}, {"a": 1, "b": "é"}, [1], {"b": "x", "a": 1}]
+    assert (report.lines, report.filled, report.failed) == (4, 4, 0)
+    assert report.bytes_read == len(source.getvalue())
+    assert report.bytes_written == len(sink.getvalue())
+    assert reports == [1, 3, 4]
+    assert report.lines_per_second > 0
+
+
+def test_bad_lines_are_reported_and_written_unchanged():
+    errors = []
+    sink = io.BytesIO()
+    report = fill_ndjson(
+        [b'{"a": 2}\n', b'{not json\n', b'{}\n', b'{"b": \n'], sink,
+        schema, on_error=errors.append, max_errors=1)
+    assert sink.getvalue().splitlines() == [
+        b'{"a":2,"b":"\xc3\xa9"}', b'{not json', b'{"a":1,"b":"\xc3\xa9"}',
+        b'{"b": ']
+    assert (report.lines, report.filled, report.failed) == (4, 2, 2)
+    assert [e.line_number for e in errors] == [2, 4]
+    assert report.errors == errors[:1]
+    assert isinstance(errors[0].error, json.JSONDecodeError)
+
+
+def test_fill_ndjson_in_workers():
+    lines = [b'{"a": %d}\n' % i for i in range(100)] + [b'{\n', b'{}\n']
+    serial, parallel = io.BytesIO(), io.BytesIO()
+    serial_report = fill_ndjson(lines, serial, schema, chunksize=7)
+    parallel_report = fill_ndjson(
+        lines, parallel, schema, chunksize=7, workers=2)
+    assert parallel.getvalue() == serial.getvalue()
+    assert parallel_report.bytes_read == serial_report.bytes_read
+    assert (parallel_report.filled, parallel_report.failed) == (101, 1)
+    assert parallel_report.errors[0].line_number == 101
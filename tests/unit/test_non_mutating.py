@@ -0,0 +1,74 @@
+from copy import deepcopy
+
+from jsonschema_fill_default import (
+    FillConfig, compile_filler, fill_default, fill_default_many)
+
+
+# Without mutating, the filled copy must equal the expected and the input
+# must be unchanged
+def test_filled_copy_is_equal_to_expected(fill_case):
+    schema, original, expected, config = fill_case
+    instance = deepcopy(original)
+    filled = fill_default(
+        instance, schema, FillConfig(**config, mutate=False))
+    assert filled == expected
+    assert instance == original
+    assert filled is not instance
+
+
+schema = {
+    "properties": {
+        "server": {
+            "properties": {
+                "port": {"default": 80},
+                "tls": {"properties": {"enabled": {"default": False}}}
+            }
+        },
+        "clients": {
+            "items": {"properties": {"retries": {"default": 3}}}
+        },
+        "labels": {"properties": {"team": {"type": "string"}}}
+    }
+}
+
+
+def test_untouched_subtrees_are_shared():
+    instance = {
+        "server": {"port": 8080, "tls": {"enabled": True}, "log": {"a": 1}},
+        "clients": [{"retries": 1}, {"name": "b"}],
+        "labels": {"team": "core"},
+        "payload": {"big": [1, 2, 3]}
+    }
+    original = deepcopy(instance)
+    filled = compile_filler(schema, FillConfig(mutate=False)).fill(instance)
+    assert instance == original
+    assert filled["clients"][1] == {"name": "b", "retries": 3}
+    # Copied on the path to the inserted default
+    assert filled is not instance
+    assert filled["clients"] is not instance["clients"]
+    assert filled["clients"][1] is not instance["clients"][1]
+    # Shared everywhere else
+    assert filled["server"] is instance["server"]
+    assert filled["labels"] is instance["labels"]
+    assert filled["payload"] is instance["payload"]
+    assert filled["clients"][0] is instance["clients"][0]
+
+
+def test_created_parents_do_not_copy_siblings():
+    instance = {"server": {"port": 8080}, "labels": {"team": "core"}}
+    filled = compile_filler(schema, FillConfig(mutate=False)).fill(instance)
+    assert instance == {"server": {"port": 8080}, "labels": {"team": "core"}}
+    assert filled["server"] == {"port": 8080, "tls": {"enabled": False}}
+    assert filled["labels"] is instance["labels"]
+
+
+def test_fill_many_returns_copies():
+    instances = [{}, {"server": {}}]
+    filled = fill_default_many(instances, schema, FillConfig(mutate=False))
+    assert instances == [{}, {"server": {}}]
+    assert filled[1]["server"] == {"port": 80, "tls": {"enabled": False}}
+
+
+def test_mutating_fill_returns_instance():
+    instance = {}
+    assert fill_default(instance, schema) is instance
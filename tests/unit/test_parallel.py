@@ -0,0 +1,56 @@
+import types
+
+import pytest
+from jsonschema_fill_default import fill_default_parallel, FillConfig
+
+
+schema = {
+    "properties": {
+        "kind": {"enum": ["a", "b"]},
+        "pool": {
+            "properties": {
+                "max_connections": {"default": 8}
+            }
+        }
+    },
+    "if": {"properties": {"kind": {"const": "a"}}},
+    "then": {"properties": {"number": {"default": 1}}},
+    "else": {"properties": {"number": {"default": 2}}}
+}
+
+
+def instances(n):
+    return [{"i": i, "kind": "ab"[i % 2]} for i in range(n)]
+
+
+def expected(n, create_missing_parents=True):
+    filled = []
+    for instance in instances(n):
+        if create_missing_parents:
+            instance["pool"] = {"max_connections": 8}
+        instance["number"] = 1 if instance["kind"] == "a" else 2
+        filled.append(instance)
+    return filled
+
+
+@pytest.mark.parametrize("create_missing_parents", [True, False])
+@pytest.mark.parametrize("chunksize", [1, 7, 1000])
+def test_parallel_fill_is_ordered(create_missing_parents, chunksize):
+    config = FillConfig(create_missing_parents=create_missing_parents)
+    originals = instances(50)
+    filled = fill_default_parallel(
+        originals, schema, config, workers=2, chunksize=chunksize)
+    assert filled == expected(50, create_missing_parents)
+    assert originals == instances(50)  # Inputs are not mutated
+
+
+def test_parallel_fill_unordered():
+    filled = fill_default_parallel(
+        iter(instances(50)), schema, workers=2, chunksize=3, ordered=False)
+    assert isinstance(filled, types.GeneratorType)
+    assert sorted(filled, key=lambda i: i["i"]) == expected(50)
+
+
+def test_invalid_chunksize():
+    with pytest.raises(ValueError):
+        fill_default_parallel([], schema, chunksize=0)
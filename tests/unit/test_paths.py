@@ -0,0 +1,110 @@
+import pytest
+from jsonschema_fill_default import (
+    FillConfig, FillStats, compile_filler, fill_default)
+from jsonschema_fill_default.paths import path_tree, split_pointer
+
+
+def escape(key: str) -> str:
+    return "/" + key.replace("~", "~0").replace("/", "~1")
+
+
+# Targeting all properties of the expected instance must fill it entirely
+def test_fill_all_paths_is_equal_to_expected(fill_case):
+    schema, original, expected, config = fill_case
+    if not isinstance(expected, dict) or "default" in schema:
+        pytest.skip("Root defaults are not applied by targeted fills")
+    paths = [escape(key) for key in expected]
+    filled = fill_default(original, schema, FillConfig(**config), paths)
+    assert filled == expected
+
+
+schema = {
+    "properties": {
+        "kind": {"enum": ["a", "b"]},
+        "settings": {
+            "properties": {
+                "render": {
+                    "properties": {"dpi": {"default": 72}}
+                },
+                "audio": {"properties": {"volume": {"default": 5}}},
+                "plugins": {
+                    "items": {"properties": {"on": {"default": True}}}
+                }
+            },
+            "if": {
+                "properties": {"mode": {"const": "hq"}},
+                "required": ["mode"]
+            },
+            "then": {
+                "properties": {
+                    "render": {"properties": {"hq": {"default": True}}}
+                }
+            }
+        },
+        "other": {"default": 1}
+    },
+    "oneOf": [
+        {
+            "properties": {
+                "kind": {"const": "a"},
+                "settings": {
+                    "properties": {"render": {"properties": {
+                        "engine": {"default": "a"}}}}
+                }
+            },
+            "required": ["kind"]
+        },
+        {
+            "properties": {"kind": {"const": "b"}},
+            "required": ["kind"]
+        }
+    ]
+}
+
+
+@pytest.mark.parametrize("engine", ["recursive", "iterative"])
+def test_fill_only_paths(engine):
+    filler = compile_filler(schema, FillConfig(engine=engine))
+    assert filler.fill({}, "/settings/render") \
+        == {"settings": {"render": {"dpi": 72}}}
+    assert filler.fill({"kind": "a", "settings": {"mode": "hq"}},
+                       ["/settings/render"]) \
+        == {"kind": "a", "settings": {"mode": "hq", "render": {
+            "dpi": 72, "hq": True, "engine": "a"}}}
+    assert filler.fill({"settings": {"render": {}}},
+                       ["/settings/render/dpi", "/other"]) \
+        == {"settings": {"render": {"dpi": 72}}, "other": 1}
+    assert filler.fill({"settings": {"plugins": [{}, {}]}},
+                       "/settings/plugins/1") \
+        == {"settings": {"plugins": [{}, {"on": True}]}}
+    assert filler.fill({}, "") == filler.fill({})
+
+
+def test_other_subtrees_are_not_traversed():
+    stats = FillStats()
+    filler = compile_filler(schema, FillConfig(stats=stats))
+    instance = {"kind": "b", "settings": {"audio": {}, "render": {}}}
+    filled = filler.fill(instance, "/settings/audio")
+    assert filled == {
+        "kind": "b", "settings": {"audio": {"volume": 5}, "render": {}}}
+    assert stats.validations == 2  # "if" and the first "oneOf" node
+
+
+def test_fill_paths_without_mutating():
+    filler = compile_filler(schema, FillConfig(mutate=False))
+    instance = {"settings": {"audio": {}, "render": {}}}
+    filled = filler.fill(instance, "/settings/render")
+    assert filled == {"settings": {"audio": {}, "render": {"dpi": 72}}}
+    assert instance == {"settings": {"audio": {}, "render": {}}}
+    assert filled["settings"]["audio"] is instance["settings"]["audio"]
+
+
+def test_path_tree():
+    assert split_pointer("/a~1b/c~0d/0") == ("a/b", "c~d", "0")
+    assert path_tree(["/a/b", "/a/c", "/d"]) \
+        == {"a": {"b": None, "c": None}, "d": None}
+    assert path_tree(["/a/b", "/a"]) == {"a": None}
+    assert path_tree(["/a", "/a/b"]) == {"a": None}
+    assert path_tree(["/a", ""]) is None
+    with pytest.raises(ValueError):
+        path_tree("a")
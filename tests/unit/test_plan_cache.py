@@ -0,0 +1,145 @@
+import json
+import pickle
+from copy import deepcopy
+from unittest import mock
+
+import pytest
+from jsonschema_fill_default import (
+    FillConfig, FillStats, Keyword, PlanCache, compile_filler)
+from jsonschema_fill_default.plan_cache import plan_key
+
+
+# Fillers loaded from the cache must fill like compiled ones
+@pytest.mark.parametrize("engine", ["recursive", "codegen"])
+def test_loaded_filler_is_equal_to_expected(fill_case, engine, tmp_path):
+    schema, original, expected, config = fill_case
+    config = FillConfig(**config, engine=engine)
+    cache = PlanCache(tmp_path)
+    compiled = cache.filler(schema, config)
+    loaded = PlanCache(tmp_path).filler(schema, config)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert loaded is not compiled
+    assert loaded.fill(deepcopy(original)) == expected
+    assert loaded.fill_patch(deepcopy(original)) \
+        == compiled.fill_patch(deepcopy(original))
+    assert (loaded.source is None) == (engine == "recursive")
+
+
+schema = {
+    "$defs": {"port": {"type": "integer", "default": 80}},
+    "properties": {
+        "port": {"$ref": "#/$defs/port"},
+        "server": {"properties": {"host": {"default": "localhost"}}},
+        "mode": {"enum": ["fast", "slow"]}
+    },
+    "if": {"properties": {"mode": {"const": "fast"}}, "required": ["mode"]},
+    "then": {"properties": {"workers": {"default": 4}}},
+    "oneOf": [
+        {"minProperties": 9, "properties": {"many": {"default": True}}},
+        {"properties": {"many": {"default": False}}}
+    ]
+}
+filled = {"mode": "fast", "port": 80, "server": {"host": "localhost"},
+          "workers": 4, "many": False}
+
+
+def test_keys():
+    key = plan_key(schema)
+    assert key == plan_key(json.loads(json.dumps(schema)))
+    assert key != plan_key(dict(reversed(schema.items())))
+    assert key != plan_key(schema, FillConfig(default_copy="deep"))
+    assert plan_key(schema, FillConfig(stats=FillStats())) \
+        == plan_key(schema, FillConfig(stats=FillStats()))
+    cyclic = {}
+    cyclic["items"] = cyclic
+    assert plan_key(cyclic) is None
+
+
+def test_loaded_filler_with_stats(tmp_path):
+    stats = FillStats(timing=True)
+    config = FillConfig(stats=stats)
+    PlanCache(tmp_path).filler(schema, config)
+    cache = PlanCache(tmp_path)
+    filler = cache.filler(schema, FillConfig(stats=stats))
+    assert cache.hits == 1
+    stats.reset()
+    assert filler.fill({"mode": "fast"}) == filled
+    assert stats.keywords["properties"] == 4
+    assert stats.validations == 3
+    assert any(path.endswith("#/if") for path in stats.seconds)
+
+
+def test_stale_entries_are_compiled_again(tmp_path):
+    directory = tmp_path / "schemas"
+    directory.mkdir()
+    (directory / "port.json").write_text(json.dumps({"default": 80}))
+    referencing = {"properties": {"port": {"$ref": "port.json"}}}
+    config = FillConfig(schema_dir=directory)
+    cache = PlanCache(tmp_path / "cache")
+    assert cache.filler(referencing, config).fill({}) == {"port": 80}
+    assert cache.filler(referencing, config).fill({}) == {"port": 80}
+    (directory / "port.json").write_text(json.dumps({"default": 8080}))
+    assert cache.filler(referencing, config).fill({}) == {"port": 8080}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_unreadable_entries_are_compiled_again(tmp_path):
+    cache = PlanCache(tmp_path)
+    cache.filler(schema)
+    path, = tmp_path.glob("*.pickle")
+    path.write_bytes(b"not a pickle")
+    assert cache.filler(schema).fill({"mode": "fast"}) == filled
+    assert cache.filler(schema).fill({"mode": "fast"}) == filled
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    schemas = [{"properties": {"a": {"default": i}}} for i in range(3)]
+    cache = PlanCache(tmp_path)
+    cache.filler(schemas[0])
+    size, = [path.stat().st_size for path in tmp_path.glob("*.pickle")]
+    cache.max_bytes = 2 * size + size // 2
+    cache.filler(schemas[1])
+    cache.filler(schemas[0])  # Used most recently
+    cache.filler(schemas[2])
+    assert len(list(tmp_path.glob("*.pickle"))) == 2
+    cache.filler(schemas[0])
+    cache.filler(schemas[2])
+    cache.filler(schemas[1])
+    assert (cache.hits, cache.misses) == (3, 4)
+    cache.clear()
+    assert not list(tmp_path.glob("*.pickle"))
+
+
+def test_unpicklable_fillers_are_not_stored(tmp_path):
+    config = FillConfig(keywords={"noop": Keyword(lambda *args: None)})
+    cache = PlanCache(tmp_path)
+    for _ in range(2):
+        assert cache.filler(schema, config).fill({"mode": "fast"}) == filled
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert not list(tmp_path.glob("*.pickle"))
+
+
+def test_pickle_filler():
+    filler = compile_filler(schema, FillConfig(engine="codegen"))
+    loaded = pickle.loads(pickle.dumps(filler))
+    assert loaded.source == filler.source
+    assert loaded.fill({"mode": "fast"}) == filled
+    assert loaded.validate_and_fill({"mode": "fast", "port": "x"})[1]
+
+
+def test_loading_skips_compiling(tmp_path):
+    config = FillConfig(engine="codegen")
+    compiled = PlanCache(tmp_path).filler(schema, config)
+    with mock.patch("jsonschema_fill_default.filler.compile_predicate") \
+            as compile_predicate, \
+            mock.patch("jsonschema_fill_default.codegen.compile",
+                       create=True) as compile_source:
+        loaded = PlanCache(tmp_path).filler(schema, config)
+        assert not compile_predicate.called and not compile_source.called
+    assert loaded.source == compiled.source
+    assert loaded.fill({"mode": "fast"}) == filled
+    # Only the plan is pickled, e.g., not the "enum" property without default
+    assert len(loaded._nodes) < len(compiled._nodes)
+    assert id(schema["properties"]["mode"]) in compiled._nodes
+    assert loaded.validate_and_fill({"mode": "fast", "port": "x"})[1]
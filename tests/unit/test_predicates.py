@@ -0,0 +1,92 @@
+import itertools
+
+import pytest
+from jsonschema import Draft202012Validator
+from jsonschema_fill_default import FillConfig, FillStats, compile_filler
+from jsonschema_fill_default.predicates import compile_predicate, json_equal
+
+
+schemas = [
+    True,
+    False,
+    {},
+    {"title": "Annotations only", "default": 1},
+    {"type": "integer"},
+    {"type": "number"},
+    {"type": ["string", "null"]},
+    {"type": "object", "required": ["a", "b"]},
+    {"type": "array"},
+    {"const": 1},
+    {"const": True},
+    {"const": None},
+    {"const": "1"},
+    {"const": [1, {"a": False}]},
+    {"const": {"a": [1.0]}},
+    {"enum": [0, "0", False, None]},
+    {"enum": [[1], {"a": 1}, 2]},
+    {"enum": []},
+    {"properties": {"a": {"const": 1}, "b": {"type": "boolean"}}},
+    {"properties": {"a": {"properties": {"b": {"enum": [1, 2]}}}},
+     "required": ["a"]},
+    {"properties": {"a": False}},
+]
+
+instances = [
+    None, True, False, 0, 1, 1.0, 1.5, 2, "0", "1", "", [], [1], [1.0],
+    [True], [1, {"a": False}], [1, {"a": 0}], {}, {"a": 1}, {"a": True},
+    {"a": [1.0]}, {"a": [1]}, {"a": 1, "b": True}, {"a": 1, "b": 1},
+    {"a": {"b": 2}}, {"a": {"b": 3}}, {"b": False},
+]
+
+
+# Predicates must be True exactly if jsonschema finds the instance valid
+@pytest.mark.parametrize(
+    "schema, instance", list(itertools.product(schemas, instances)))
+def test_predicate_equals_jsonschema(schema, instance):
+    predicate = compile_predicate(schema)
+    assert predicate is not None
+    assert predicate(instance) \
+        == Draft202012Validator(schema).is_valid(instance)
+
+
+@pytest.mark.parametrize("schema", [
+    {"minimum": 1},
+    {"properties": {"a": {"$ref": "#/$defs/a"}}},
+    {"type": "integer", "not": {"const": 1}},
+    {"type": "decimal"},
+    {"type": ["string", "string"]},
+    {"required": "a"},
+    {"enum": 1},
+    {"title": 1},
+    {"$schema": "http://json-schema.org/draft-07/schema#"},
+])
+def test_unsupported_schemas_are_not_compiled(schema):
+    assert compile_predicate(schema) is None
+
+
+def test_json_equal():
+    assert json_equal(1, 1.0)
+    assert not json_equal(1, True)
+    assert not json_equal([0], [False])
+    assert json_equal({"a": [1]}, {"a": [1.0]})
+    assert not json_equal({"a": 1}, {"a": 1, "b": 2})
+
+
+def test_conditions_are_evaluated_without_validators():
+    stats = FillStats()
+    filler = compile_filler({
+        "if": {"properties": {"kind": {"const": "a"}}, "required": ["kind"]},
+        "then": {"properties": {"a": {"default": 1}}},
+        "else": {"properties": {"b": {"default": 2}}},
+        "oneOf": [
+            {"properties": {"size": {"type": "integer"},
+                            "c": {"default": 3}}},
+            {"properties": {"size": {"type": "string"},
+                            "d": {"default": 4}}}
+        ]
+    }, FillConfig(stats=stats))
+    assert filler.fill({"kind": "a", "size": "x"}) \
+        == {"kind": "a", "size": "x", "a": 1, "d": 4}
+    assert filler.fill({"size": 1}) == {"size": 1, "b": 2, "c": 3}
+    assert stats.validations == 5
+    assert len(filler.validators) == 0
@@ -0,0 +1,111 @@
+import pytest
+from jsonschema_fill_default import (
+    FillConfig, FillStats, Keyword, compile_filler)
+from jsonschema_fill_default.filler import _UNSET
+
+
+schema = {
+    "properties": {
+        "kind": {"enum": ["a", "b"]},
+        "name": {"type": "string", "default": "x"},
+        "meta": {
+            "properties": {
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "owner": {"properties": {"id": {"type": "integer"}}}
+            },
+            "if": {"required": ["tags"]},
+            "then": {"required": ["owner"]}
+        },
+        "shape": {
+            "oneOf": [
+                {"properties": {"kind": {"const": "a"}}},
+                {"properties": {"kind": {"const": "b"}}}
+            ]
+        }
+    },
+    "if": {"properties": {"kind": {"const": "a"}}, "required": ["kind"]},
+    "then": {"properties": {"a": {"default": True}}},
+    "else": {"properties": {"b": {"type": "integer"}}},
+    "anyOf": [
+        {"properties": {"c": {"default": 1}}},
+        {"properties": {"d": {"type": "integer"}}}
+    ]
+}
+
+
+@pytest.mark.parametrize("engine", ["recursive", "iterative"])
+def test_default_free_subtrees_are_not_filled(engine):
+    stats = FillStats()
+    filler = compile_filler(schema, FillConfig(stats=stats, engine=engine))
+    instance = filler.fill({"kind": "b", "meta": {"tags": []}, "shape": {}})
+    assert instance == {
+        "kind": "b", "name": "x", "meta": {"tags": []}, "shape": {}, "c": 1}
+    assert stats.keywords == {"properties": 2, "if": 1, "anyOf": 1}
+    assert stats.validations == 2  # Root "if" and the first "anyOf" node
+    assert stats.parents_created == stats.parents_deleted == 0
+
+
+def test_default_free_nodes_are_not_visited():
+    filler = compile_filler(schema)
+    properties = dict(filler._root.ops[0][2])
+    assert list(properties) == ["name"]
+    meta = filler._nodes[id(schema["properties"]["meta"])]
+    assert meta.ops == () and not meta.recurses
+    assert meta.empty_parent is _UNSET
+    if_node, then_node, else_node = filler._root.ops[1][2]
+    assert then_node is not None and else_node is None
+    assert len(filler._root.ops[2][2].nodes) == 1
+
+
+def test_oneof_keeps_nodes_before_the_last_with_defaults():
+    filler = compile_filler({
+        "oneOf": [
+            {"required": ["a"]},
+            {"properties": {"b": {"default": 1}}},
+            {"required": ["c"]}
+        ]
+    })
+    branches = filler._root.ops[0][2]
+    assert len(branches.nodes) == 2
+    assert filler.fill({"a": 1}) == {"a": 1}
+    assert filler.fill({}) == {"b": 1}
+
+
+def test_recursive_refs_are_pruned():
+    filler = compile_filler({
+        "$defs": {
+            "tree": {
+                "properties": {
+                    "name": {"type": "string"},
+                    "children": {"items": {"$ref": "#/$defs/tree"}}
+                }
+            },
+            "listed": {
+                "properties": {
+                    "size": {"default": 0},
+                    "next": {"$ref": "#/$defs/listed"}
+                }
+            }
+        },
+        "properties": {
+            "tree": {"$ref": "#/$defs/tree"},
+            "listed": {"$ref": "#/$defs/listed"}
+        }
+    })
+    assert [_property for _property, _ in filler._root.ops[0][2]] \
+        == ["listed"]
+    assert filler.fill({"tree": {"children": [{}]}, "listed": {"next": {}}}) \
+        == {"tree": {"children": [{}]},
+            "listed": {"size": 0, "next": {
+                "size": 0, "next": {"size": 0}}}}
+
+
+def test_custom_keywords_are_kept():
+    def fill_stamp(fill_pass, instance, value):
+        if isinstance(instance, dict):
+            instance.setdefault("stamp", value)
+
+    filler = compile_filler(
+        {"properties": {"meta": {"x-stamp": 1}}},
+        FillConfig(keywords={"x-stamp": Keyword(fill_stamp)}))
+    assert filler.fill({}) == {"meta": {"stamp": 1}}
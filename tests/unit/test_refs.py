@@ -0,0 +1,124 @@
+import json
+import sys
+
+import pytest
+from jsonschema_fill_default import compile_filler, fill_default, FillConfig
+from jsonschema_fill_default.refs import contains_ref
+from referencing.exceptions import Unresolvable
+
+
+def test_local_refs_are_compiled_once():
+    schema = {
+        "properties": {
+            "front": {"$ref": "#/$defs/tire"},
+            "rear": {"$ref": "#/$defs/tire"},
+            "size": {"$ref": "#/$defs/size"},
+        },
+        "$defs": {
+            "tire": {"properties": {"width": {"default": 28}}},
+            "size": {"default": "M"},
+        }
+    }
+    filler = compile_filler(schema)
+    tire = schema["$defs"]["tire"]
+    assert filler._nodes[id(schema["properties"]["front"])].ref \
+        is filler._nodes[id(schema["properties"]["rear"])].ref \
+        is filler._nodes[id(tire)]
+    assert filler.fill({}) == {
+        "front": {"width": 28}, "rear": {"width": 28}, "size": "M"}
+
+
+def test_recursive_schema():
+    schema = {
+        "$defs": {
+            "node": {
+                "properties": {
+                    "value": {"default": 0},
+                    "children": {"items": {"$ref": "#/$defs/node"}},
+                    "next": {"$ref": "#/$defs/node"}
+                }
+            }
+        },
+        "$ref": "#/$defs/node"
+    }
+    instance = {"children": [{}, {"children": [{"value": 2}]}], "next": {}}
+    fill_default(instance, schema)
+    assert instance == {
+        "children": [
+            {"value": 0, "next": {"value": 0}},
+            {"children": [{"value": 2, "next": {"value": 0}}],
+             "value": 0, "next": {"value": 0}}
+        ],
+        "next": {"value": 0, "next": {"value": 0}},
+        "value": 0
+    }
+
+
+def test_branch_with_ref_is_validated_against_root():
+    schema = {
+        "oneOf": [
+            {"properties": {"kind": {"$ref": "#/$defs/a"}},
+             "required": ["kind"]},
+            {"properties": {"other": {"default": True}}}
+        ],
+        "$defs": {"a": {"const": "a"}}
+    }
+    filler = compile_filler(schema)
+    assert filler.fill({"kind": "a"}) == {"kind": "a"}
+    assert filler.fill({"kind": "b"}) == {"kind": "b", "other": True}
+
+
+def test_embedded_id_and_anchor():
+    schema = {
+        "$id": "https://example.com/root.json",
+        "properties": {
+            "a": {"$ref": "other.json#/$defs/x"},
+            "b": {"$ref": "#anchored"},
+        },
+        "$defs": {
+            "other": {
+                "$id": "other.json",
+                "$defs": {"x": {"$ref": "#/$defs/y"},
+                          "y": {"default": "from other"}}
+            },
+            "anchored": {"$anchor": "anchored", "default": "from anchor"}
+        }
+    }
+    assert compile_filler(schema).fill({}) == {
+        "a": "from other", "b": "from anchor"}
+
+
+@pytest.mark.parametrize("with_id", [False, True])
+def test_relative_file_refs(tmp_path, with_id):
+    (tmp_path / "defs").mkdir()
+    (tmp_path / "defs" / "tire.schema.json").write_text(json.dumps({
+        "properties": {
+            "width": {"default": 28}, "valve": {"$ref": "#/$defs/v"}},
+        "$defs": {"v": {"default": "presta"}}
+    }))
+    schema = {"properties": {"tire": {"$ref": "defs/tire.schema.json"}}}
+    if with_id:
+        schema["$id"] = "https://example.com/schemas/bicycle.json"
+    filler = compile_filler(schema, FillConfig(schema_dir=tmp_path))
+    assert filler.fill({}) == {"tire": {"width": 28, "valve": "presta"}}
+
+
+@pytest.mark.parametrize(
+    "ref", ["../secret.json", "%2E%2E/secret.json", "link.json"])
+def test_file_refs_outside_schema_dir_are_not_loaded(tmp_path, ref):
+    (tmp_path / "secret.json").write_text(json.dumps({"default": "secret"}))
+    (tmp_path / "schemas").mkdir()
+    (tmp_path / "schemas" / "link.json").symlink_to(tmp_path / "secret.json")
+    schema = {"properties": {"a": {"$ref": ref}}}
+    with pytest.raises(Unresolvable):
+        compile_filler(schema, FillConfig(schema_dir=tmp_path / "schemas"))
+
+
+def test_ref_in_deeply_nested_schema():
+    leaf = {"$ref": "#/$defs/leaf"}
+    subschema = leaf
+    for _ in range(5 * sys.getrecursionlimit()):
+        subschema = {"properties": {"child": subschema}}
+    assert contains_ref(subschema)
+    del leaf["$ref"]
+    assert not contains_ref(subschema)
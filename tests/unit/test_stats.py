@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from jsonschema_fill_default import FillConfig, FillStats, compile_filler
+
+
+schema = {
+    "properties": {
+        "kind": {"enum": ["a", "b"]},
+        "size": {"default": 1},
+        "limits": {"default": {"cpu": 2, "ram": 4}},
+        "server": {"properties": {"port": {"default": 80}}},
+        "empty": {"properties": {"x": {"type": "string"}}}
+    },
+    "if": {"properties": {"kind": {"const": "a"}}, "required": ["kind"]},
+    "then": {"properties": {"a": {"default": True}}},
+    "oneOf": [
+        {"required": ["kind"]},
+        {"not": {"required": ["kind"]}}
+    ]
+}
+
+
+@pytest.mark.parametrize("engine", ["recursive", "iterative"])
+def test_counters(engine):
+    stats = FillStats()
+    filler = compile_filler(schema, FillConfig(stats=stats, engine=engine))
+    instance = filler.fill({"kind": "a", "limits": {"cpu": 1}})
+    assert instance == {
+        "kind": "a", "size": 1, "limits": {"cpu": 1, "ram": 4},
+        "server": {"port": 80}, "a": True}
+    # Root, "then", and the missing parent "server" ("empty" and "oneOf"
+    # have no defaults, so they are pruned)
+    assert stats.keywords == {"properties": 3, "if": 1}
+    assert stats.validations == 1  # "if"
+    assert stats.defaults == 3  # size, limits/ram, a
+    assert stats.parents_created == 1  # server
+    assert stats.parents_deleted == 0
+    assert stats.seconds == {}
+
+    filler.fill({})
+    assert stats.parents_created == 2
+    stats.reset()
+    assert stats.as_dict() == FillStats().as_dict()
+
+
+@pytest.mark.parametrize("engine", ["recursive", "iterative", "codegen"])
+def test_deleted_parents_are_counted_once_per_filler(engine):
+    # "c" gets no default, so it is created and deleted once while the
+    # missing parent "a" is memoized
+    stats = FillStats()
+    filler = compile_filler({"properties": {"a": {"properties": {
+        "b": {"default": 1},
+        "c": {"if": {"required": ["x"]},
+              "then": {"properties": {"y": {"default": 1}}}}}}}},
+        FillConfig(stats=stats, engine=engine))
+    assert filler.fill({}) == filler.fill({}) == {"a": {"b": 1}}
+    assert stats.parents_created == 2
+    assert stats.parents_deleted == 1
+
+
+@pytest.mark.parametrize("engine", ["recursive", "iterative"])
+def test_timing_per_schema_path(engine):
+    stats = FillStats(timing=True)
+    filler = compile_filler(schema, FillConfig(stats=stats, engine=engine))
+    filler.fill({"kind": "b"})
+    assert set(stats.seconds) == {
+        "#/properties", "#/if", "#/properties/server/properties"}
+    assert all(seconds >= 0 for seconds in stats.seconds.values())
+    assert json.loads(json.dumps(stats.as_dict()))["keywords"]["if"] == 1
+
+
+def test_without_stats_handlers_are_not_wrapped():
+    filler = compile_filler(schema)
+    assert filler._root.location is None
+    assert all(fill is filler.keywords[keyword].fill
+               for keyword, fill, _ in filler._root.ops)
@@ -996,6 +996,85 @@ test_schemas_instances = {
                 }
             },
         ]
+    },
+    "patternPropertiesAndAdditionalProperties": {
+        "schema": {
+            "$schema": "https://json-schema.org/draft/2020-12/schema",
+            "title": "JSON Schema with defaults in maps of keyed objects",
+            "type": "object",
+            "properties": {
+                "regions": {
+                    "type": "object",
+                    "properties": {
+                        "global": {
+                            "type": "object",
+                            "properties": {
+                                "replicas": {"type": "integer", "default": 3}
+                            }
+                        }
+                    },
+                    "patternProperties": {
+                        "^[a-z]{2}-": {
+                            "type": "object",
+                            "properties": {
+                                "zone": {"type": "string", "default": "a"}
+                            }
+                        },
+                        "-east$": {
+                            "type": "object",
+                            "properties": {
+                                "backup": {"type": "boolean", "default": True}
+                            }
+                        }
+                    },
+                    "additionalProperties": {
+                        "type": "object",
+                        "properties": {
+                            "enabled": {"type": "boolean", "default": False}
+                        },
+                        "default": {"limits": {"cpu": 1}}
+                    }
+                }
+            }
+        },
+        "instances": [
+            {  # Empty
+                "original": {
+                },
+                "expected": {
+                    "regions": {"global": {"replicas": 3}}
+                }
+            },
+            {  # Keys of all kinds
+                "original": {
+                    "regions": {
+                        "global": {},
+                        "us-east": {"zone": "b"},
+                        "eu-west": {},
+                        "legacy": {"limits": {"cpu": 4}}
+                    }
+                },
+                "expected": {
+                    "regions": {
+                        "global": {"replicas": 3},
+                        "us-east": {"zone": "b", "backup": True},
+                        "eu-west": {"zone": "a"},
+                        "legacy": {"limits": {"cpu": 4}, "enabled": False}
+                    }
+                }
+            },
+            {  # Only declared missing parents are created
+                "original": {
+                    "regions": {"legacy": {}}
+                },
+                "expected": {
+                    "regions": {
+                        "global": {"replicas": 3},
+                        "legacy": {"enabled": False, "limits": {"cpu": 1}}
+                    }
+                }
+            },
+        ]
     }
 }
 
@@ -0,0 +1,152 @@
+from copy import deepcopy
+
+import pytest
+from jsonschema import Draft202012Validator
+from jsonschema_fill_default import (
+    FillConfig, compile_filler, fill_default, validate_and_fill)
+
+
+# Validated and filled at once, instances must equal their expected
+def test_validate_and_fill_is_equal_to_expected(fill_case):
+    schema, instance, expected, config = fill_case
+    filled, errors = validate_and_fill(
+        instance, schema, FillConfig(**config), check_defaults=True)
+    assert filled == expected
+    assert errors == []
+
+
+def error_keys(errors) -> list:
+    return sorted(
+        (tuple(error.path), tuple(error.schema_path), error.message)
+        for error in errors)
+
+
+schema = {
+    "$defs": {
+        "port": {"type": "integer", "minimum": 1, "default": 80}
+    },
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "maxLength": 8},
+        "port": {"$ref": "#/$defs/port"},
+        "tags": {
+            "type": "array",
+            "prefixItems": [{"type": "string"}],
+            "items": False
+        },
+        "shape": {
+            "oneOf": [
+                {"properties": {"kind": {"const": "a"}, "a": {"default": 1}},
+                 "required": ["kind"]},
+                {"properties": {"kind": {"const": "b"}, "b": {"default": 2}},
+                 "required": ["kind"]},
+                {"properties": {"size": {"type": "integer"}},
+                 "required": ["size"]}
+            ]
+        },
+        "either": {
+            "anyOf": [{"type": "string"}, {"type": "integer"}]
+        },
+        "other": {"not": {"type": "null"}},
+        "counts": {
+            "patternProperties": {"^n": {"type": "integer", "default": 0}},
+            "additionalProperties": {"type": "string"}
+        },
+        "mode": {"enum": ["fast", "slow"]},
+        "workers": {"type": "integer", "minimum": 1},
+        "label": {"type": "string"}
+    },
+    "if": {"properties": {"mode": {"const": "fast"}}, "required": ["mode"]},
+    "then": {"properties": {"workers": {"default": 4}},
+             "required": ["name"]},
+    "else": {"properties": {"workers": {"default": 1}}},
+    "dependentSchemas": {
+        "name": {"properties": {"label": {"type": "string", "default": ""}}}
+    },
+    "additionalProperties": False
+}
+
+invalid_instances = [
+    {},
+    {"name": "too long a name", "port": 0},
+    {"tags": ["a", "b"], "shape": {"kind": "c"}},
+    {"shape": {"kind": "a", "size": 1}},
+    {"either": None, "other": None, "mode": "fast"},
+    {"counts": {"n1": "x", "x": 1}, "extra": True},
+    {"shape": {"size": "x"}, "mode": "none"},
+]
+
+
+# Errors must equal those of jsonschema on the filled instance
+@pytest.mark.parametrize("instance", invalid_instances)
+def test_errors_are_those_of_jsonschema(instance):
+    filled, errors = validate_and_fill(deepcopy(instance), schema)
+    assert filled == fill_default(deepcopy(instance), schema)
+    assert error_keys(errors) \
+        == error_keys(Draft202012Validator(schema).iter_errors(filled))
+
+
+def test_unwalked_keywords_are_validated_fully():
+    unevaluated = {
+        "properties": {"a": {"properties": {"b": {"default": 1}}}},
+        "unevaluatedProperties": False
+    }
+    filled, errors = validate_and_fill({"c": 1}, unevaluated)
+    assert filled == {"c": 1, "a": {"b": 1}}
+    assert error_keys(errors) == error_keys(
+        Draft202012Validator(unevaluated).iter_errors(filled))
+
+
+def test_check_defaults():
+    invalid_defaults = {
+        "properties": {
+            "a": {"type": "integer", "default": "x"},
+            "b": {"properties": {"c": {"type": "string", "default": 1}}},
+            "d": {"prefixItems": [{"type": "string", "default": 1}]}
+        }
+    }
+    filler = compile_filler(invalid_defaults)
+    filled, errors = filler.validate_and_fill({"d": []})
+    assert filled == {"d": [1], "a": "x", "b": {"c": 1}}
+    assert errors == []
+    for _ in range(2):  # Memoized errors are reported again
+        filled, errors = filler.validate_and_fill(
+            {"d": []}, check_defaults=True)
+        assert error_keys(errors) == [
+            (("a",), ("properties", "a", "type"),
+             "'x' is not of type 'integer'"),
+            (("b", "c"), ("properties", "b", "properties", "c", "type"),
+             "1 is not of type 'string'"),
+            (("d", 0), ("properties", "d", "prefixItems", 0, "type"),
+             "1 is not of type 'string'"),
+        ]
+
+
+def test_validate_and_fill_without_mutating():
+    instance = {"shape": {"kind": "b"}, "counts": {"n": "x"}}
+    filled, errors = validate_and_fill(
+        instance, schema, FillConfig(mutate=False))
+    assert instance == {"shape": {"kind": "b"}, "counts": {"n": "x"}}
+    assert filled["shape"] == {"kind": "b", "b": 2}
+    assert [list(error.path) for error in errors] == [["counts", "n"]]
+
+
+# Keywords walked before the properties that fill the instance must be
+# validated against the filled instance
+@pytest.mark.parametrize("conditional", [
+    {"oneOf": [{"required": ["x"]}]},
+    {"anyOf": [{"required": ["x"]}]},
+    {"if": {"required": ["x"]}, "then": {"required": ["z"]}},
+    {"not": {"required": ["x"]}},
+    {"allOf": [{"properties": {"x": {"const": 2}}}]},
+    {"oneOf": [{"properties": {"y": {"default": 1}}},
+               {"properties": {"x": {"const": 1}}}]},
+])
+@pytest.mark.parametrize("mutate", [True, False])
+def test_errors_of_keywords_before_properties(conditional, mutate):
+    ordered = {**conditional, "properties": {"x": {"default": 1}}}
+    filled, errors = validate_and_fill(
+        {}, ordered, FillConfig(mutate=mutate), check_defaults=True)
+    assert filled == fill_default({}, ordered)
+    assert error_keys(errors) \
+        == error_keys(Draft202012Validator(ordered).iter_errors(filled))
@@ -0,0 +1,47 @@
+import pytest
+from jsonschema import SchemaError
+from jsonschema_fill_default import compile_filler, FillConfig
+from jsonschema_fill_default.validator_cache import ValidatorCache
+
+
+# Branches that are not compiled into predicates, so they are validated
+schema = {
+    "oneOf": [
+        {"required": ["a"], "minProperties": 1,
+         "properties": {"x": {"default": 1}}},
+        {"required": ["b"], "minProperties": 1,
+         "properties": {"y": {"default": 2}}},
+    ]
+}
+
+
+def test_validators_are_cached_per_subschema():
+    filler = compile_filler(schema)
+    assert len(filler.validators) == 0
+    for _ in range(3):
+        assert filler.fill({"b": 0}) == {"b": 0, "y": 2}
+    assert len(filler.validators) == 2
+    filler.clear_cache()
+    assert len(filler.validators) == 0
+
+
+@pytest.mark.parametrize("maxsize, expected_size", [(0, 0), (1, 1), (8, 2)])
+def test_validator_cache_is_bounded(maxsize, expected_size):
+    filler = compile_filler(schema, FillConfig(validator_cache_size=maxsize))
+    assert filler.fill({"b": 0}) == {"b": 0, "y": 2}
+    assert len(filler.validators) == expected_size
+
+
+def test_least_recently_used_validator_is_evicted():
+    cache = ValidatorCache(maxsize=2)
+    a, b, c = {"type": "string"}, {"type": "integer"}, {"type": "object"}
+    assert cache.is_valid("x", a)
+    assert not cache.is_valid("x", b)
+    assert cache.is_valid("x", a)  # Use a again, so b is least recent
+    assert not cache.is_valid("x", c)
+    assert list(cache._validators) == [id(a), id(c)]
+
+
+def test_invalid_subschema_raises():
+    with pytest.raises(SchemaError):
+        ValidatorCache().is_valid({}, {"type": 12})